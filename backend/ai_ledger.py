@@ -0,0 +1,145 @@
+"""
+Generation ledger for AI posts: which topics were used, when, and with what
+prompts, so generation stops paying for repeats.
+
+- Topics are picked least-recently-used from `ai_topics`, with an atomic
+  find_one_and_update, so concurrent batch workers get different topics.
+- Each topic keeps the titles generated for it. They go into the next prompt
+  as angles to avoid, so a revisited topic asks for something new, and the
+  prompt (and its hash) differs each time.
+- Model responses are cached in `ai_responses` by prompt hash. A retry of
+  the same prompt reuses the stored text instead of paying for generation
+  again. Responses that became a post, or were rejected as duplicates, are
+  not reused.
+- near_duplicate() compares a parsed title and summary with existing posts
+  in the language before the image call runs. The candidates are the best
+  matches from the in-process search index (published posts, already
+  tokenised) plus the titles the ledger remembers for the topic, which also
+  covers generated drafts, so the check does not grow with the corpus.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from search import tokenize
+
+# Titles per topic that later prompts are told to avoid
+REMEMBERED_TITLES = 12
+REMEMBERED_HASHES = 50
+
+# Term-set Jaccard similarity at which a new post counts as a repeat
+TITLE_DUPLICATE_THRESHOLD = 0.8
+TEXT_DUPLICATE_THRESHOLD = 0.5
+
+# Search hits compared per generated post
+DUPLICATE_CANDIDATES = 20
+
+LRU_SORT = [("last_used_at", 1), ("uses", 1), ("topic", 1)]
+
+
+def _terms(text: str, language: str) -> set:
+    return set(tokenize(text or "", language))
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def near_duplicate(candidate: dict, posts: List[dict], language: str) -> Optional[dict]:
+    """The existing post most similar to candidate's title/summary, if it is similar enough"""
+    title = _terms(candidate.get("title"), language)
+    text = title | _terms(candidate.get("summary"), language)
+    best = None
+    for post in posts:
+        post_title = _terms(post.get("title"), language)
+        title_score = jaccard(title, post_title)
+        text_score = jaccard(text, post_title | _terms(post.get("summary"), language))
+        if title_score >= TITLE_DUPLICATE_THRESHOLD or text_score >= TEXT_DUPLICATE_THRESHOLD:
+            score = max(title_score, text_score)
+            if best is None or score > best["score"]:
+                best = {"id": post.get("id"), "title": post.get("title"), "score": round(score, 3)}
+    return best
+
+
+class GenerationLedger:
+    """Topic LRU, prompt history and response cache in MongoDB"""
+
+    def __init__(self, db, search_index=None):
+        self.db = db
+        # PostSearchIndex of published posts, for duplicate candidates
+        self.search_index = search_index
+
+    async def ensure_topics(self, topics: List[str]):
+        """Add topics the ledger has not seen yet; existing usage is kept"""
+        if not topics:
+            return
+        await self.db.ai_topics.bulk_write([
+            UpdateOne(
+                {"topic": topic},
+                {"$setOnInsert": {"topic": topic, "last_used_at": None, "uses": 0,
+                                  "titles": [], "prompt_hashes": []}},
+                upsert=True
+            )
+            for topic in topics
+        ], ordered=False)
+
+    async def next_topics(self, count: int, candidates: List[str]) -> List[str]:
+        """Claim the `count` least recently used topics among candidates (cycling if count is larger)"""
+        picked = []
+        for _ in range(count):
+            doc = await self.db.ai_topics.find_one_and_update(
+                {"topic": {"$in": candidates}},
+                {"$set": {"last_used_at": datetime.now(timezone.utc).isoformat()}, "$inc": {"uses": 1}},
+                sort=LRU_SORT,
+                projection={"_id": 0, "topic": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            if doc is None:
+                break
+            picked.append(doc["topic"])
+        return picked
+
+    async def avoid_titles(self, topic: str) -> List[str]:
+        doc = await self.db.ai_topics.find_one({"topic": topic}, {"_id": 0, "titles": 1})
+        return (doc or {}).get("titles") or []
+
+    async def cached_response(self, prompt_hash: str) -> Optional[str]:
+        doc = await self.db.ai_responses.find_one(
+            {"prompt_hash": prompt_hash, "status": "pending"}, {"_id": 0, "response": 1}
+        )
+        return doc["response"] if doc else None
+
+    async def store_response(self, prompt_hash: str, topic: str, language: str, response: str):
+        await self.db.ai_responses.update_one(
+            {"prompt_hash": prompt_hash},
+            {"$set": {"response": response, "status": "pending", "topic": topic, "language": language,
+                      "created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def find_duplicate(self, candidate: dict, language: str, topic: Optional[str] = None) -> Optional[dict]:
+        posts = []
+        if self.search_index is not None:
+            text = f"{candidate.get('title') or ''} {candidate.get('summary') or ''}"
+            posts = self.search_index.similar(text, language, DUPLICATE_CANDIDATES)
+        if topic:
+            posts += [{"id": None, "title": title} for title in await self.avoid_titles(topic)]
+        return near_duplicate(candidate, posts, language)
+
+    async def record(self, topic: str, prompt_hash: str, title: Optional[str], status: str,
+                     post_id: Optional[str] = None):
+        """Close out a generation: retire its cached response and remember its title for the topic"""
+        await self.db.ai_responses.update_one(
+            {"prompt_hash": prompt_hash},
+            {"$set": {"status": status, "post_id": post_id}}
+        )
+        update = {"$push": {"prompt_hashes": {"$each": [prompt_hash], "$slice": -REMEMBERED_HASHES}}}
+        if title:
+            update["$push"]["titles"] = {"$each": [title], "$slice": -REMEMBERED_TITLES}
+        # Explicitly requested topics count as used too
+        update["$set"] = {"last_used_at": datetime.now(timezone.utc).isoformat()}
+        update["$setOnInsert"] = {"uses": 0}
+        await self.db.ai_topics.update_one({"topic": topic}, update, upsert=True)
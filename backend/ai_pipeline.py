@@ -0,0 +1,269 @@
+"""
+AI blog post generation as a pipeline.
+
+One post goes through these stages:
+
+    text  -> parse -> save ----------------> attach -> publish
+                  \\-> image (concurrently) -/
+
+As soon as the text is parsed, the hero image is requested in the
+background while the post is rendered and saved, so the image round trip
+(the slowest stage) overlaps with everything else. The post is stored
+without an image, and the image is patched in when it arrives. Announcing a
+published post waits for the image, since social posts need it.
+
+run_batch() generates several posts, across topics and languages, with at
+most `concurrency` in flight. Each result records per-stage timings.
+
+With a GenerationLedger (ai_ledger.py), prompts include the titles already
+written for the topic. Responses are cached by prompt hash: a retry reuses
+the stored text, and a response that is not valid JSON is reformatted
+instead of regenerated. Near-duplicates are rejected before the image call.
+
+The model calls and persistence are injected, so this module knows nothing
+about the LLM SDK or MongoDB.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_MESSAGE = """You are a senior content writer for PsyTech, an AI-driven mental health assessment platform based in the Netherlands.
+Write professional, scientific, trustworthy content for healthcare professionals, HR leaders, and institutions.
+Tone: Professional, evidence-based, not marketing hype. European/British English spelling.
+Always include practical insights and end with a subtle call-to-action to learn more about PsyTech's solutions."""
+
+# Topics relevant to PsyTech
+TOPICS = [
+    "AI-driven mental health assessment accuracy",
+    "GDPR compliance in digital mental health",
+    "Reducing bias in psychological testing with AI",
+    "The future of adaptive psychological assessments",
+    "Mental health screening in corporate wellness programs",
+    "AI technology in clinical psychology practice",
+    "Digital transformation of psychological evaluations",
+    "Privacy-first approach to mental health data",
+    "Early intervention through AI-powered screening",
+    "The role of AI in addressing mental health waiting lists",
+    "B2B mental health solutions for European healthcare",
+    "Personalised psychological profiling with AI",
+    "Cultural sensitivity in AI mental health tools",
+    "Evidence-based AI in psychological assessment"
+]
+
+LANGUAGE_NAMES = {
+    "en": "English", "nl": "Dutch", "de": "German", "fr": "French",
+    "fa": "Persian", "ar": "Arabic", "tr": "Turkish",
+}
+
+
+def text_prompt(topic: str, language: str = "en", avoid_titles: Optional[List[str]] = None) -> str:
+    language_line = ""
+    if language != "en":
+        language_line = f"\nWrite the title, summary, content and SEO fields in {LANGUAGE_NAMES.get(language, language)}.\n"
+    if avoid_titles:
+        listed = "\n".join(f"- {title}" for title in avoid_titles)
+        language_line += f"\nThese posts on the topic already exist; take a clearly different angle and title:\n{listed}\n"
+    return f"""Write a blog post about: {topic}
+{language_line}
+Return in this exact JSON format:
+{{
+    "title": "Engaging title (max 80 chars)",
+    "summary": "2-3 sentence summary for preview cards (max 200 chars)",
+    "content": "Full markdown content with ## headings, bullet points, and a Key Takeaway section. 600-800 words. End with a CTA like 'Discover how PsyTech can help your organisation...'",
+    "tags": ["tag1", "tag2", "tag3"],
+    "seo_title": "SEO optimized title (max 60 chars)",
+    "seo_description": "Meta description (max 155 chars)"
+}}
+
+Only return valid JSON, no markdown code blocks."""
+
+
+def repair_prompt(response: str) -> str:
+    return f"""The text below was meant to be a JSON object with the fields title, summary, content, tags,
+seo_title and seo_description, but it is not valid JSON. Return the same post as valid JSON only,
+without changing its wording and without markdown code blocks.
+
+{response}"""
+
+
+def prompt_hash(prompt: str, system_message: str = SYSTEM_MESSAGE) -> str:
+    return hashlib.sha256(f"{system_message}\n\n{prompt}".encode()).hexdigest()[:32]
+
+
+def image_prompt(title: str) -> str:
+    return f"""Modern, minimalist healthcare illustration for a blog about: {title}
+Style: Clean, professional, teal and cyan color palette (#0E7490, #38BDF8),
+abstract shapes suggesting AI/technology and mental wellness,
+no text, no real human faces, geometric patterns, soft gradients,
+suitable for a European healthtech company website."""
+
+
+def parse_post_json(response: str) -> dict:
+    """The post fields from a model response; raises ValueError if it is not the expected JSON"""
+    cleaned = response.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("```")[1]
+        if cleaned.startswith("json"):
+            cleaned = cleaned[4:]
+    try:
+        data = json.loads(cleaned)
+    except json.JSONDecodeError:
+        # Prose around the object ("Here is your post: {...}")
+        match = re.search(r"\{.*\}", cleaned, re.S)
+        if not match:
+            raise
+        data = json.loads(match.group())
+    if not isinstance(data, dict):
+        raise ValueError("AI response is not a JSON object")
+    missing = [field for field in ("title", "summary", "content") if not data.get(field)]
+    if missing:
+        raise ValueError(f"AI response is missing {', '.join(missing)}")
+    return data
+
+
+class StageTimer:
+    """Wall-clock seconds per pipeline stage"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 3)
+
+    def finish(self) -> Dict[str, float]:
+        self.timings["total"] = round(time.perf_counter() - self.started, 3)
+        return self.timings
+
+
+class AIPostPipeline:
+    """Text -> (image || save) -> attach -> publish, for one post or a bounded batch"""
+
+    def __init__(
+        self,
+        generate_text: Callable[[str, str], Awaitable[str]],
+        generate_image: Callable[[str], Awaitable[Optional[bytes]]],
+        save_post: Callable[[dict, str, str], Awaitable[dict]],
+        attach_image: Callable[[dict, bytes], Awaitable[dict]],
+        publish: Callable[[dict], Awaitable[None]],
+        concurrency: int = 2,
+        ledger=None,
+    ):
+        self.generate_text = generate_text
+        self.generate_image = generate_image
+        self.save_post = save_post
+        self.attach_image = attach_image
+        self.publish = publish
+        self.concurrency = max(1, concurrency)
+        self.ledger = ledger
+
+    async def _image(self, title: str, timer: StageTimer) -> Optional[bytes]:
+        try:
+            with timer.stage("image"):
+                return await self.generate_image(image_prompt(title))
+        except Exception as e:
+            logger.error(f"Failed to generate hero image: {e}")
+            return None
+
+    async def run(self, topic: str, language: str = "en") -> dict:
+        """Generate one post; never raises, the outcome is in the result"""
+        timer = StageTimer()
+        result = {"topic": topic, "language": language, "status": "failed",
+                  "post_id": None, "title": None, "error": None, "timings": timer.timings}
+        image_task = None
+        ledger = self.ledger
+        try:
+            avoid = await ledger.avoid_titles(topic) if ledger else []
+            prompt = text_prompt(topic, language, avoid)
+            digest = result["prompt_hash"] = prompt_hash(prompt)
+
+            with timer.stage("text"):
+                response = await ledger.cached_response(digest) if ledger else None
+                result["cached"] = response is not None
+                if response is None:
+                    response = await self.generate_text(prompt, SYSTEM_MESSAGE)
+                    if ledger:
+                        await ledger.store_response(digest, topic, language, response)
+            try:
+                with timer.stage("parse"):
+                    content_data = parse_post_json(response)
+            except ValueError as e:
+                logger.error(f"Failed to parse AI response: {e}")
+                logger.error(f"Response was: {response[:500]}")
+                # Reformat the content already paid for rather than generating it again
+                with timer.stage("repair"):
+                    response = await self.generate_text(repair_prompt(response), SYSTEM_MESSAGE)
+                    content_data = parse_post_json(response)
+                if ledger:
+                    await ledger.store_response(digest, topic, language, response)
+            result["title"] = content_data["title"]
+
+            if ledger:
+                with timer.stage("dedupe"):
+                    duplicate = await ledger.find_duplicate(content_data, language, topic)
+                if duplicate:
+                    # Remembered for the topic, so the next prompt steers away from it
+                    await ledger.record(topic, digest, content_data["title"], "rejected")
+                    result["status"] = "duplicate"
+                    result["error"] = f"Too similar to existing post: {duplicate['title']}"
+                    result["duplicate_of"] = duplicate
+                    return result
+
+            # The image only needs the title: start it before saving
+            image_task = asyncio.create_task(self._image(content_data["title"], timer))
+            with timer.stage("save"):
+                post = await self.save_post(content_data, language, topic)
+            result["post_id"] = post["id"]
+            result["status"] = "saved"
+            if ledger:
+                await ledger.record(topic, digest, post["title"], "used", post["id"])
+
+            image = await image_task
+            if image:
+                try:
+                    with timer.stage("attach"):
+                        post = await self.attach_image(post, image)
+                    result["status"] = "complete"
+                except Exception as e:
+                    # The post is stored (and may be live already): keep it without an image
+                    logger.error(f"Failed to attach hero image to post {post['id']}: {e}")
+                    result["error"] = f"Image not attached: {str(e) or type(e).__name__}"
+            if post.get("status") == "published":
+                with timer.stage("publish"):
+                    await self.publish(post)
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+            if image_task and not image_task.done():
+                image_task.cancel()
+        finally:
+            timer.finish()
+            logger.info(f"AI post pipeline [{result['status']}] {result['title'] or topic} ({language}): {timer.timings}")
+        return result
+
+    async def run_batch(self, jobs: List[Tuple[str, str]]) -> dict:
+        """Generate a post per (topic, language) job, at most `concurrency` at a time"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        async def bounded(topic: str, language: str) -> dict:
+            async with semaphore:
+                return await self.run(topic, language)
+
+        results = await asyncio.gather(*(bounded(topic, language) for topic, language in jobs))
+        return {
+            "results": list(results),
+            "elapsed": round(time.perf_counter() - started, 3),
+            "concurrency": self.concurrency,
+        }
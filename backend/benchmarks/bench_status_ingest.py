@@ -0,0 +1,107 @@
+"""
+Benchmark: per-request insert_one vs buffered insert_many for status checks.
+
+Runs C concurrent simulated clients that each record N heartbeats, first
+awaiting one insert_one per check (what POST /api/status does by default),
+then through StatusBuffer (STATUS_BUFFER=true). Reports sustained throughput;
+the buffered figure includes the final flush, so every check is on disk
+when the clock stops. Uses a scratch database that is dropped afterwards.
+--rtt-ms adds a simulated network round trip to every database call, which
+is where batching pays off against a remote cluster.
+
+    python benchmarks/bench_status_ingest.py [--clients 50] [--checks 200] [--rtt-ms 0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from status_series import StatusBuffer  # noqa: E402
+
+
+class DelayedCollection:
+    """Adds a fixed round-trip delay in front of insert_one/insert_many"""
+
+    def __init__(self, collection, rtt: float):
+        self.collection = collection
+        self.rtt = rtt
+
+    async def insert_one(self, doc):
+        await asyncio.sleep(self.rtt)
+        return await self.collection.insert_one(doc)
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(self.rtt)
+        return await self.collection.insert_many(docs, ordered=ordered)
+
+
+def check(client_name: str) -> dict:
+    return {"id": str(uuid.uuid4()), "client_name": client_name, "timestamp": datetime.now(timezone.utc)}
+
+
+async def per_request(collection, clients: int, checks: int) -> float:
+    async def client(n: int):
+        for _ in range(checks):
+            await collection.insert_one(check(f"client-{n}"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return time.perf_counter() - start
+
+
+async def buffered(collection, clients: int, checks: int, batch_size: int, flush_seconds: float) -> float:
+    buffer = StatusBuffer(collection, batch_size=batch_size, flush_seconds=flush_seconds)
+
+    async def client(n: int):
+        for _ in range(checks):
+            await buffer.add(check(f"client-{n}"))
+
+    start = time.perf_counter()
+    buffer.start()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    await buffer.stop()
+    elapsed = time.perf_counter() - start
+    assert buffer.written == clients * checks, buffer.stats()
+    return elapsed
+
+
+async def main(args):
+    load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+    client = AsyncIOMotorClient(args.mongo_url or os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    db = client[f"bench_status_{uuid.uuid4().hex[:8]}"]
+    total = args.clients * args.checks
+    try:
+        collection = db.status_checks
+        if args.rtt_ms:
+            collection = DelayedCollection(collection, args.rtt_ms / 1000)
+
+        await db.status_checks.insert_one(check("warm-up"))
+        single = await per_request(collection, args.clients, args.checks)
+        batched = await buffered(collection, args.clients, args.checks, args.batch_size, args.flush_seconds)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+    print(f"{total} status checks from {args.clients} concurrent clients (rtt {args.rtt_ms:g} ms)")
+    print(f"{'insert_one per request':<24} {total / single:10.0f} checks/s   {single:7.2f} s")
+    print(f"{'buffered insert_many':<24} {total / batched:10.0f} checks/s   {batched:7.2f} s")
+    print(f"speed-up: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--checks", type=int, default=200, help="Checks per client")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-seconds", type=float, default=1.0)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated database round trip")
+    parser.add_argument("--mongo-url", help="Defaults to MONGO_URL from backend/.env")
+    asyncio.run(main(parser.parse_args()))
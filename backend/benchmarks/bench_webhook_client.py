@@ -0,0 +1,93 @@
+"""
+Benchmark: per-call httpx.AsyncClient vs the shared pooled client.
+
+Starts a local stand-in for the Make.com webhook (plain HTTP/1.1 with
+keep-alive) and times N sequential POSTs each way. The per-call variant is
+what send_to_make_webhook used to do; the pooled variant reuses warm
+connections like get_http_client() does now. Against the real endpoint the
+gap is larger, since every new connection also pays DNS and a TLS handshake.
+
+    python benchmarks/bench_webhook_client.py [--calls 500] [--latency-ms 0]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 11\r\n\r\n{\"ok\":true}"
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float):
+    """Minimal keep-alive HTTP/1.1 handler that accepts any POST and answers 200"""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            if latency:
+                await asyncio.sleep(latency)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def summarize(name: str, samples: list) -> str:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    return (f"{name:<22} mean {statistics.mean(samples_ms):7.3f} ms   "
+            f"p50 {statistics.median(samples_ms):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+async def per_call_client(url: str, payload: dict, calls: int) -> list:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            await client.post(url, json=payload)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def pooled_client(url: str, payload: dict, calls: int) -> list:
+    samples = []
+    async with httpx.AsyncClient(timeout=30.0, limits=httpx.Limits(max_keepalive_connections=10)) as client:
+        for _ in range(calls):
+            start = time.perf_counter()
+            await client.post(url, json=payload)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main(calls: int, latency_ms: float):
+    server = await asyncio.start_server(lambda r, w: handle(r, w, latency_ms / 1000), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/hook"
+    payload = {"title": "Benchmark post", "excerpt": "x" * 200, "tags": ["AI", "GDPR"], "language": "en"}
+
+    async with server:
+        # Warm up imports and the event loop before measuring
+        await pooled_client(url, payload, 20)
+        per_call = await per_call_client(url, payload, calls)
+        pooled = await pooled_client(url, payload, calls)
+
+    print(f"{calls} sequential webhook POSTs against a local stand-in server")
+    print(summarize("new client per call", per_call))
+    print(summarize("shared pooled client", pooled))
+    print(f"speed-up (mean): {statistics.mean(per_call) / statistics.mean(pooled):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated server processing time")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.latency_ms))
@@ -0,0 +1,124 @@
+"""
+In-process read-through cache for public content routes.
+
+Bounded LRU with a per-entry TTL. Concurrent misses for the same key share a
+single load (no cache stampede), and a generation counter stops a load that
+raced with an invalidation from writing a stale value back. If the request
+doing the load is cancelled (the client went away), the others are woken and
+one of them loads instead.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _LoadAbandoned(Exception):
+    """Set on a shared load whose leader was cancelled, so waiters retry"""
+
+
+class AsyncLRUCache:
+    """LRU + TTL cache keyed by tuples whose first element is a namespace"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _get(self, key: Tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _set(self, key: Tuple, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, calling loader once on a miss"""
+        found, value = self._get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                value = await asyncio.shield(inflight)
+            except _LoadAbandoned:
+                # The first waiter to get here takes over the load, the rest wait on it
+                return await self.get_or_load(key, loader)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # Only this request is cancelled: wake the waiters rather than cancelling them too
+            future.set_exception(_LoadAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unawaited future does not warn
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if generation == self._generation:
+                self._set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, *keys: Hashable):
+        """Drop exact keys"""
+        self._generation += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_namespace(self, *namespaces: str):
+        """Drop every key whose first element is one of the namespaces"""
+        self._generation += 1
+        for key in [k for k in self._entries if k[0] in namespaces]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        self._generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,273 @@
+"""
+Declared MongoDB indexes and the migration step that reconciles them.
+
+Every hot query in server.py should be backed by an index declared here.
+On startup the app creates whatever is missing and logs any drift; the CLI
+can also repair mismatched indexes and drop undeclared ones:
+
+    python db_indexes.py            # create missing indexes, report drift
+    python db_indexes.py --check    # report only, exit 1 on drift
+    python db_indexes.py --fix --drop-extra
+
+Collections that need creation options (time-series) are declared in
+TIME_SERIES and created before their indexes are built.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Shared by every outbox.Outbox collection
+OUTBOX_INDEXES = [
+    {"name": "id_unique", "keys": [("id", 1)], "unique": True},
+    # Worker claims: due pending rows and expired leases
+    {"name": "status_next_attempt_at", "keys": [("status", 1), ("next_attempt_at", 1)]},
+    {"name": "status_lease_until", "keys": [("status", 1), ("lease_until", 1)]},
+    {"name": "status_created_at", "keys": [("status", 1), ("created_at", 1)]},
+    # Keep delivered rows for a week for auditing
+    {"name": "delivered_at_ttl", "keys": [("delivered_at", 1)], "expireAfterSeconds": 7 * 24 * 3600},
+]
+
+# Status checks are kept for 30 days
+STATUS_RETENTION_SECONDS = 30 * 24 * 3600
+
+# collection -> create_collection options; needs MongoDB 5.0+, older servers get a regular collection
+TIME_SERIES: Dict[str, dict] = {
+    "status_checks": {
+        "timeseries": {"timeField": "timestamp", "metaField": "client_name", "granularity": "minutes"},
+        "expireAfterSeconds": STATUS_RETENTION_SECONDS,
+    },
+}
+
+# collection -> list of index specs ({"name", "keys", and optional "unique"/"sparse"/...})
+INDEXES: Dict[str, List[dict]] = {
+    "posts": [
+        {"name": "id_unique", "keys": [("id", 1)], "unique": True},
+        {"name": "slug_unique", "keys": [("slug", 1)], "unique": True},
+        # GET /api/posts: status filter sorted by (published_at, id), optionally by language or tag.
+        # The trailing id makes the sort total, which keyset pagination relies on.
+        {"name": "status_published_at_id",
+         "keys": [("status", 1), ("published_at", -1), ("id", -1)]},
+        {"name": "status_language_published_at_id",
+         "keys": [("status", 1), ("language", 1), ("published_at", -1), ("id", -1)]},
+        {"name": "status_tags_published_at_id",
+         "keys": [("status", 1), ("tags", 1), ("published_at", -1), ("id", -1)]},
+        # Multikey index for tag lookups and the tag aggregation
+        {"name": "tags", "keys": [("tags", 1)]},
+        # Admin listing
+        {"name": "created_at", "keys": [("created_at", -1)]},
+        # Makes replayed import records no-ops (importer.py)
+        {"name": "import_key_unique", "keys": [("import_key", 1)], "unique": True, "sparse": True},
+        # Reusing image variants made for another post with the same hero image (images.py)
+        {"name": "hero_variants_source", "keys": [("hero_variants.source", 1)], "sparse": True},
+    ],
+    "post_imports": [
+        {"name": "id_unique", "keys": [("id", 1)], "unique": True},
+    ],
+    "ai_batches": [
+        {"name": "id_unique", "keys": [("id", 1)], "unique": True},
+    ],
+    # Generation ledger (ai_ledger.py): least-recently-used topic selection
+    "ai_topics": [
+        {"name": "topic_unique", "keys": [("topic", 1)], "unique": True},
+        {"name": "last_used_at_uses_topic", "keys": [("last_used_at", 1), ("uses", 1), ("topic", 1)]},
+    ],
+    # Cached model responses by prompt hash, kept for 30 days
+    "ai_responses": [
+        {"name": "prompt_hash_unique", "keys": [("prompt_hash", 1)], "unique": True},
+        {"name": "created_at_ttl", "keys": [("created_at", 1)], "expireAfterSeconds": 30 * 24 * 3600},
+    ],
+    # Old slugs of renamed posts (slugs.py)
+    "slug_redirects": [
+        {"name": "slug_unique", "keys": [("slug", 1)], "unique": True},
+        {"name": "post_id", "keys": [("post_id", 1)]},
+    ],
+    "tag_stats": [
+        {"name": "language_tag_unique", "keys": [("language", 1), ("tag", 1)], "unique": True},
+        {"name": "language_count", "keys": [("language", 1), ("count", -1), ("tag", 1)]},
+    ],
+    "webhook_outbox": OUTBOX_INDEXES,
+    "email_outbox": OUTBOX_INDEXES,
+    "contact_submissions": [
+        {"name": "id_unique", "keys": [("id", 1)], "unique": True},
+        # Admin inbox: newest first, keyset-paginated on (created_at, id), optionally filtered
+        {"name": "created_at_id", "keys": [("created_at", -1), ("id", -1)]},
+        {"name": "status_created_at_id", "keys": [("status", 1), ("created_at", -1), ("id", -1)]},
+        {"name": "company_type_created_at_id", "keys": [("company_type", 1), ("created_at", -1), ("id", -1)]},
+        {"name": "status_company_type_created_at_id",
+         "keys": [("status", 1), ("company_type", 1), ("created_at", -1), ("id", -1)]},
+    ],
+    # Time-series (status_series.py); latest checks and rollups per client
+    "status_checks": [
+        # Same keys as the index MongoDB 6.3+ creates for time-series collections itself
+        {"name": "client_name_timestamp", "keys": [("client_name", 1), ("timestamp", 1)]},
+        # Retention for regular collections; time-series collections expire buckets themselves
+        {"name": "timestamp_ttl", "keys": [("timestamp", 1)], "expireAfterSeconds": STATUS_RETENTION_SECONDS,
+         "regular_only": True},
+    ],
+}
+
+# Options that make two indexes with the same keys behave differently
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+def _normalize_keys(keys) -> List[tuple]:
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+            for field, direction in keys]
+
+
+def _options(spec: dict) -> dict:
+    return {opt: spec[opt] for opt in INDEX_OPTIONS if spec.get(opt) not in (None, False)}
+
+
+async def reconcile_collection(db, collection: str, specs: List[dict], apply: bool = True,
+                               fix: bool = False, drop_extra: bool = False) -> dict:
+    """Compare declared and existing indexes for one collection and optionally converge them"""
+    coll = db[collection]
+    existing = await coll.index_information()
+    existing.pop("_id_", None)
+
+    report = {"collection": collection, "created": [], "missing": [], "mismatched": [],
+              "extra": [], "dropped": [], "errors": []}
+    declared_names = set()
+
+    for spec in specs:
+        name = spec["name"]
+        declared_names.add(name)
+        keys = _normalize_keys(spec["keys"])
+        options = _options(spec)
+        current = existing.get(name)
+
+        if current is None:
+            # Already built under another name (e.g. one the server created itself)
+            equivalent = [other for other, info in existing.items()
+                          if _normalize_keys(info["key"]) == keys and _options(info) == options]
+            if equivalent:
+                declared_names.update(equivalent)
+                continue
+
+        if current is not None:
+            if _normalize_keys(current["key"]) == keys and _options(current) == options:
+                continue
+            report["mismatched"].append(name)
+            if not (apply and fix):
+                continue
+            await coll.drop_index(name)
+        elif not apply:
+            report["missing"].append(name)
+            continue
+
+        try:
+            await coll.create_index(keys, name=name, **options)
+            report["created"].append(name)
+        except OperationFailure as e:
+            # e.g. a unique index over data that already has duplicates
+            report["errors"].append({"index": name, "error": str(e)})
+
+    for name in existing:
+        if name in declared_names:
+            continue
+        report["extra"].append(name)
+        if apply and drop_extra:
+            await coll.drop_index(name)
+            report["dropped"].append(name)
+
+    return report
+
+
+async def collection_info(db, name: str) -> Optional[dict]:
+    cursor = await db.list_collections(filter={"name": name})
+    infos = await cursor.to_list(1)
+    return infos[0] if infos else None
+
+
+async def ensure_collections(db, apply: bool = True, fix: bool = False) -> Dict[str, str]:
+    """Create declared time-series collections; returns {collection: "timeseries" | "collection" | "missing"}"""
+    kinds = {}
+    for name, options in TIME_SERIES.items():
+        info = await collection_info(db, name)
+        if info is None and apply:
+            try:
+                await db.create_collection(name, **options)
+            except OperationFailure as e:
+                logger.warning(f"[{name}] time-series collections are not supported, using a regular collection: {e}")
+                await db.create_collection(name)
+            info = await collection_info(db, name)
+        kinds[name] = info.get("type", "collection") if info else "missing"
+
+        if kinds[name] == "collection" and info is not None:
+            logger.warning(f"[{name}] is a regular collection, not time-series")
+        elif kinds[name] == "timeseries":
+            retention = info.get("options", {}).get("expireAfterSeconds")
+            if retention != options["expireAfterSeconds"]:
+                logger.warning(f"[{name}] retention is {retention}s, declared {options['expireAfterSeconds']}s")
+                if apply and fix:
+                    await db.command("collMod", name, expireAfterSeconds=options["expireAfterSeconds"])
+    return kinds
+
+
+async def reconcile_indexes(db, apply: bool = True, fix: bool = False, drop_extra: bool = False) -> List[dict]:
+    """Reconcile every declared collection; returns one drift report per collection"""
+    kinds = await ensure_collections(db, apply, fix)
+    reports = []
+    for collection, specs in INDEXES.items():
+        if kinds.get(collection) == "timeseries":
+            specs = [spec for spec in specs if not spec.get("regular_only")]
+        reports.append(await reconcile_collection(db, collection, specs, apply, fix, drop_extra))
+    return reports
+
+
+def has_drift(reports: List[dict]) -> bool:
+    return any(r["missing"] or r["mismatched"] or r["extra"] or r["errors"] for r in reports)
+
+
+def log_reports(reports: List[dict]):
+    for r in reports:
+        if r["created"]:
+            logger.info(f"[{r['collection']}] created indexes: {', '.join(r['created'])}")
+        if r["missing"]:
+            logger.warning(f"[{r['collection']}] missing indexes: {', '.join(r['missing'])}")
+        if r["mismatched"]:
+            logger.warning(f"[{r['collection']}] indexes differ from declaration: {', '.join(r['mismatched'])}")
+        if r["extra"]:
+            logger.warning(f"[{r['collection']}] undeclared indexes: {', '.join(r['extra'])}")
+        if r["dropped"]:
+            logger.info(f"[{r['collection']}] dropped indexes: {', '.join(r['dropped'])}")
+        for err in r["errors"]:
+            logger.error(f"[{r['collection']}] failed to build {err['index']}: {err['error']}")
+
+
+async def _main(args) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        db = client[os.environ['DB_NAME']]
+        reports = await reconcile_indexes(db, apply=not args.check, fix=args.fix, drop_extra=args.drop_extra)
+        log_reports(reports)
+        if args.check and has_drift(reports):
+            return 1
+        if any(r["errors"] for r in reports):
+            return 1
+        logger.info("Indexes are in sync" if not has_drift(reports) else "Index migration finished")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and reconcile MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="Report drift without changing anything")
+    parser.add_argument("--fix", action="store_true", help="Drop and rebuild indexes that differ from the declaration")
+    parser.add_argument("--drop-extra", action="store_true", help="Drop indexes that are not declared")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,101 @@
+"""
+Streaming NDJSON / CSV exports of Mongo collections.
+
+Rows are read from a Motor cursor in batches and encoded into ~64 KB chunks
+for a StreamingResponse, so memory use does not depend on how many rows are
+exported and nothing is truncated.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Exportable fields per collection, in default column order
+EXPORT_FIELDS: Dict[str, List[str]] = {
+    "posts": [
+        "id", "slug", "title", "summary", "content", "hero_image", "tags", "language",
+        "status", "seo", "created_at", "updated_at", "published_at", "scheduled_at", "ai_generated",
+    ],
+    "contact_submissions": [
+        "id", "name", "email", "phone", "company", "company_type", "message", "status", "created_at",
+    ],
+}
+
+CURSOR_BATCH_SIZE = 500
+CHUNK_BYTES = 64 * 1024
+
+
+class ExportError(ValueError):
+    pass
+
+
+def select_fields(collection: str, fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated field list; None means every exportable field"""
+    allowed = EXPORT_FIELDS[collection]
+    if not fields:
+        return list(allowed)
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise ExportError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return selected
+
+
+def date_range_filter(field: str, since: Optional[datetime], until: Optional[datetime]) -> dict:
+    """Filter on an ISO-8601 string timestamp: since is inclusive, until exclusive"""
+    bounds = {}
+    # Stored timestamps are UTC isoformat() strings, which sort chronologically
+    if since:
+        bounds["$gte"] = _as_utc(since).isoformat()
+    if until:
+        bounds["$lt"] = _as_utc(until).isoformat()
+    return {field: bounds} if bounds else {}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "|".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def stream_rows(cursor, fields: List[str], fmt: str) -> AsyncIterator[bytes]:
+    """Encode cursor rows as NDJSON or CSV, yielding chunks of about CHUNK_BYTES"""
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+
+    async for row in cursor.batch_size(CURSOR_BATCH_SIZE):
+        if writer:
+            writer.writerow([_cell(row.get(f)) for f in fields])
+        else:
+            buffer.write(json.dumps({f: row.get(f) for f in fields}, ensure_ascii=False, default=str))
+            buffer.write("\n")
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_filename(name: str, fmt: str) -> str:
+    return f"{name}-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.{fmt}"
@@ -0,0 +1,269 @@
+"""
+Sitemaps and RSS/Atom feeds for published posts.
+
+Like the search index, FeedIndex keeps an in-memory view of the published
+posts (only the fields feeds need). It is loaded once on startup and kept
+current by post_changed, so crawler traffic never reaches MongoDB.
+Generated documents are cached with an ETag and Last-Modified and
+regenerated on demand after a change. A change only invalidates what it can
+affect: the feeds of the post's language (and the site-wide feed), and the
+sitemap shards from the post's position onwards. Posts are ordered oldest
+first, so a new post usually only touches the last shard.
+
+Sitemaps are split into shards of at most 50,000 URLs, as the protocol
+requires, and listed in a sitemap index.
+
+Every URL in the documents comes from configuration (the site URL for
+posts, the API URL for feeds and shards), never from the request, since
+the cached documents are shared by all requests. Without a site URL there
+are no feeds or sitemaps.
+"""
+import bisect
+import hashlib
+import html
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional, Tuple
+
+from conditional import parse_timestamp
+
+SITEMAP_MAX_URLS = 50000
+FEED_SIZE = 20
+ALL_LANGUAGES = "all"
+
+# Fields kept per post
+FEED_FIELDS = ("id", "slug", "title", "summary", "language", "published_at", "updated_at")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+@dataclass
+class Document:
+    body: bytes
+    etag: str
+    last_modified: datetime
+    media_type: str
+
+
+def _document(text: str, last_modified: datetime, media_type: str) -> Document:
+    body = text.encode()
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return Document(body, etag, last_modified, media_type)
+
+
+def _x(value) -> str:
+    return html.escape(str(value or ""), quote=True)
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FeedIndex:
+    """Published posts in publication order, plus cached sitemap and feed documents"""
+
+    def __init__(self, site_url: Optional[str] = None, site_title: str = "Blog", api_url: Optional[str] = None):
+        self.site_url = site_url.rstrip("/") if site_url else None
+        self.site_title = site_title
+        # Origin serving /api; defaults to the site itself
+        self.api_url = (api_url or site_url or "").rstrip("/") or None
+        self._posts: Dict[str, dict] = {}
+        # (published_at, id) ascending; positions decide sitemap shards
+        self._order: List[Tuple[datetime, str]] = []
+        self._shards: Dict[int, Document] = {}
+        self._index: Optional[Document] = None
+        self._feeds: Dict[Tuple[str, str], Document] = {}
+
+    def __len__(self):
+        return len(self._posts)
+
+    @property
+    def enabled(self) -> bool:
+        return self.site_url is not None
+
+    @staticmethod
+    def _key(post: dict) -> Tuple[datetime, str]:
+        return (parse_timestamp(post.get("published_at")) or EPOCH, post["id"])
+
+    def clear(self):
+        self._posts.clear()
+        self._order.clear()
+        self._invalidate(0, None)
+
+    def _invalidate(self, position: Optional[int], language: Optional[str]):
+        if position is not None:
+            first = position // SITEMAP_MAX_URLS
+            for shard in [s for s in self._shards if s >= first]:
+                del self._shards[shard]
+            self._index = None
+        for key in [k for k in self._feeds if language is None or k[0] in (language, ALL_LANGUAGES)]:
+            del self._feeds[key]
+
+    def _add(self, entry: dict):
+        key = self._key(entry)
+        position = bisect.bisect_left(self._order, key)
+        self._order.insert(position, key)
+        self._posts[entry["id"]] = entry
+        return position
+
+    def _remove(self, post_id: str) -> Optional[int]:
+        old = self._posts.pop(post_id, None)
+        if old is None:
+            return None
+        position = bisect.bisect_left(self._order, self._key(old))
+        del self._order[position]
+        return position
+
+    async def rebuild(self, db) -> int:
+        """Load every published post from MongoDB"""
+        self.clear()
+        projection = {"_id": 0, **{field: 1 for field in FEED_FIELDS}}
+        async for post in db.posts.find({"status": "published"}, projection):
+            self._add({field: post.get(field) for field in FEED_FIELDS})
+        self._invalidate(0, None)
+        return len(self._posts)
+
+    def sync(self, post: Optional[dict], post_id: Optional[str] = None):
+        """Bring the index in line with a post's current state after a write"""
+        post_id = post_id or (post or {}).get("id")
+        old = self._posts.get(post_id)
+        entry = None
+        if post and post.get("status") == "published":
+            entry = {field: post.get(field) for field in FEED_FIELDS}
+        if entry == old:
+            return  # e.g. a tag edit: nothing feeds show changed
+
+        positions = []
+        if old is not None:
+            positions.append(self._remove(post_id))
+        if entry is not None:
+            positions.append(self._add(entry))
+        languages = {p["language"] for p in (old, entry) if p}
+        for language in languages:
+            self._invalidate(min(positions), language)
+
+    def post_url(self, post: dict) -> str:
+        return f"{self.site_url}/blog/{post['slug']}"
+
+    def shard_url(self, shard: int) -> str:
+        """Absolute URL of a sitemap shard (0-based; published 1-based)"""
+        return f"{self.api_url}/api/sitemaps/{shard + 1}.xml"
+
+    def feed_url(self, language: str, fmt: str) -> str:
+        return f"{self.api_url}/api/feeds/{language}.{fmt}"
+
+    def _latest_modified(self, posts: List[dict]) -> datetime:
+        times = [parse_timestamp(p.get("updated_at")) or parse_timestamp(p.get("published_at")) for p in posts]
+        return max([t for t in times if t] or [EPOCH])
+
+    # ---- sitemaps ----
+
+    def shard_count(self) -> int:
+        return max(1, -(-len(self._order) // SITEMAP_MAX_URLS))
+
+    def _shard_posts(self, shard: int) -> List[dict]:
+        keys = self._order[shard * SITEMAP_MAX_URLS:(shard + 1) * SITEMAP_MAX_URLS]
+        return [self._posts[post_id] for _, post_id in keys]
+
+    def sitemap(self, shard: int) -> Optional[Document]:
+        """One sitemap shard (0-based); None past the last shard"""
+        if shard < 0 or shard >= self.shard_count():
+            return None
+        cached = self._shards.get(shard)
+        if cached is None:
+            posts = self._shard_posts(shard)
+            urls = []
+            for post in posts:
+                modified = parse_timestamp(post.get("updated_at")) or parse_timestamp(post.get("published_at"))
+                lastmod = f"<lastmod>{_iso(modified)}</lastmod>" if modified else ""
+                urls.append(f"<url><loc>{_x(self.post_url(post))}</loc>{lastmod}</url>")
+            text = (XML_HEADER + '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                    + "\n".join(urls) + "\n</urlset>\n")
+            cached = self._shards[shard] = _document(text, self._latest_modified(posts), "application/xml")
+        return cached
+
+    def sitemap_index(self) -> Document:
+        """Index of all shards"""
+        if self._index is None:
+            entries = []
+            latest = EPOCH
+            for shard in range(self.shard_count()):
+                modified = self._latest_modified(self._shard_posts(shard))
+                latest = max(latest, modified)
+                entries.append(f"<sitemap><loc>{_x(self.shard_url(shard))}</loc>"
+                               f"<lastmod>{_iso(modified)}</lastmod></sitemap>")
+            text = (XML_HEADER + '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                    + "\n".join(entries) + "\n</sitemapindex>\n")
+            self._index = _document(text, latest, "application/xml")
+        return self._index
+
+    # ---- feeds ----
+
+    def latest(self, language: str, limit: int = FEED_SIZE) -> List[dict]:
+        posts = []
+        for _, post_id in reversed(self._order):
+            post = self._posts[post_id]
+            if language == ALL_LANGUAGES or post.get("language") == language:
+                posts.append(post)
+                if len(posts) == limit:
+                    break
+        return posts
+
+    def feed(self, language: str, fmt: str) -> Document:
+        """RSS 2.0 or Atom feed of the latest posts in a language ("all" for every language)"""
+        key = (language, fmt)
+        cached = self._feeds.get(key)
+        if cached is None:
+            posts = self.latest(language)
+            build = self._atom if fmt == "atom" else self._rss
+            text, media_type = build(language, posts, self.site_url, self.feed_url(language, fmt))
+            cached = self._feeds[key] = _document(text, self._latest_modified(posts), media_type)
+        return cached
+
+    def _rss(self, language: str, posts: List[dict], base: str, feed_url: str) -> Tuple[str, str]:
+        items = []
+        for post in posts:
+            url = _x(self.post_url(post))
+            published = parse_timestamp(post.get("published_at")) or EPOCH
+            items.append(
+                f"<item><title>{_x(post.get('title'))}</title><link>{url}</link>"
+                f"<guid isPermaLink=\"false\">{_x(post['id'])}</guid>"
+                f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate>"
+                f"<description>{_x(post.get('summary'))}</description></item>"
+            )
+        language_tag = f"<language>{_x(language)}</language>" if language != ALL_LANGUAGES else ""
+        text = (
+            XML_HEADER
+            + '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>\n'
+            + f"<title>{_x(self.site_title)}</title><link>{_x(base)}/blog</link>"
+            + f"<description>{_x(self.site_title)}</description>{language_tag}"
+            + f'<atom:link href="{_x(feed_url)}" rel="self" type="application/rss+xml"/>\n'
+            + "\n".join(items) + "\n</channel></rss>\n"
+        )
+        return text, "application/rss+xml"
+
+    def _atom(self, language: str, posts: List[dict], base: str, feed_url: str) -> Tuple[str, str]:
+        entries = []
+        for post in posts:
+            url = _x(self.post_url(post))
+            published = parse_timestamp(post.get("published_at")) or EPOCH
+            updated = parse_timestamp(post.get("updated_at")) or published
+            entries.append(
+                f"<entry><title>{_x(post.get('title'))}</title><link href=\"{url}\"/>"
+                f"<id>urn:uuid:{_x(post['id'])}</id>"
+                f"<published>{_iso(published)}</published><updated>{_iso(updated)}</updated>"
+                f"<summary>{_x(post.get('summary'))}</summary></entry>"
+            )
+        lang_attr = f' xml:lang="{_x(language)}"' if language != ALL_LANGUAGES else ""
+        text = (
+            XML_HEADER
+            + f'<feed xmlns="http://www.w3.org/2005/Atom"{lang_attr}>\n'
+            + f"<title>{_x(self.site_title)}</title><id>{_x(feed_url)}</id>"
+            + f'<link href="{_x(feed_url)}" rel="self"/><link href="{_x(base)}/blog"/>'
+            + f"<updated>{_iso(self._latest_modified(posts))}</updated>\n"
+            + "\n".join(entries) + "\n</feed>\n"
+        )
+        return text, "application/atom+xml"
@@ -0,0 +1,203 @@
+"""
+Responsive variants of hero images.
+
+Generated hero images are 1-3 MB PNGs, yet the blog list shows them as
+small cards. When a post gets a hero image from the media store, the image
+is re-encoded once into:
+
+    variants    AVIF and WebP at 480, 960, 1440 and 1920 px wide, for srcset
+                (never upscaled)
+    card, hero  the narrowest and widest WebP, for a plain <img src>
+    og          a 1200x630 JPEG crop for social cards (scrapers rarely take WebP)
+
+EXIF orientation is applied and all metadata (EXIF, XMP, ICC) is dropped.
+The result is stored on the post as `hero_variants`, next to the original
+`hero_image`, which stays the fallback. Variants are plain media store
+blobs, so they are served with the same immutable cache headers.
+
+Decoding and encoding are CPU-bound, so they run in a process pool rather
+than on the event loop. AVIF needs a Pillow build with libavif (the wheels
+since 11.3 have it); without it only WebP is produced. Without Pillow at
+all, posts simply keep the original image.
+
+Adding variants to posts that predate this, or after VARIANTS_VERSION
+changes:
+
+    python images.py backfill
+"""
+import asyncio
+import io
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from media import HASH_RE, MEDIA_URL_PREFIX, media_url
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the output changes so backfill regenerates stored variants
+VARIANTS_VERSION = 1
+
+RESPONSIVE_WIDTHS = (480, 960, 1440, 1920)
+OG_SIZE = (1200, 630)
+
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+JPEG_QUALITY = 85
+
+
+def _load(path: str):
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    # Nothing from the source file is carried into the variants
+    image.info = {}
+    return image
+
+
+def _encode(image, fmt: str) -> bytes:
+    out = io.BytesIO()
+    if fmt == "AVIF":
+        image.save(out, fmt, quality=AVIF_QUALITY)
+    elif fmt == "WEBP":
+        image.save(out, fmt, quality=WEBP_QUALITY, method=6)
+    else:
+        image.convert("RGB").save(out, fmt, quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def encode_variants(path: str) -> dict:
+    """Decode an image file and encode every variant (runs in a worker process)"""
+    from PIL import Image, ImageOps, features
+
+    image = _load(path)
+    width, height = image.size
+    formats = [("AVIF", "image/avif")] if features.check("avif") else []
+    formats.append(("WEBP", "image/webp"))
+
+    widths = sorted({min(w, width) for w in RESPONSIVE_WIDTHS})
+    outputs = []
+    for target in widths:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for fmt, content_type in formats:
+            outputs.append({"width": target, "height": resized.height, "type": content_type,
+                            "data": _encode(resized, fmt)})
+
+    og = ImageOps.fit(image, OG_SIZE, Image.LANCZOS)
+    return {
+        "width": width,
+        "height": height,
+        "variants": outputs,
+        "og": {"width": OG_SIZE[0], "height": OG_SIZE[1], "type": "image/jpeg", "data": _encode(og, "JPEG")},
+    }
+
+
+def media_digest(url: Optional[str]) -> Optional[str]:
+    """The blob hash of a media store URL, or None for anything else"""
+    if not url or not url.startswith(MEDIA_URL_PREFIX):
+        return None
+    digest = url[len(MEDIA_URL_PREFIX):]
+    return digest if HASH_RE.match(digest) else None
+
+
+def is_current(post: dict) -> bool:
+    """Whether the post's variants were made from its hero image by this version"""
+    variants = post.get("hero_variants") or {}
+    if media_digest(post.get("hero_image")) is None:
+        return not variants
+    return variants.get("source") == post.get("hero_image") and variants.get("version") == VARIANTS_VERSION
+
+
+class ImageProcessor:
+    """Builds hero_variants for media store images in a pool of worker processes"""
+
+    def __init__(self, store, workers: int = 2):
+        self.store = store
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        try:
+            import PIL  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned, not forked: the parent has an event loop and driver threads
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def variants(self, hero_image: Optional[str]) -> Optional[dict]:
+        """hero_variants for a hero image URL; None if it is not a processable media store image"""
+        digest = media_digest(hero_image)
+        if digest is None or not self.available:
+            return None
+        blob = self.store.stat(digest)
+        if blob is None or not blob["content_type"].startswith("image/"):
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+            encoded = await loop.run_in_executor(self._executor(), encode_variants, str(blob["path"]))
+        except Exception as e:
+            logger.warning(f"Could not make variants of {hero_image}: {e}")
+            return None
+
+        async def put(output: dict) -> dict:
+            url = media_url(await self.store.put(output["data"], output["type"]))
+            return {"url": url, "type": output["type"], "width": output["width"], "height": output["height"]}
+
+        variants: List[dict] = [await put(output) for output in encoded["variants"]]
+        og = await put(encoded["og"])
+        webp = [v for v in variants if v["type"] == "image/webp"]
+        smallest = min(len(output["data"]) for output in encoded["variants"])
+        logger.info(f"Made {len(variants)} variants of {digest[:12]}: {blob['size']} bytes -> {smallest} at card size")
+        return {
+            "version": VARIANTS_VERSION,
+            "source": hero_image,
+            "width": encoded["width"],
+            "height": encoded["height"],
+            "card": webp[0]["url"],
+            "hero": webp[-1]["url"],
+            "og": og["url"],
+            "variants": variants,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+async def _main(command: str) -> int:
+    # Uses the app's own write path so caches, feeds and prerendered files follow
+    from server import backfill_hero_variants, client, image_processor
+
+    if command != "backfill":
+        print("usage: python images.py backfill", file=sys.stderr)
+        return 2
+    try:
+        if not image_processor.available:
+            logger.error("Pillow is not installed")
+            return 1
+        updated = await backfill_hero_variants()
+        logger.info(f"Added image variants to {updated} posts")
+        return 0
+    finally:
+        image_processor.close()
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "")))
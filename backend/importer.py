@@ -0,0 +1,339 @@
+"""
+Streaming bulk import of posts from NDJSON or a zip of markdown files.
+
+Records are read incrementally, validated one by one and inserted in chunks
+with insert_many (slugs are allocated per chunk, see slugs.insert_posts).
+Progress is checkpointed on a job document in `post_imports` after every
+chunk, so an interrupted import can be resumed by sending the same file to
+the same job again: records already processed are skipped, and a unique
+import_key on posts turns any replayed rows into no-ops.
+
+The server does the actual work (POST /api/admin/imports/{job_id}) so the
+search index and caches stay in sync; this module's CLI streams a file to
+it and prints progress:
+
+    python importer.py posts.ndjson
+    python importer.py export.zip --resume <job_id>
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sys
+import tempfile
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from slugs import insert_posts
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "zip")
+DEFAULT_CHUNK_SIZE = 500
+MAX_JOB_ERRORS = 100
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+STALE_JOB_SECONDS = 600
+
+
+class ImportFileError(ValueError):
+    """Raised for problems with the upload as a whole (not single records)"""
+
+
+# ---- record sources ----
+
+async def ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Parse NDJSON from a byte stream without holding more than one line"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_json_line(line)
+    if buffer.strip():
+        yield _parse_json_line(buffer)
+
+
+def _parse_json_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        # Surfaces as a per-record error instead of aborting the import
+        return {"_error": f"Invalid JSON: {e}"}
+
+
+_FRONT_MATTER = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.S)
+
+
+def _front_matter_value(raw: str):
+    raw = raw.strip()
+    if raw.startswith("[") and raw.endswith("]"):
+        return [item.strip().strip("'\"") for item in raw[1:-1].split(",") if item.strip()]
+    return raw.strip("'\"")
+
+
+def parse_markdown(text: str, name: str) -> dict:
+    """Turn a markdown file with optional front matter into a post record.
+
+    Front matter is a flat `key: value` block; lists may be written as
+    `[a, b]` or as `- item` lines. Without a title the first `# ` heading is
+    used, and without a summary the first paragraph.
+    """
+    record = {}
+    match = _FRONT_MATTER.match(text)
+    if match:
+        key = None
+        for line in match.group(1).splitlines():
+            if line.lstrip().startswith("- ") and key:
+                if not isinstance(record.get(key), list):
+                    record[key] = []
+                record[key].append(line.lstrip()[2:].strip().strip("'\""))
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                key = key.strip()
+                record[key] = _front_matter_value(value) if value.strip() else []
+        text = text[match.end():]
+
+    body = text.strip()
+    if "title" not in record:
+        heading = re.search(r"^#\s+(.+)$", body, re.M)
+        record["title"] = heading.group(1).strip() if heading else PurePosixPath(name).stem.replace("-", " ")
+    if "summary" not in record:
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", body) if p.strip() and not p.lstrip().startswith("#")]
+        record["summary"] = (paragraphs[0] if paragraphs else record["title"])[:500]
+    if isinstance(record.get("tags"), str):
+        record["tags"] = [tag.strip() for tag in record["tags"].split(",") if tag.strip()]
+    record.setdefault("external_id", name)
+    record["content"] = body
+    return record
+
+
+def zip_records(archive_file) -> Iterator[dict]:
+    """Markdown files of a zip archive in name order (stable across resumes)"""
+    if not zipfile.is_zipfile(archive_file):
+        raise ImportFileError("Upload is not a zip archive")
+    with zipfile.ZipFile(archive_file) as archive:
+        names = sorted(
+            info.filename for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(MARKDOWN_SUFFIXES)
+            and not PurePosixPath(info.filename).name.startswith(".")
+        )
+        for name in names:
+            try:
+                text = archive.read(name).decode("utf-8-sig")
+            except (UnicodeDecodeError, zipfile.BadZipFile) as e:
+                yield {"_error": f"{name}: {e}"}
+                continue
+            yield parse_markdown(text, name)
+
+
+async def upload_records(fmt: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Records of an uploaded body; zips are spooled to disk since they need random access"""
+    if fmt == "ndjson":
+        async for record in ndjson_records(chunks):
+            yield record
+        return
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spooled:
+        async for chunk in chunks:
+            spooled.write(chunk)
+        spooled.seek(0)
+        for record in zip_records(spooled):
+            yield record
+
+
+def import_key(record: dict) -> str:
+    """Stable identity of a source record, used to make replays idempotent"""
+    if record.get("external_id"):
+        return f"ext:{record['external_id']}"
+    basis = json.dumps([record.get("title"), record.get("language"), record.get("content")], ensure_ascii=False)
+    return "sha1:" + hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+# ---- job bookkeeping ----
+
+async def start_job(db, job_id: str, fmt: str) -> int:
+    """Create the job, or reopen it to resume; returns the number of records already processed"""
+    now = datetime.now(timezone.utc)
+    # A job still checkpointing recently belongs to another upload; one that
+    # went quiet was interrupted and may be taken over
+    claimable = {"$or": [
+        {"status": {"$ne": "running"}},
+        {"updated_at": {"$lt": now - timedelta(seconds=STALE_JOB_SECONDS)}},
+    ]}
+    try:
+        previous = await db.post_imports.find_one_and_update(
+            {"id": job_id, **claimable},
+            {
+                "$set": {"status": "running", "format": fmt, "updated_at": now},
+                "$setOnInsert": {
+                    "id": job_id, "created_at": now, "processed": 0,
+                    "inserted": 0, "skipped": 0, "failed": 0, "errors": [],
+                },
+            },
+            upsert=True,
+            projection={"_id": 0, "processed": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+    except DuplicateKeyError:
+        raise ImportFileError(f"Import {job_id} is already running")
+    return previous["processed"] if previous else 0
+
+
+async def get_job(db, job_id: str) -> Optional[dict]:
+    return await db.post_imports.find_one({"id": job_id}, {"_id": 0})
+
+
+def _describe(error: Exception) -> str:
+    # Pydantic's ValidationError: one "field: message" per problem
+    if hasattr(error, "errors"):
+        return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())[:300]
+    return str(error)[:300]
+
+
+def _is_duplicate_import(error: dict) -> bool:
+    key = error.get("keyPattern") or error.get("keyValue") or {}
+    return error.get("code") == 11000 and ("import_key" in key or "import_key" in error.get("errmsg", ""))
+
+
+async def run_import(
+    db,
+    job_id: str,
+    fmt: str,
+    records: AsyncIterator[dict],
+    prepare: Callable[[dict], Awaitable[dict]],
+    on_stored: Callable[[List[dict]], Awaitable[None]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Validate and insert records chunk by chunk, checkpointing the job after each chunk.
+
+    prepare(record) returns the post document or raises for an invalid
+    record; on_stored(docs) propagates inserted posts to derived state.
+    """
+    resume_from = await start_job(db, job_id, fmt)
+    position = 0
+    chunk: List[Tuple[int, dict]] = []
+    progress = {"processed": resume_from, "inserted": 0, "skipped": 0, "failed": 0, "errors": []}
+
+    async def flush():
+        if chunk:
+            stored, errors = await insert_posts(db, [doc for _, doc in chunk])
+            for error in errors:
+                if _is_duplicate_import(error):
+                    progress["skipped"] += 1
+                else:
+                    progress["failed"] += 1
+                    progress["errors"].append({"record": chunk[error["index"]][0], "error": error.get("errmsg", "")[:300]})
+            progress["inserted"] += len(stored)
+            if stored:
+                await on_stored(stored)
+            chunk.clear()
+        await db.post_imports.update_one({"id": job_id}, {
+            "$set": {"processed": progress["processed"], "updated_at": datetime.now(timezone.utc)},
+            "$inc": {"inserted": progress["inserted"], "skipped": progress["skipped"], "failed": progress["failed"]},
+            "$push": {"errors": {"$each": progress["errors"], "$slice": MAX_JOB_ERRORS}},
+        })
+        progress.update({"inserted": 0, "skipped": 0, "failed": 0, "errors": []})
+
+    try:
+        async for record in records:
+            position += 1
+            if position <= resume_from:
+                continue  # already handled before the interruption
+            try:
+                if isinstance(record, dict) and "_error" in record:
+                    raise ValueError(record["_error"])
+                doc = await prepare(record)
+            except Exception as e:
+                progress["failed"] += 1
+                progress["errors"].append({"record": position, "error": _describe(e)})
+            else:
+                chunk.append((position, doc))
+            progress["processed"] = position
+            if len(chunk) >= chunk_size or len(progress["errors"]) >= chunk_size:
+                await flush()
+        await flush()
+    except Exception as e:
+        await flush()
+        await db.post_imports.update_one({"id": job_id}, {"$set": {"status": "failed", "last_error": str(e)[:300]}})
+        raise
+
+    return await db.post_imports.find_one_and_update(
+        {"id": job_id},
+        {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc)}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+# ---- CLI: stream a file to a running server ----
+
+async def _upload(base_url: str, auth: Tuple[str, str], path: str, fmt: str, job_id: str, chunk_size: int) -> int:
+    import httpx
+
+    async def body():
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(256 * 1024)
+                if not block:
+                    return
+                yield block
+
+    url = f"{base_url.rstrip('/')}/api/admin/imports/{job_id}"
+    async with httpx.AsyncClient(auth=auth, timeout=None) as client:
+        upload = asyncio.create_task(client.post(
+            url, params={"format": fmt, "chunk_size": chunk_size}, content=body(),
+            headers={"Content-Type": "application/zip" if fmt == "zip" else "application/x-ndjson"},
+        ))
+        while not upload.done():
+            await asyncio.wait([upload], timeout=2)
+            progress = await client.get(url)
+            if progress.status_code == 200:
+                job = progress.json()
+                logger.info(f"job {job_id}: {job['processed']} processed, {job['inserted']} inserted, "
+                            f"{job['skipped']} skipped, {job['failed']} failed")
+        response = upload.result()
+
+    if response.status_code != 200:
+        logger.error(f"Import failed ({response.status_code}): {response.text[:500]}")
+        logger.error(f"Resume with: python importer.py {path} --resume {job_id}")
+        return 1
+    job = response.json()
+    logger.info(f"Import {job['status']}: {job['inserted']} inserted, {job['skipped']} skipped, {job['failed']} failed")
+    for error in job.get("errors", [])[:20]:
+        logger.warning(f"record {error['record']}: {error['error']}")
+    return 0 if job["failed"] == 0 else 2
+
+
+def main() -> int:
+    import argparse
+    import os
+    from pathlib import Path
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / '.env')
+    parser = argparse.ArgumentParser(description="Import posts from NDJSON or a zip of markdown files")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--resume", metavar="JOB_ID", help="continue an interrupted import")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--url", default=os.environ.get("PUBLIC_API_URL") or "http://localhost:8001")
+    args = parser.parse_args()
+
+    fmt = args.format or ("zip" if args.path.lower().endswith(".zip") else "ndjson")
+    job_id = args.resume or str(uuid.uuid4())
+    logger.info(f"Importing {args.path} as job {job_id}")
+    auth = ("admin", os.environ["ADMIN_PASSWORD"])
+    return asyncio.run(_upload(args.url, auth, args.path, fmt, job_id, args.chunk_size))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Queued, rate-aware email dispatch.
+
+Messages are rendered when they are queued and stored in the `email_outbox`
+collection (see outbox.Outbox). Workers send them through a provider under
+a token-bucket rate limit, using the provider's batch API when several
+messages are due together. Blocking SDK calls run on a small dedicated
+thread pool, so a burst of contact submissions cannot starve the default
+executor or slow down HTTP responses.
+"""
+import asyncio
+import html
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import resend
+
+COMPANY_TYPE_LABELS = {
+    "mental_health_clinic": "Mental Health Clinic / Practice",
+    "hospital": "Hospital / Healthcare System",
+    "university": "University / Educational Institution",
+    "corporate": "Corporation / Enterprise",
+    "hr_recruitment": "HR / Recruitment Agency",
+    "research": "Research Organization",
+    "government": "Government / Public Sector",
+    "investor": "Investor / VC",
+    "individual": "Individual / Personal Use",
+    "other": "Other"
+}
+
+_CELL = "padding: 10px 0; border-bottom: 1px solid #e2e8f0;"
+_CELL_LABEL = f'style="{_CELL} color: #64748b;"'
+# The first label cell also fixes the label column's width
+_CELL_LABEL_WIDE = f'style="{_CELL} color: #64748b; width: 140px;"'
+_CELL_VALUE = f'style="{_CELL} color: #0f172a;"'
+
+CONTACT_EMAIL_TEMPLATE = f"""
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+            <div style="background: linear-gradient(135deg, #0E7490 0%, #155E75 100%); padding: 30px; border-radius: 10px 10px 0 0;">
+                <h1 style="color: white; margin: 0; font-size: 24px;">New Contact Form Submission</h1>
+                <p style="color: #BAE6FD; margin: 10px 0 0 0;">PsyTech Website</p>
+            </div>
+            <div style="background: #f8fafc; padding: 30px; border: 1px solid #e2e8f0; border-top: none; border-radius: 0 0 10px 10px;">
+                <h2 style="color: #0f172a; font-size: 18px; margin-top: 0;">Contact Details</h2>
+                <table style="width: 100%; border-collapse: collapse;">
+                    <tr><td {_CELL_LABEL_WIDE}><strong>Name:</strong></td><td {_CELL_VALUE}>{{name}}</td></tr>
+                    <tr><td {_CELL_LABEL}><strong>Email:</strong></td><td {_CELL_VALUE}><a href="mailto:{{email}}" style="color: #0E7490;">{{email}}</a></td></tr>
+                    <tr><td {_CELL_LABEL}><strong>Phone:</strong></td><td {_CELL_VALUE}>{{phone}}</td></tr>
+                    <tr><td {_CELL_LABEL}><strong>Company:</strong></td><td {_CELL_VALUE}>{{company}}</td></tr>
+                    <tr><td {_CELL_LABEL}><strong>Organization Type:</strong></td><td {_CELL_VALUE}>{{company_type}}</td></tr>
+                </table>
+                <h2 style="color: #0f172a; font-size: 18px; margin-top: 25px;">Message</h2>
+                <div style="background: white; padding: 15px; border-radius: 8px; border: 1px solid #e2e8f0;">
+                    <p style="color: #334155; margin: 0; line-height: 1.6; white-space: pre-wrap;">{{message}}</p>
+                </div>
+            </div>
+        </div>
+        """
+
+
+def render_contact_email(form: dict, sender: str, recipient: str) -> dict:
+    """Build the notification message for a contact submission"""
+    company_type_display = COMPANY_TYPE_LABELS.get(form["company_type"], form["company_type"])
+    # Submitted values are untrusted: escape them before they go into HTML
+    body = CONTACT_EMAIL_TEMPLATE.format(
+        name=html.escape(form["name"]),
+        email=html.escape(form["email"]),
+        phone=html.escape(form.get("phone") or "Not provided"),
+        company=html.escape(form.get("company") or "Not provided"),
+        company_type=html.escape(company_type_display),
+        message=html.escape(form["message"]),
+    )
+    return {
+        "from": sender,
+        "to": [recipient],
+        "subject": f"New PsyTech Inquiry from {form['name']} ({company_type_display})",
+        "html": body,
+    }
+
+
+class RateLimiter:
+    """Token bucket shared by all senders: `rate` requests per second, `burst` at once"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ResendProvider:
+    """Resend SDK on a dedicated, bounded thread pool"""
+
+    name = "resend"
+    max_batch = 100  # Resend batch endpoint limit
+
+    def __init__(self, api_key: str, threads: int = 2):
+        resend.api_key = api_key
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="email")
+
+    @property
+    def configured(self) -> bool:
+        return bool(resend.api_key)
+
+    async def send(self, messages: List[dict]):
+        loop = asyncio.get_running_loop()
+        if len(messages) == 1:
+            await loop.run_in_executor(self._executor, resend.Emails.send, messages[0])
+        else:
+            await loop.run_in_executor(self._executor, resend.Batch.send, messages)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class FakeEmailProvider:
+    """In-memory provider for local development and tests"""
+
+    name = "fake"
+    max_batch = 100
+    configured = True
+
+    def __init__(self):
+        self.sent: List[dict] = []
+        self.calls = 0
+        self.fail_next = 0
+
+    async def send(self, messages: List[dict]):
+        self.calls += 1
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise RuntimeError("Simulated provider failure")
+        self.sent.extend(messages)
+
+    def close(self):
+        pass
+
+
+class EmailDispatcher:
+    """Outbox delivery callback: rate-limits and forwards batches to the provider"""
+
+    def __init__(self, provider, rate_per_second: float = 2.0):
+        self.provider = provider
+        self.limiter = RateLimiter(rate_per_second)
+        self.sent = 0
+
+    async def deliver(self, messages: List[dict]):
+        await self.limiter.acquire()
+        await self.provider.send(messages)
+        self.sent += len(messages)
+
+    def stats(self) -> dict:
+        stats = {
+            "provider": self.provider.name,
+            "rate_per_second": self.limiter.rate,
+            "sent_since_start": self.sent,
+        }
+        if isinstance(self.provider, FakeEmailProvider):
+            stats["provider_calls"] = self.provider.calls
+        return stats
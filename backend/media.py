@@ -0,0 +1,172 @@
+"""
+Content-addressed blob store for post images.
+
+Blobs live on local disk under MEDIA_DIR, keyed by the SHA-256 of their
+bytes, with a small JSON sidecar holding the content type. Because a hash
+always names the same bytes, /api/media/{hash} can be served with immutable
+cache headers.
+
+Moving inline data-URL images out of existing posts:
+
+    python media.py migrate
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+MEDIA_URL_PREFIX = "/api/media/"
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_data_url(data_url: str) -> Optional[Tuple[bytes, str]]:
+    """Decode a base64 data URL into (bytes, content_type), or None if it is not one"""
+    if not data_url or not data_url.startswith("data:") or ";base64," not in data_url:
+        return None
+    header, encoded = data_url.split(",", 1)
+    content_type = header[len("data:"):].split(";", 1)[0] or "application/octet-stream"
+    try:
+        return base64.b64decode(encoded), content_type
+    except ValueError:
+        return None
+
+
+def media_url(digest: str) -> str:
+    return f"{MEDIA_URL_PREFIX}{digest}"
+
+
+class LocalMediaStore:
+    """Blob store on the local filesystem, sharded by the first two hash characters"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _put_sync(self, data: bytes, content_type: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        meta = {"content_type": content_type, "size": len(data)}
+        path.with_suffix(".json").write_text(json.dumps(meta))
+        os.replace(tmp, path)
+        return digest
+
+    async def put(self, data: bytes, content_type: str) -> str:
+        """Store bytes and return their hex SHA-256 digest"""
+        return await asyncio.to_thread(self._put_sync, data, content_type)
+
+    def stat(self, digest: str) -> Optional[dict]:
+        """Return {"path", "content_type", "size"} for a stored blob, or None"""
+        if not HASH_RE.match(digest):
+            return None
+        path = self._path(digest)
+        if not path.exists():
+            return None
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text())
+        except (OSError, ValueError):
+            meta = {}
+        return {
+            "path": path,
+            "content_type": meta.get("content_type", "application/octet-stream"),
+            "size": path.stat().st_size,
+        }
+
+    @staticmethod
+    def iter_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+        """Yield the bytes in [start, end] from a blob in chunks"""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range "bytes=" header into inclusive (start, end).
+
+    Returns None when there is no usable Range header and raises ValueError
+    when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(end_s))
+            end = size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+async def migrate_inline_images(db, store: LocalMediaStore) -> int:
+    """Move data-URL hero images out of post documents into the store"""
+    migrated = 0
+    cursor = db.posts.find({"hero_image": {"$regex": "^data:"}}, {"_id": 0, "id": 1, "hero_image": 1})
+    async for post in cursor:
+        parsed = parse_data_url(post["hero_image"])
+        if not parsed:
+            logger.warning(f"Skipping post {post['id']}: hero_image is not a base64 data URL")
+            continue
+        digest = await store.put(*parsed)
+        # Only replace the value we read, in case the post was edited meanwhile
+        result = await db.posts.update_one(
+            {"id": post["id"], "hero_image": post["hero_image"]},
+            {"$set": {"hero_image": media_url(digest)}}
+        )
+        migrated += result.modified_count
+    return migrated
+
+
+async def _main(command: str) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    root_dir = Path(__file__).parent
+    load_dotenv(root_dir / '.env')
+    if command != "migrate":
+        print("usage: python media.py migrate", file=sys.stderr)
+        return 2
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        store = LocalMediaStore(os.environ.get('MEDIA_DIR', root_dir / 'media'))
+        migrated = await migrate_inline_images(client[os.environ['DB_NAME']], store)
+        logger.info(f"Moved {migrated} inline hero images to the media store")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "")))
@@ -0,0 +1,250 @@
+"""
+Durable outbox for outbound deliveries (Make.com webhooks, contact emails).
+
+A request records a row in an outbox collection instead of firing a
+background task. A small pool of async workers claims due rows with a
+time-limited lease, delivers them and retries failures with jittered
+exponential backoff, so deliveries survive restarts and never hold up a
+request. When the receiver accepts batches, rows that become due together
+are coalesced into one call.
+"""
+import asyncio
+import logging
+import random
+import statistics
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DELIVERED = "delivered"
+DEAD = "dead"
+
+
+class Outbox:
+    """Mongo-backed delivery queue with a bounded worker pool"""
+
+    def __init__(
+        self,
+        db,
+        collection: str,
+        deliver: Callable[[List[dict]], Awaitable[None]],
+        workers: int = 2,
+        batch_size: int = 1,
+        coalesce_seconds: float = 0.0,
+        max_attempts: int = 8,
+        base_delay: float = 5.0,
+        max_delay: float = 900.0,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 5.0,
+    ):
+        self.collection = db[collection]
+        # deliver(payloads) must raise on failure; len(payloads) <= batch_size
+        self.deliver = deliver
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.coalesce_seconds = coalesce_seconds
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._latencies = deque(maxlen=1000)
+        self.delivered = 0
+        self.failed_attempts = 0
+        self.dead = 0
+
+    # ---- producer side ----
+
+    async def enqueue_many(self, kind: str, payloads: List[dict]) -> List[str]:
+        """Record deliveries; they become due after the coalescing window"""
+        if not payloads:
+            return []
+        now = datetime.now(timezone.utc)
+        due = now + timedelta(seconds=self.coalesce_seconds)
+        rows = [{
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "payload": payload,
+            "status": PENDING,
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": due,
+            "lease_until": None,
+            "last_error": None,
+            "delivered_at": None,
+        } for payload in payloads]
+        await self.collection.insert_many(rows)
+        self._wakeup.set()
+        return [row["id"] for row in rows]
+
+    async def enqueue(self, kind: str, payload: dict) -> str:
+        return (await self.enqueue_many(kind, [payload]))[0]
+
+    # ---- worker side ----
+
+    def _backoff(self, attempts: int) -> float:
+        # "Full jitter": spread retries uniformly so failures do not synchronise
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+
+    async def _claim_one(self, worker_id: str, kind: Optional[str] = None, horizon: float = 0.0) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        query = {"$or": [
+            {"status": PENDING, "next_attempt_at": {"$lte": now + timedelta(seconds=horizon)}},
+            # A worker died mid-delivery: its lease has expired
+            {"status": IN_FLIGHT, "lease_until": {"$lt": now}},
+        ]}
+        if kind:
+            query["kind"] = kind
+        return await self.collection.find_one_and_update(
+            query,
+            {"$set": {
+                "status": IN_FLIGHT,
+                "lease_until": now + timedelta(seconds=self.lease_seconds),
+                "worker": worker_id,
+            }, "$inc": {"attempts": 1}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _claim_batch(self, worker_id: str) -> List[dict]:
+        first = await self._claim_one(worker_id)
+        if not first:
+            return []
+        rows = [first]
+        while len(rows) < self.batch_size:
+            # Sweep up rows that would become due within the coalescing window
+            row = await self._claim_one(worker_id, kind=first["kind"], horizon=self.coalesce_seconds)
+            if not row:
+                break
+            rows.append(row)
+        return rows
+
+    async def _complete(self, rows: List[dict]):
+        now = datetime.now(timezone.utc)
+        await self.collection.update_many(
+            {"id": {"$in": [r["id"] for r in rows]}},
+            {"$set": {"status": DELIVERED, "delivered_at": now, "lease_until": None, "last_error": None}},
+        )
+        for row in rows:
+            created_at = row["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            self._latencies.append((now - created_at).total_seconds())
+        self.delivered += len(rows)
+
+    async def _fail(self, rows: List[dict], error: str):
+        now = datetime.now(timezone.utc)
+        self.failed_attempts += len(rows)
+        for row in rows:
+            if row["attempts"] >= self.max_attempts:
+                update = {"status": DEAD, "lease_until": None, "last_error": error}
+                self.dead += 1
+                logger.error(f"Outbox delivery {row['id']} gave up after {row['attempts']} attempts: {error}")
+            else:
+                delay = self._backoff(row["attempts"])
+                update = {"status": PENDING, "lease_until": None, "last_error": error,
+                          "next_attempt_at": now + timedelta(seconds=delay)}
+                logger.warning(f"Outbox delivery {row['id']} attempt {row['attempts']} failed, retrying in {delay:.0f}s: {error}")
+            await self.collection.update_one({"id": row["id"]}, {"$set": update})
+
+    async def _idle_timeout(self) -> float:
+        """Sleep until the next scheduled retry, but no longer than the poll interval"""
+        row = await self.collection.find_one(
+            {"status": PENDING}, {"_id": 0, "next_attempt_at": 1}, sort=[("next_attempt_at", 1)]
+        )
+        if not row:
+            return self.poll_interval
+        due = row["next_attempt_at"]
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        wait = (due - datetime.now(timezone.utc)).total_seconds()
+        return min(self.poll_interval, max(0.05, wait))
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                rows = await self._claim_batch(worker_id)
+                if not rows:
+                    self._wakeup.clear()
+                    timeout = await self._idle_timeout()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        continue
+                    # Rows enqueued just now only become due after the coalescing window
+                    if self.coalesce_seconds:
+                        await asyncio.sleep(self.coalesce_seconds)
+                    continue
+                try:
+                    await self.deliver([row["payload"] for row in rows])
+                except Exception as e:
+                    await self._fail(rows, str(e) or e.__class__.__name__)
+                else:
+                    await self._complete(rows)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox worker {worker_id} error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{uuid.uuid4().hex[:8]}-{n}"))
+            for n in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Stop the workers; rows they held are reclaimed once their lease expires"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ---- observability ----
+
+    async def stats(self) -> dict:
+        counts = {PENDING: 0, IN_FLIGHT: 0, DELIVERED: 0, DEAD: 0}
+        async for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+
+        oldest = await self.collection.find_one(
+            {"status": {"$in": [PENDING, IN_FLIGHT]}}, {"_id": 0, "created_at": 1}, sort=[("created_at", 1)]
+        )
+        oldest_age = None
+        if oldest:
+            created_at = oldest["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            oldest_age = round((datetime.now(timezone.utc) - created_at).total_seconds(), 1)
+
+        latencies = sorted(self._latencies)
+        latency = None
+        if latencies:
+            latency = {
+                "samples": len(latencies),
+                "mean_seconds": round(statistics.mean(latencies), 3),
+                "p50_seconds": round(latencies[len(latencies) // 2], 3),
+                "p95_seconds": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+            }
+        return {
+            "depth": counts[PENDING] + counts[IN_FLIGHT],
+            "by_status": counts,
+            "oldest_pending_age_seconds": oldest_age,
+            "workers": len(self._tasks),
+            "batch_size": self.batch_size,
+            "delivered_since_start": self.delivered,
+            "failed_attempts_since_start": self.failed_attempts,
+            "dead_since_start": self.dead,
+            "delivery_latency": latency,
+        }
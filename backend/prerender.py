@@ -0,0 +1,231 @@
+"""
+Static prerender of the public blog for nginx or a CDN.
+
+Published posts only change when the admin write path runs (post_changed),
+so the public API responses can be written to disk there instead of being
+rebuilt per view. With PRERENDER_DIR set, the output directory holds:
+
+    posts/{slug}.json               GET /api/posts/{slug}?rendered=true
+    posts/{slug}.html               standalone article page (PRERENDER_HTML=true)
+    pages/{all|lang}/{n}.json       GET /api/posts?page=n[&lang=..] at the blog's page size
+    tags/{all|lang}.json            GET /api/posts/tags/all[?lang=..]
+
+Updates are incremental: a change only touches the changed post's files and
+the list and tag files of its language (and "all"), and a file is only
+rewritten when its bytes differ. Files are replaced atomically, so the web
+server never serves a half-written one. A full rebuild, which also removes
+files for posts that are no longer published:
+
+    python prerender.py
+"""
+import asyncio
+import html
+import json
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Slugs and language codes become file names; anything else is skipped
+SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,199}$")
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<meta name="description" content="{description}">
+{canonical}</head>
+<body>
+<article>
+<h1>{heading}</h1>
+{body}
+</article>
+</body>
+</html>
+"""
+
+
+def _published(post: Optional[dict]) -> Optional[dict]:
+    return post if post and post.get("status") == "published" else None
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _remove(path: Path) -> bool:
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class Prerenderer:
+    """Writes public API responses to disk; the data comes from the app's own loaders"""
+
+    def __init__(
+        self,
+        out_dir,
+        load_post: Callable[[str], Awaitable[Optional[dict]]],
+        load_pages: Callable[[Optional[str]], Awaitable[List[dict]]],
+        load_tags: Callable[[Optional[str]], Awaitable[list]],
+        load_published: Callable[[], Awaitable[List[dict]]],
+        html: bool = False,
+        site_url: Optional[str] = None,
+    ):
+        self.out_dir = Path(out_dir)
+        self.load_post = load_post
+        self.load_pages = load_pages
+        self.load_tags = load_tags
+        self.load_published = load_published
+        self.html = html
+        self.site_url = site_url.rstrip("/") if site_url else None
+        self._lock = asyncio.Lock()
+
+    def _post_paths(self, slug: str) -> List[Path]:
+        paths = [self.out_dir / "posts" / f"{slug}.json"]
+        if self.html:
+            paths.append(self.out_dir / "posts" / f"{slug}.html")
+        return paths
+
+    def render_html(self, post: dict) -> str:
+        rendered = post.get("rendered") or {}
+        seo = post.get("seo") or {}
+        canonical = ""
+        if self.site_url:
+            canonical = f'<link rel="canonical" href="{html.escape(self.site_url)}/blog/{post["slug"]}">\n'
+        return HTML_TEMPLATE.format(
+            lang=html.escape(post.get("language") or "en"),
+            title=html.escape(seo.get("meta_title") or post["title"]),
+            description=html.escape(seo.get("meta_description") or post.get("summary") or ""),
+            canonical=canonical,
+            heading=html.escape(post["title"]),
+            # Sanitised at write time (render.py)
+            body=rendered.get("html", ""),
+        )
+
+    async def _write(self, path: Path, data: bytes, stats: dict):
+        if await asyncio.to_thread(_write_if_changed, path, data):
+            stats["written"] += 1
+        else:
+            stats["unchanged"] += 1
+
+    async def _remove(self, paths: Iterable[Path], stats: dict):
+        for path in paths:
+            if await asyncio.to_thread(_remove, path):
+                stats["removed"] += 1
+
+    async def _write_post(self, post_id: str, stats: dict) -> Optional[str]:
+        post = await self.load_post(post_id)
+        if not post or not SAFE_NAME_RE.match(post["slug"]):
+            return None
+        json_path, *html_path = self._post_paths(post["slug"])
+        await self._write(json_path, _encode(post), stats)
+        if html_path:
+            await self._write(html_path[0], self.render_html(post).encode(), stats)
+        return post["slug"]
+
+    async def _write_language(self, lang: Optional[str], stats: dict):
+        name = lang or "all"
+        pages_dir = self.out_dir / "pages" / name
+        pages = await self.load_pages(lang)
+        for number, page in enumerate(pages, start=1):
+            await self._write(pages_dir / f"{number}.json", _encode(page), stats)
+        # Pages past the new last page (posts were removed)
+        if pages_dir.exists():
+            extra = [p for p in pages_dir.glob("*.json") if p.stem.isdigit() and int(p.stem) > len(pages)]
+            await self._remove(extra, stats)
+        await self._write(self.out_dir / "tags" / f"{name}.json", _encode(await self.load_tags(lang)), stats)
+
+    async def sync(self, changes: List[tuple]) -> dict:
+        """Rewrite the files affected by (before, after) post changes"""
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+        stale_slugs, post_ids, languages = set(), [], set()
+        for before, after in changes:
+            was, now = _published(before), _published(after)
+            if not (was or now):
+                continue
+            if was and (not now or was.get("slug") != now.get("slug")):
+                stale_slugs.add(was.get("slug"))
+            if now:
+                post_ids.append(now["id"])
+            languages.update(p.get("language") for p in (was, now) if p)
+        if not (stale_slugs or post_ids):
+            return stats
+
+        async with self._lock:
+            written = {await self._write_post(post_id, stats) for post_id in post_ids}
+            for slug in stale_slugs - written:
+                if slug and SAFE_NAME_RE.match(slug):
+                    await self._remove(self._post_paths(slug), stats)
+            for lang in [None, *sorted(l for l in languages if l and SAFE_NAME_RE.match(l))]:
+                await self._write_language(lang, stats)
+        return stats
+
+    async def rebuild(self) -> dict:
+        """Write every published post, list page and tag index; remove everything else"""
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+        async with self._lock:
+            published = await self.load_published()
+            slugs = set()
+            for post in published:
+                slug = await self._write_post(post["id"], stats)
+                if slug:
+                    slugs.add(slug)
+            posts_dir = self.out_dir / "posts"
+            if posts_dir.exists():
+                await self._remove([p for p in posts_dir.iterdir()
+                                    if p.suffix in (".json", ".html") and p.stem not in slugs], stats)
+
+            languages = sorted({p["language"] for p in published if SAFE_NAME_RE.match(p.get("language") or "")})
+            for lang in [None, *languages]:
+                await self._write_language(lang, stats)
+            keep = {"all", *languages}
+            for directory in (self.out_dir / "pages", self.out_dir / "tags"):
+                if not directory.exists():
+                    continue
+                for path in directory.iterdir():
+                    if path.stem in keep:
+                        continue
+                    await self._remove(path.glob("*.json") if path.is_dir() else [path], stats)
+        return stats
+
+
+async def _main() -> int:
+    # Uses the app's own loaders so the files match the API byte for byte
+    from server import prerenderer, client
+
+    try:
+        if prerenderer is None:
+            logger.error("PRERENDER_DIR is not set")
+            return 1
+        stats = await prerenderer.rebuild()
+        logger.info(f"Prerender rebuilt in {prerenderer.out_dir}: {stats}")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main()))
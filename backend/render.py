@@ -0,0 +1,132 @@
+"""
+Write-time rendering of post markdown.
+
+The admin write path (create, update, publish, AI generation, import) stores
+the output next to the post as `rendered`, so readers no longer need to
+render markdown themselves and list routes can read word counts without
+scanning content. Each rendering records the hash of the content and
+renderer version it came from; is_current() tells whether it is stale.
+
+Markdown is parsed with markdown-it-py (CommonMark plus tables and
+strikethrough), whose inline parser runs in linear time, so crafted content
+cannot stall the worker. Raw HTML is escaped rather than passed through (as
+react-markdown does by default), and the HTML is then cleaned with nh3
+against an allow-list of tags, attributes and URL schemes (http(s), mailto
+and relative), so the output is safe to inject.
+
+render_markdown() is CPU-bound; the server calls it through asyncio.to_thread.
+"""
+import hashlib
+import math
+from typing import List
+
+import nh3
+from markdown_it import MarkdownIt
+from slugify import slugify
+
+# Bump whenever the HTML output changes so stored renderings are refreshed
+RENDERER_VERSION = 2
+
+WORDS_PER_MINUTE = 200
+EXCERPT_CHARS = 300
+# Headings deeper than this are left out of the table of contents
+TOC_MAX_LEVEL = 3
+
+ALLOWED_TAGS = {
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "br", "hr", "blockquote", "pre", "code",
+    "ul", "ol", "li", "strong", "em", "del", "s", "a", "img",
+    "table", "thead", "tbody", "tr", "th", "td",
+}
+ALLOWED_ATTRIBUTES = {
+    "h1": {"id"}, "h2": {"id"}, "h3": {"id"}, "h4": {"id"}, "h5": {"id"}, "h6": {"id"},
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "loading"},
+    "ol": {"start"},
+    "code": {"class"},
+    "th": {"style"},
+    "td": {"style"},
+}
+URL_SCHEMES = {"http", "https", "mailto"}
+
+
+def _parser() -> MarkdownIt:
+    md = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+    # Every URL reaches nh3, which drops disallowed schemes but keeps the link text
+    md.validateLink = lambda url: True
+    return md
+
+
+_md = _parser()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(f"{RENDERER_VERSION}\n{content or ''}".encode()).hexdigest()[:32]
+
+
+def is_current(post: dict) -> bool:
+    """Whether the stored rendering matches the post's content and this renderer"""
+    rendered = post.get("rendered") or {}
+    return rendered.get("hash") == content_hash(post.get("content") or "")
+
+
+def inline_text(token) -> str:
+    """Plain text of an inline token, without markup"""
+    parts = []
+    for child in token.children or []:
+        if child.type in ("text", "code_inline"):
+            parts.append(child.content)
+        elif child.type in ("softbreak", "hardbreak"):
+            parts.append(" ")
+        elif child.type == "image":
+            parts.append(child.content)
+    return "".join(parts)
+
+
+def excerpt(paragraphs: List[str], limit: int = EXCERPT_CHARS) -> str:
+    text = " ".join(" ".join(p.split()) for p in paragraphs if p.strip())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0].rstrip(",.;:")
+    return f"{cut}…"
+
+
+def render_markdown(content: str) -> dict:
+    """Render post markdown to sanitised HTML plus table of contents, excerpt and reading time"""
+    content = content or ""
+    tokens = _md.parse(content)
+    toc, anchors, paragraphs = [], set(), []
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open":
+            text = inline_text(tokens[i + 1]).strip()
+            base = slugify(text, max_length=60) or f"section-{len(anchors) + 1}"
+            anchor, n = base, 2
+            while anchor in anchors:
+                anchor, n = f"{base}-{n}", n + 1
+            anchors.add(anchor)
+            token.attrSet("id", anchor)
+            level = int(token.tag[1])
+            if token.level == 0 and level <= TOC_MAX_LEVEL:
+                toc.append({"level": level, "text": text, "anchor": anchor})
+        elif token.type == "paragraph_open" and token.level == 0:
+            paragraphs.append(inline_text(tokens[i + 1]))
+        elif token.type == "inline":
+            for child in token.children or []:
+                if child.type == "image":
+                    child.attrSet("loading", "lazy")
+
+    body = nh3.clean(
+        _md.renderer.render(tokens, _md.options, {}),
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES,
+        filter_style_properties={"text-align"},
+    )
+    word_count = len(content.split())
+    return {
+        "hash": content_hash(content),
+        "html": body.strip(),
+        "toc": toc,
+        "excerpt": excerpt(paragraphs),
+        "word_count": word_count,
+        "reading_minutes": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
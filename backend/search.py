@@ -0,0 +1,312 @@
+"""
+In-process full-text search for published blog posts.
+
+Keeps an inverted index over title, summary and content with BM25 ranking,
+per-language tokenisation for the languages the site supports and
+highlighted snippets. The index is rebuilt from MongoDB on startup and kept
+current by the admin write path (publish, unpublish, update, delete).
+"""
+import html
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+SUPPORTED_LANGUAGES = ("en", "nl", "de", "fr", "fa", "ar", "tr")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title and summary matches count more than body matches
+FIELD_WEIGHTS = {"title": 3.0, "summary": 2.0, "content": 1.0}
+
+SNIPPET_WORDS = 30
+
+STOPWORDS = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+        "how", "in", "into", "is", "it", "its", "of", "on", "or", "that", "the", "their",
+        "this", "to", "was", "what", "when", "which", "who", "why", "will", "with", "you", "your",
+    },
+    "nl": {
+        "aan", "als", "bij", "dat", "de", "den", "der", "die", "dit", "een", "en", "er", "het",
+        "hoe", "in", "is", "met", "naar", "niet", "of", "om", "ook", "op", "te", "tot", "van",
+        "voor", "wat", "wie", "zijn",
+    },
+    "de": {
+        "als", "am", "auch", "auf", "aus", "bei", "das", "dass", "dem", "den", "der", "des", "die",
+        "ein", "eine", "einen", "einer", "es", "für", "im", "in", "ist", "mit", "nicht", "oder",
+        "sich", "sie", "und", "von", "wie", "zu", "zum", "zur",
+    },
+    "fr": {
+        "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "elle", "en", "est", "et",
+        "il", "la", "le", "les", "leur", "mais", "ou", "par", "pas", "pour", "qui", "que", "sa",
+        "se", "son", "sur", "un", "une",
+    },
+    "fa": {
+        "از", "با", "برای", "به", "تا", "در", "را", "که", "و", "یا", "این", "آن", "است", "هم",
+        "بر", "نیز", "شود", "می",
+    },
+    "ar": {
+        "في", "من", "على", "الی", "الى", "عن", "مع", "هذا", "هذه", "ذلک", "التی", "الذی", "و",
+        "او", "ان", "کان", "لا", "ما", "هو", "هی",
+    },
+    "tr": {
+        "ve", "ile", "bir", "bu", "da", "de", "için", "gibi", "çok", "daha", "ne", "o", "olarak",
+        "mi", "ya", "veya", "ki", "her",
+    },
+}
+
+# Light suffix stripping, longest suffix first. Good enough to conflate
+# plural and common inflected forms without a full stemmer dependency.
+SUFFIXES = {
+    "en": ("ations", "ation", "ments", "ment", "ities", "ity", "ness", "ings", "ing", "ies",
+           "ied", "ers", "er", "ed", "ly", "es", "s"),
+    "nl": ("heden", "heid", "ingen", "ing", "lijk", "tjes", "tje", "en", "es", "s", "e"),
+    "de": ("ungen", "ung", "heiten", "heit", "keiten", "keit", "lich", "isch", "ern", "em",
+           "er", "en", "es", "e", "s", "n"),
+    "fr": ("issements", "issement", "ements", "ement", "ations", "ation", "euses", "euse",
+           "ités", "ité", "eaux", "aux", "ives", "ive", "ifs", "if", "es", "s", "e"),
+    "tr": ("lerinden", "larından", "lerinin", "larının", "lerine", "larına", "leri", "ları",
+           "ler", "lar", "dan", "den", "tan", "ten", "nin", "nın", "nun", "nün", "da", "de",
+           "ta", "te", "ın", "in", "un", "ün"),
+    "fa": ("هایی", "های", "ها", "ترین", "تر", "ان", "ات", "ی"),
+    "ar": ("ات", "ون", "ین", "ان", "ها", "یه", "ه", "ی"),
+}
+
+PREFIXES = {
+    "ar": ("وال", "بال", "کال", "فال", "ال", "لل"),
+    "fa": ("می",),
+}
+
+MIN_STEM_LENGTH = {"fa": 2, "ar": 2}
+
+# Arabic-script letter variants folded to a single form
+CHAR_MAP = str.maketrans({
+    "\u064a": "\u06cc",  # Arabic yeh -> Persian yeh
+    "\u0649": "\u06cc",  # alef maksura -> Persian yeh
+    "\u0643": "\u06a9",  # Arabic kaf -> Persian keheh
+    "\u0629": "\u0647",  # teh marbuta -> heh
+    "\u0640": "",        # tatweel
+    "\u200c": "",        # zero-width non-joiner (Persian half-space)
+    "\u0131": "i",       # Turkish dotless i
+})
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+MARKDOWN_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_SYNTAX_RE = re.compile(r"[#>*_`~|]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip diacritics and fold script variants"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    return text.translate(CHAR_MAP)
+
+
+# Word lists are matched against normalised tokens, so normalise them too
+STOPWORDS = {lang: {normalize(w) for w in words} for lang, words in STOPWORDS.items()}
+SUFFIXES = {lang: tuple(normalize(s) for s in suffixes) for lang, suffixes in SUFFIXES.items()}
+PREFIXES = {lang: tuple(normalize(p) for p in prefixes) for lang, prefixes in PREFIXES.items()}
+
+
+def stem(token: str, language: str) -> str:
+    """Strip the longest known prefix/suffix for the language"""
+    min_len = MIN_STEM_LENGTH.get(language, 3)
+    for prefix in PREFIXES.get(language, ()):
+        if token.startswith(prefix) and len(token) - len(prefix) >= min_len:
+            token = token[len(prefix):]
+            break
+    for suffix in SUFFIXES.get(language, ()):
+        if suffix == "s" and token.endswith(("ss", "us", "is")):
+            continue
+        if token.endswith(suffix) and len(token) - len(suffix) >= min_len:
+            return token[:-len(suffix)]
+    return token
+
+
+def _term(word: str, language: str) -> Optional[str]:
+    word = normalize(word)
+    if not word or word in STOPWORDS.get(language, ()):
+        return None
+    return stem(word, language)
+
+
+def tokenize(text: str, language: str) -> List[str]:
+    """Split text into normalised, stemmed index terms"""
+    if not text:
+        return []
+    terms = []
+    for match in WORD_RE.finditer(text):
+        term = _term(match.group(), language)
+        if term:
+            terms.append(term)
+    return terms
+
+
+def strip_markdown(text: str) -> str:
+    """Reduce markdown to plain text for snippets"""
+    text = MARKDOWN_LINK_RE.sub(r"\1", text or "")
+    return MARKDOWN_SYNTAX_RE.sub(" ", text)
+
+
+def build_snippet(text: str, terms: Set[str], language: str, max_words: int = SNIPPET_WORDS) -> Optional[str]:
+    """Return an HTML-escaped excerpt around the first match with <mark> highlights"""
+    plain = strip_markdown(text)
+    words = list(WORD_RE.finditer(plain))
+    if not words:
+        return None
+
+    hits = [i for i, m in enumerate(words) if _term(m.group(), language) in terms]
+    first = hits[0] if hits else 0
+    start_idx = max(0, first - max_words // 3)
+    end_idx = min(len(words), start_idx + max_words)
+    hit_set = set(hits)
+
+    parts = []
+    cursor = words[start_idx].start()
+    for i in range(start_idx, end_idx):
+        m = words[i]
+        parts.append(html.escape(plain[cursor:m.start()]))
+        if i in hit_set:
+            parts.append(f"<mark>{html.escape(m.group())}</mark>")
+        else:
+            parts.append(html.escape(m.group()))
+        cursor = m.end()
+
+    snippet = " ".join("".join(parts).split())
+    if start_idx > 0:
+        snippet = "… " + snippet
+    if end_idx < len(words):
+        snippet = snippet + " …"
+    return snippet
+
+
+class PostSearchIndex:
+    """Inverted index of published posts with BM25F-style scoring"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._docs: Dict[str, dict] = {}
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, post_id: str):
+        return post_id in self._docs
+
+    def add(self, post: dict):
+        """Index (or re-index) a published post"""
+        post_id = post["id"]
+        self.remove(post_id)
+
+        language = post.get("language") or "en"
+        weighted_tf: Dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(post.get(field) or "", language):
+                weighted_tf[term] += weight
+
+        for term, tf in weighted_tf.items():
+            self._postings[term][post_id] = tf
+
+        length = sum(weighted_tf.values())
+        self._doc_terms[post_id] = list(weighted_tf)
+        self._doc_length[post_id] = length
+        self._total_length += length
+        self._docs[post_id] = {
+            "language": language,
+            "tags": set(post.get("tags") or []),
+            "published_at": post.get("published_at") or "",
+            "title": post.get("title") or "",
+            "summary": post.get("summary") or "",
+            "content": post.get("content") or "",
+        }
+
+    def remove(self, post_id: str):
+        """Drop a post from the index if present"""
+        if post_id not in self._docs:
+            return
+        for term in self._doc_terms.pop(post_id):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_length.pop(post_id)
+        del self._docs[post_id]
+
+    def search(self, query: str, language: Optional[str] = None, tag: Optional[str] = None) -> List[dict]:
+        """Rank matching posts; returns [{"id", "score", "terms"}] best first"""
+        n_docs = len(self._docs)
+        if not n_docs or not query:
+            return []
+
+        avg_length = self._total_length / n_docs or 1.0
+        languages = [language] if language else SUPPORTED_LANGUAGES
+        scores: Dict[str, float] = defaultdict(float)
+        matched_terms: Dict[str, Set[str]] = {}
+
+        for lang in languages:
+            for term in set(tokenize(query, lang)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for post_id, tf in postings.items():
+                    doc = self._docs[post_id]
+                    if doc["language"] != lang:
+                        continue
+                    if tag and tag not in doc["tags"]:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_length[post_id] / avg_length)
+                    scores[post_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    matched_terms.setdefault(post_id, set()).add(term)
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (item[1], self._docs[item[0]]["published_at"]),
+            reverse=True,
+        )
+        return [{"id": post_id, "score": score, "terms": matched_terms[post_id]} for post_id, score in ranked]
+
+    def similar(self, text: str, language: str, limit: int = 20) -> List[dict]:
+        """The best matches for text in one language, as {"id", "title", "summary"}"""
+        hits = self.search(text, language)[:limit]
+        return [{"id": hit["id"], "title": self._docs[hit["id"]]["title"],
+                 "summary": self._docs[hit["id"]]["summary"]} for hit in hits]
+
+    def snippet(self, post_id: str, terms: Set[str]) -> Optional[str]:
+        """Highlighted excerpt for a search hit, falling back to the summary"""
+        doc = self._docs.get(post_id)
+        if not doc:
+            return None
+        language = doc["language"]
+        for text in (doc["content"], doc["summary"]):
+            snippet = build_snippet(text, terms, language)
+            if snippet and "<mark>" in snippet:
+                return snippet
+        return build_snippet(doc["summary"], terms, language)
+
+    async def rebuild(self, db):
+        """Rebuild the whole index from the published posts in MongoDB"""
+        self.clear()
+        projection = {"_id": 0, "id": 1, "title": 1, "summary": 1, "content": 1,
+                      "language": 1, "tags": 1, "published_at": 1}
+        async for post in db.posts.find({"status": "published"}, projection):
+            self.add(post)
+        return len(self._docs)
+
+    def sync(self, post: Optional[dict], post_id: Optional[str] = None):
+        """Bring the index in line with a post's current state after a write"""
+        if post and post.get("status") == "published":
+            self.add(post)
+        else:
+            self.remove(post_id or (post or {}).get("id"))
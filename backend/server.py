@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse, RedirectResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -8,45 +9,138 @@ from apscheduler.triggers.cron import CronTrigger
 import os
 import logging
 import asyncio
-import resend
 import httpx
 import secrets
 import base64
+import json
 import random
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone
-from slugify import slugify
+import hashlib
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from search import PostSearchIndex, SUPPORTED_LANGUAGES
+from feeds import FeedIndex, ALL_LANGUAGES as ALL_FEED_LANGUAGES
+from db_indexes import reconcile_indexes, log_reports, has_drift
+from media import LocalMediaStore, MEDIA_URL_PREFIX, parse_data_url, parse_range, media_url
+from images import ImageProcessor, VARIANTS_VERSION, media_digest, is_current as variants_current
+from cache import AsyncLRUCache
+from tag_stats import tag_deltas, apply_tag_deltas, top_tags, rebuild_tag_stats
+from conditional import is_not_modified, validator_headers, not_modified, parse_timestamp
+from pymongo import ReturnDocument, UpdateOne, DeleteOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from outbox import Outbox
+from slugs import (
+    slug_base, slug_suffix, preferred_slug, is_slug_conflict, insert_post,
+    record_redirect, resolve_redirect, drop_redirects, MAX_ATTEMPTS as SLUG_ATTEMPTS
+)
+from exports import FORMATS as EXPORT_FORMATS, ExportError, select_fields, date_range_filter, stream_rows, export_filename
+from importer import FORMATS as IMPORT_FORMATS, DEFAULT_CHUNK_SIZE, ImportFileError, upload_records, import_key, run_import, get_job
+from status_series import (
+    INTERVALS as ROLLUP_INTERVALS, MAX_BUCKETS as MAX_ROLLUP_BUCKETS, status_collection, rollup as status_rollup, as_utc,
+    StatusBuffer, StatusBufferFull
+)
+from render import render_markdown, is_current
+from prerender import Prerenderer
+from ai_pipeline import AIPostPipeline, TOPICS as AI_TOPICS
+from ai_ledger import GenerationLedger
+from mailer import EmailDispatcher, ResendProvider, FakeEmailProvider, render_contact_email
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # Resend configuration
-resend.api_key = os.environ.get('RESEND_API_KEY')
 SENDER_EMAIL = os.environ.get('SENDER_EMAIL')
 NOTIFICATION_EMAIL = os.environ.get('NOTIFICATION_EMAIL')
 
 # Make.com webhook for Buffer integration
 MAKE_WEBHOOK_URL = os.environ.get('MAKE_WEBHOOK_URL')
 FRONTEND_URL = os.environ.get('FRONTEND_URL')
+# Public origin that serves /api (used to build absolute media URLs for webhooks)
+PUBLIC_API_URL = os.environ.get('PUBLIC_API_URL') or FRONTEND_URL
 
 # Admin password (required)
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD')
 if not ADMIN_PASSWORD:
     raise ValueError("ADMIN_PASSWORD environment variable is required")
 
+# Outbound HTTP connection pool
+HTTP_MAX_CONNECTIONS = int(os.environ.get('HTTP_MAX_CONNECTIONS', '20'))
+HTTP_MAX_KEEPALIVE = int(os.environ.get('HTTP_MAX_KEEPALIVE', '10'))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('HTTP_KEEPALIVE_EXPIRY', '60'))
+
+# Webhook outbox: worker count, and batching for receivers that accept
+# {"posts": [...]} (MAKE_WEBHOOK_BATCH_SIZE=1 sends one post per call)
+OUTBOX_WORKERS = int(os.environ.get('OUTBOX_WORKERS', '2'))
+MAKE_WEBHOOK_BATCH_SIZE = int(os.environ.get('MAKE_WEBHOOK_BATCH_SIZE', '1'))
+OUTBOX_COALESCE_SECONDS = float(os.environ.get('OUTBOX_COALESCE_SECONDS', '0'))
+
+# Email dispatch: provider (resend|fake), provider calls per second, and how
+# many queued messages may go out in one batch call (Resend allows up to 100)
+EMAIL_PROVIDER = os.environ.get('EMAIL_PROVIDER', 'resend').lower()
+EMAIL_RATE_PER_SECOND = float(os.environ.get('EMAIL_RATE_PER_SECOND', '2'))
+EMAIL_WORKERS = int(os.environ.get('EMAIL_WORKERS', '1'))
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', '10'))
+
+# Status ingestion: STATUS_BUFFER=true queues checks in memory and writes
+# them with insert_many every STATUS_BUFFER_BATCH_SIZE checks or
+# STATUS_BUFFER_FLUSH_SECONDS; past STATUS_BUFFER_MAX_PENDING callers get 503
+STATUS_BUFFER = os.environ.get('STATUS_BUFFER', 'false').lower() == 'true'
+STATUS_BUFFER_BATCH_SIZE = int(os.environ.get('STATUS_BUFFER_BATCH_SIZE', '500'))
+STATUS_BUFFER_FLUSH_SECONDS = float(os.environ.get('STATUS_BUFFER_FLUSH_SECONDS', '1'))
+STATUS_BUFFER_MAX_PENDING = int(os.environ.get('STATUS_BUFFER_MAX_PENDING', '10000'))
+
+# Static prerender of the public blog (prerender.py); disabled unless
+# PRERENDER_DIR is set. PRERENDER_PER_PAGE should match the blog's page size.
+PRERENDER_DIR = os.environ.get('PRERENDER_DIR')
+PRERENDER_HTML = os.environ.get('PRERENDER_HTML', 'false').lower() == 'true'
+PRERENDER_PER_PAGE = int(os.environ.get('PRERENDER_PER_PAGE', '9'))
+
 # AI config
 AUTO_PUBLISH_AI_POSTS = os.environ.get('AUTO_PUBLISH_AI_POSTS', 'false').lower() == 'true'
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
+# Posts generated at once by the batch endpoint
+AI_CONCURRENCY = int(os.environ.get('AI_CONCURRENCY', '2'))
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Time-series collection of heartbeat checks (status_series.py)
+status_checks = status_collection(db)
+status_buffer = StatusBuffer(
+    status_checks,
+    batch_size=STATUS_BUFFER_BATCH_SIZE,
+    flush_seconds=STATUS_BUFFER_FLUSH_SECONDS,
+    max_pending=STATUS_BUFFER_MAX_PENDING
+) if STATUS_BUFFER else None
+
+# In-process full-text index over published posts
+search_index = PostSearchIndex()
+
+# In-memory sitemap/feed source, kept current like the search index
+feed_index = FeedIndex(site_url=FRONTEND_URL, site_title="PsyTech Insights", api_url=PUBLIC_API_URL)
+
+# Content-addressed image store
+media_store = LocalMediaStore(os.environ.get('MEDIA_DIR', ROOT_DIR / 'media'))
+
+# Worker processes that re-encode hero images into responsive variants
+image_processor = ImageProcessor(media_store, workers=int(os.environ.get('IMAGE_WORKERS', '2')))
+
+# Version of everything the public post routes return. Persisted in
+# site_state so validators survive restarts; advanced by post_changed().
+content_state = {"version": 0, "updated_at": datetime.now(timezone.utc)}
+
+# Read-through cache for the public post routes, invalidated by the admin write path
+response_cache = AsyncLRUCache(
+    maxsize=int(os.environ.get('CACHE_MAX_ENTRIES', '1024')),
+    ttl=float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+)
+
 # Create the main app
 app = FastAPI(title="PsyTech API", version="1.0.0")
 
@@ -85,6 +179,13 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+class StatusRollup(BaseModel):
+    client_name: str
+    bucket_start: datetime
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+
 class ContactFormCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
     email: EmailStr
@@ -104,6 +205,22 @@ class ContactFormResponse(BaseModel):
     phone: Optional[str]
     created_at: str
     status: str
+    status_updated_at: Optional[str] = None
+
+# Allowed inbox transitions: new -> contacted -> closed; closed leads can be reopened
+CONTACT_STATUS_TRANSITIONS = {
+    "new": ["contacted", "closed"],
+    "contacted": ["closed"],
+    "closed": ["new"],
+}
+
+class ContactListResponse(BaseModel):
+    submissions: List[ContactFormResponse]
+    per_page: int
+    next_cursor: Optional[str] = None
+
+class ContactStatusUpdate(BaseModel):
+    status: str
 
 # Blog Post Models
 class PostSEO(BaseModel):
@@ -129,6 +246,85 @@ class PostUpdate(BaseModel):
     language: Optional[str] = None
     seo: Optional[PostSEO] = None
     scheduled_at: Optional[str] = None
+    # updated_at of the version being edited; the write fails with 409 if it moved on
+    updated_at: Optional[str] = None
+
+class PostImport(PostCreate):
+    """A post record from another CMS; dates and status are carried over"""
+    external_id: Optional[str] = None
+    slug: Optional[str] = None
+    status: str = Field(default="draft", pattern="^(draft|published)$")
+    # ISO 8601 or Unix time; stored as UTC ISO strings like every other write path,
+    # since sorting, cursors and date filters compare them as text
+    created_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+
+    @field_validator("created_at", "published_at")
+    @classmethod
+    def as_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Naive times are taken to be UTC"""
+        if value is None:
+            return None
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+class BulkPostOperation(BaseModel):
+    op: str = Field(..., description="publish | unpublish | delete | retag")
+    id: str
+    # retag: replace the tag list, or add/remove individual tags
+    tags: Optional[List[str]] = None
+    add_tags: Optional[List[str]] = None
+    remove_tags: Optional[List[str]] = None
+
+class BulkPostRequest(BaseModel):
+    operations: List[BulkPostOperation] = Field(..., min_length=1, max_length=500)
+
+class BulkPostResult(BaseModel):
+    index: int
+    id: str
+    op: str
+    status: str  # ok | not_found | conflict | invalid | error
+    detail: Optional[str] = None
+
+class BulkPostResponse(BaseModel):
+    results: List[BulkPostResult]
+    summary: dict
+
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    anchor: str
+
+class RenderedPost(BaseModel):
+    """Write-time rendering of a post's markdown (render.py)"""
+    hash: str
+    html: str
+    toc: List[TocEntry]
+    excerpt: str
+    word_count: int
+    reading_minutes: int
+
+class ImageVariant(BaseModel):
+    url: str
+    type: str
+    width: int
+    height: int
+
+class HeroVariants(BaseModel):
+    """Responsive re-encodings of a post's hero image (images.py)"""
+    version: int
+    source: str
+    width: int
+    height: int
+    card: str
+    hero: str
+    og: str
+    variants: List[ImageVariant]
+
+class AIBatchRequest(BaseModel):
+    count: int = Field(1, ge=1, le=20)
+    # Defaults to distinct topics from the built-in list
+    topics: Optional[List[str]] = Field(None, min_length=1)
+    languages: List[str] = Field(default=["en"], min_length=1)
 
 class PostResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -147,110 +343,392 @@ class PostResponse(BaseModel):
     published_at: Optional[str]
     scheduled_at: Optional[str]
     ai_generated: bool = False
+    rendered: Optional[RenderedPost] = None
+    hero_variants: Optional[HeroVariants] = None
+
+class PostCardResponse(BaseModel):
+    """Listing item: card fields only, no body and no inline image data"""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    slug: str
+    title: str
+    summary: str
+    hero_image: Optional[str] = None
+    hero_variants: Optional[HeroVariants] = None
+    tags: List[str]
+    language: str
+    status: str
+    created_at: str
+    updated_at: str
+    published_at: Optional[str]
+    scheduled_at: Optional[str] = None
+    ai_generated: bool = False
+    word_count: int = 0
+    snippet: Optional[str] = None
+
+# Mongo projection for PostCardResponse. Inline data-URL images are swapped
+# for a reference to /api/posts/{id}/hero-image and the body is reduced to a
+# word count server-side (stored at write time by render.py, counted for
+# posts that predate it), so neither leaves the database.
+POST_CARD_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "slug": 1,
+    "title": 1,
+    "summary": 1,
+    "tags": 1,
+    "language": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "published_at": 1,
+    "scheduled_at": 1,
+    "ai_generated": 1,
+    "hero_image": {
+        "$cond": [
+            {"$eq": [{"$substrCP": [{"$ifNull": ["$hero_image", ""]}, 0, 5]}, "data:"]},
+            {"$concat": ["/api/posts/", "$id", "/hero-image"]},
+            "$hero_image"
+        ]
+    },
+    "hero_variants": 1,
+    "word_count": {"$ifNull": [
+        "$rendered.word_count",
+        {"$size": {"$regexFindAll": {"input": {"$ifNull": ["$content", ""]}, "regex": "\\S+"}}}
+    ]},
+}
 
 class PostListResponse(BaseModel):
-    posts: List[PostResponse]
-    total: int
-    page: int
+    posts: List[PostCardResponse]
+    total: Optional[int]
+    page: Optional[int]
     per_page: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
 
 # ============ HELPER FUNCTIONS ============
 
-def generate_slug(title: str, language: str) -> str:
-    """Generate a unique slug from title and language"""
-    base_slug = slugify(title, max_length=80)
-    return f"{base_slug}-{language}"
+def encode_cursor(doc: dict, field: str) -> str:
+    """Opaque keyset cursor pointing just after doc in (field, id) order"""
+    raw = json.dumps([doc.get(field), doc["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-async def send_to_make_webhook(post_data: dict):
-    """Send post data to Make.com webhook for Buffer integration"""
-    if not MAKE_WEBHOOK_URL:
-        logger.warning("MAKE_WEBHOOK_URL not configured, skipping webhook")
-        return False
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor from encode_cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(doc_id, str):
+            raise ValueError("bad id")
+        return value, doc_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(field: str, value, doc_id: str) -> dict:
+    """Query clause for rows after a cursor, for a (field, id) descending sort"""
+    return {"$or": [
+        {field: {"$lt": value}},
+        {field: value, "id": {"$lt": doc_id}}
+    ]}
+
+def absolute_url(url: Optional[str]) -> Optional[str]:
+    """Make an API-relative URL (e.g. /api/media/...) absolute for external consumers"""
+    if url and url.startswith("/api/") and PUBLIC_API_URL:
+        return f"{PUBLIC_API_URL.rstrip('/')}{url}"
+    return url
+
+async def store_inline_image(hero_image: Optional[str]) -> Optional[str]:
+    """Move a data-URL image into the media store and return its media URL"""
+    parsed = parse_data_url(hero_image)
+    if not parsed:
+        return hero_image
+    digest = await media_store.put(*parsed)
+    return media_url(digest)
+
+async def hero_variants_for(hero_image: Optional[str]) -> Optional[dict]:
+    """Responsive variants of a media store hero image, reused from any post that already has them"""
+    if media_digest(hero_image) is None:
+        return None
+    existing = await db.posts.find_one(
+        {"hero_variants.source": hero_image, "hero_variants.version": VARIANTS_VERSION},
+        {"_id": 0, "hero_variants": 1}
+    )
+    if existing:
+        return existing["hero_variants"]
+    return await image_processor.variants(hero_image)
+
+async def backfill_hero_variants() -> int:
+    """Add or refresh hero_variants on posts whose hero image is in the media store"""
+    updated = 0
+    cursor = db.posts.find(
+        {"hero_image": {"$regex": f"^{MEDIA_URL_PREFIX}"}},
+        {"_id": 0, "id": 1, "hero_image": 1, "hero_variants": 1, "updated_at": 1}
+    )
+    async for post in cursor:
+        if variants_current(post):
+            continue
+        variants = await hero_variants_for(post["hero_image"])
+        if variants is None:
+            continue
+        try:
+            existing, after = await modify_post(post["id"], {"hero_variants": variants}, post["updated_at"])
+        except HTTPException as e:
+            logger.warning(f"Skipping post {post['id']}: {e.detail}")
+            continue
+        await post_changed(existing, after)
+        updated += 1
+    return updated
+
+def affects_public(before: Optional[dict], after: Optional[dict]) -> bool:
+    """Whether a post write can change what the public routes return"""
+    return any(p and p.get("status") == "published" for p in (before, after))
+
+async def load_content_state():
+    """Read the persisted public content version"""
+    state = await db.site_state.find_one({"_id": "content"})
+    if state:
+        content_state["version"] = state.get("version", 0)
+        content_state["updated_at"] = parse_timestamp(state.get("updated_at")) or content_state["updated_at"]
+
+async def bump_content_version():
+    """Advance the public content version so cached copies fail revalidation"""
+    now = datetime.now(timezone.utc)
+    state = await db.site_state.find_one_and_update(
+        {"_id": "content"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    content_state["version"] = max(content_state["version"], state["version"])
+    content_state["updated_at"] = now
+
+def invalidate_public_cache(before: Optional[dict], after: Optional[dict]):
+    """Drop cached public responses affected by a post changing from `before` to `after`"""
+    if not affects_public(before, after):
+        return  # drafts never show up on public routes
+    was_public = bool(before and before.get("status") == "published")
+    is_public = bool(after and after.get("status") == "published")
+    
+    slugs = {p.get("slug") for p in (before, after) if p and p.get("slug")}
+    response_cache.invalidate(*[("post", slug) for slug in slugs])
+    response_cache.invalidate_namespace("posts")
     
+    tags_before = set(before.get("tags") or []) if was_public else set()
+    tags_after = set(after.get("tags") or []) if is_public else set()
+    if was_public != is_public or tags_before != tags_after:
+        response_cache.invalidate_namespace("tags")
+
+async def post_changed(before: Optional[dict], after: Optional[dict]):
+    """Propagate a post write to derived state (search index, response cache).
+
+    `before`/`after` are the post documents around the write; None means the
+    post did not exist (create) or no longer exists (delete).
+    """
+    await posts_changed([(before, after)])
+
+async def posts_changed(changes: List[tuple]):
+    """Batch form of post_changed: one tag_stats write and one version bump for all changes"""
+    await render_stale([after for _, after in changes if after])
+    deltas = Counter()
+    redirects = []
+    deleted_ids = []
+    for before, after in changes:
+        post_id = (after or before or {}).get("id")
+        search_index.sync(after, post_id)
+        feed_index.sync(after, post_id)
+        if before and after and before.get("slug") != after.get("slug"):
+            redirects.append((before["slug"], post_id))
+        elif before and not after:
+            deleted_ids.append(post_id)
+        deltas.update(tag_deltas(before, after))
+        invalidate_public_cache(before, after)
+    
+    try:
+        for old_slug, post_id in redirects:
+            await record_redirect(db, old_slug, post_id)
+        if deleted_ids:
+            await drop_redirects(db, deleted_ids)
+    except Exception as e:
+        logger.error(f"Failed to update slug redirects: {e}")
+    try:
+        await apply_tag_deltas(db, {key: delta for key, delta in deltas.items() if delta})
+    except Exception as e:
+        logger.error(f"Failed to update tag_stats, run a rebuild: {e}")
+    if any(affects_public(before, after) for before, after in changes):
+        try:
+            await bump_content_version()
+        except Exception as e:
+            logger.error(f"Failed to advance content version: {e}")
+        if prerenderer is not None:
+            try:
+                await prerenderer.sync(changes)
+            except Exception as e:
+                logger.error(f"Prerender update failed, run a rebuild: {e}")
+
+async def render_content(content: str) -> dict:
+    """render_markdown in a worker thread, so a long post does not stall the event loop"""
+    return await asyncio.to_thread(render_markdown, content)
+
+async def render_stale(posts: List[dict]):
+    """Render posts whose stored rendering is missing or out of date (e.g. on publish), in place"""
+    for post in posts:
+        if "content" not in post or is_current(post):
+            continue
+        post["rendered"] = await render_content(post["content"])
+        try:
+            # Only if the content is still what was rendered
+            await db.posts.update_one(
+                {"id": post["id"], "content": post["content"]},
+                {"$set": {"rendered": post["rendered"]}}
+            )
+        except Exception as e:
+            logger.error(f"Failed to store rendering of post {post['id']}: {e}")
+
+async def modify_post(post_id: str, fields: dict, expected_updated_at: Optional[str] = None, new_slug_base: Optional[str] = None) -> tuple:
+    """Atomically $set fields on a post in one round trip and return (before, after).
+
+    With expected_updated_at the write only applies to that version of the
+    post (optimistic concurrency); a concurrent edit results in a 409. With
+    new_slug_base the slug is reallocated (see slugs.py) when the stored
+    title differs from fields["title"].
+    """
+    query = {"id": post_id}
+    if expected_updated_at:
+        query["updated_at"] = expected_updated_at
+    # Pipeline update so the slug can depend on the stored title; $literal keeps
+    # user-supplied values from being read as expressions
+    stage = {key: {"$literal": value} for key, value in fields.items()}
+    language = {"$literal": fields["language"]} if "language" in fields else "$language"
+    
+    for attempt in range(SLUG_ATTEMPTS):
+        if new_slug_base:
+            suffix = slug_suffix(attempt)
+            new_slug = {"$concat": [{"$literal": f"{new_slug_base}-"}, language, {"$literal": suffix}]}
+            stage["slug"] = {"$cond": [{"$eq": ["$title", {"$literal": fields["title"]}]}, "$slug", new_slug]}
+        try:
+            before = await db.posts.find_one_and_update(
+                query,
+                [{"$set": stage}],
+                projection={"_id": 0},
+                return_document=ReturnDocument.BEFORE
+            )
+            break
+        except DuplicateKeyError as e:
+            # The unique index rejected the new slug: try the next suffix
+            if not (new_slug_base and is_slug_conflict(e)):
+                raise
+    else:
+        raise HTTPException(status_code=409, detail="Could not allocate a unique slug for this title")
+    
+    if before is None:
+        # Only the failure path pays for a second lookup
+        if expected_updated_at and await db.posts.find_one({"id": post_id}, {"_id": 1}):
+            raise HTTPException(status_code=409, detail="Post was modified by another request; reload it and try again")
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    after = {**before, **fields}
+    if new_slug_base and before.get("title") != fields["title"]:
+        after["slug"] = f"{new_slug_base}-{after['language']}{suffix}"
+    return before, after
+
+def content_validators() -> tuple:
+    """ETag and Last-Modified for routes derived from all published posts"""
+    return f'"v{content_state["version"]}"', content_state["updated_at"]
+
+# Shared outbound HTTP client, created on startup and closed on shutdown
+http_client: Optional[httpx.AsyncClient] = None
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client; negotiates HTTP/2 when the h2 package is installed"""
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        timeout=30.0,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if called outside the app lifecycle"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = create_http_client()
+    return http_client
+
+def build_make_payload(post_data: dict) -> dict:
+    """Make.com webhook payload for a published post"""
     # Build post URL - use FRONTEND_URL if available, otherwise skip URL field
     post_url = None
     if FRONTEND_URL:
         post_url = f"{FRONTEND_URL}/blog/{post_data.get('slug')}"
     
-    payload = {
+    return {
         "title": post_data.get("title"),
         "excerpt": post_data.get("summary"),
         "url": post_url,
-        "image_url": post_data.get("hero_image"),
+        # The JPEG crop sized for social cards, when there is one
+        "image_url": absolute_url((post_data.get("hero_variants") or {}).get("og") or post_data.get("hero_image")),
         "tags": post_data.get("tags", []),
         "language": post_data.get("language"),
         "published_at": post_data.get("published_at")
     }
-    
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(MAKE_WEBHOOK_URL, json=payload)
-                if response.status_code in [200, 201, 202]:
-                    logger.info(f"Successfully sent to Make webhook: {post_data.get('title')}")
-                    return True
-                else:
-                    logger.warning(f"Make webhook returned {response.status_code}: {response.text}")
-        except Exception as e:
-            logger.error(f"Make webhook attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-    
-    return False
+
+async def deliver_to_make_webhook(payloads: List[dict]):
+    """Single delivery attempt for the outbox; raises so the outbox can retry"""
+    if not MAKE_WEBHOOK_URL:
+        raise RuntimeError("MAKE_WEBHOOK_URL not configured")
+    body = payloads[0] if len(payloads) == 1 else {"posts": payloads, "count": len(payloads)}
+    response = await get_http_client().post(MAKE_WEBHOOK_URL, json=body)
+    if response.status_code not in [200, 201, 202]:
+        raise RuntimeError(f"Make webhook returned {response.status_code}: {response.text[:200]}")
+    logger.info(f"Successfully sent {len(payloads)} post(s) to Make webhook")
+
+webhook_outbox = Outbox(
+    db,
+    "webhook_outbox",
+    deliver_to_make_webhook,
+    workers=OUTBOX_WORKERS,
+    batch_size=MAKE_WEBHOOK_BATCH_SIZE,
+    coalesce_seconds=OUTBOX_COALESCE_SECONDS
+)
+
+async def send_to_make_webhook(*posts: dict):
+    """Queue post data for the Make.com webhook (Buffer integration), one insert for all posts"""
+    if not MAKE_WEBHOOK_URL:
+        logger.warning("MAKE_WEBHOOK_URL not configured, skipping webhook")
+        return False
+    await webhook_outbox.enqueue_many("make.post_published", [build_make_payload(post) for post in posts])
+    return True
+
+if EMAIL_PROVIDER == "fake":
+    email_provider = FakeEmailProvider()
+else:
+    email_provider = ResendProvider(os.environ.get('RESEND_API_KEY'), threads=EMAIL_WORKERS)
+email_dispatcher = EmailDispatcher(email_provider, rate_per_second=EMAIL_RATE_PER_SECOND)
+
+email_outbox = Outbox(
+    db,
+    "email_outbox",
+    email_dispatcher.deliver,
+    workers=EMAIL_WORKERS,
+    batch_size=min(EMAIL_BATCH_SIZE, email_provider.max_batch)
+)
 
 async def send_contact_email(form_data: ContactFormCreate):
-    """Send email notification for contact form"""
-    try:
-        company_type_labels = {
-            "mental_health_clinic": "Mental Health Clinic / Practice",
-            "hospital": "Hospital / Healthcare System",
-            "university": "University / Educational Institution",
-            "corporate": "Corporation / Enterprise",
-            "hr_recruitment": "HR / Recruitment Agency",
-            "research": "Research Organization",
-            "government": "Government / Public Sector",
-            "investor": "Investor / VC",
-            "individual": "Individual / Personal Use",
-            "other": "Other"
-        }
-        company_type_display = company_type_labels.get(form_data.company_type, form_data.company_type)
-        
-        html_content = f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #0E7490 0%, #155E75 100%); padding: 30px; border-radius: 10px 10px 0 0;">
-                <h1 style="color: white; margin: 0; font-size: 24px;">New Contact Form Submission</h1>
-                <p style="color: #BAE6FD; margin: 10px 0 0 0;">PsyTech Website</p>
-            </div>
-            <div style="background: #f8fafc; padding: 30px; border: 1px solid #e2e8f0; border-top: none; border-radius: 0 0 10px 10px;">
-                <h2 style="color: #0f172a; font-size: 18px; margin-top: 0;">Contact Details</h2>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #64748b; width: 140px;"><strong>Name:</strong></td><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #0f172a;">{form_data.name}</td></tr>
-                    <tr><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #64748b;"><strong>Email:</strong></td><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #0f172a;"><a href="mailto:{form_data.email}" style="color: #0E7490;">{form_data.email}</a></td></tr>
-                    <tr><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #64748b;"><strong>Phone:</strong></td><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #0f172a;">{form_data.phone or 'Not provided'}</td></tr>
-                    <tr><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #64748b;"><strong>Company:</strong></td><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #0f172a;">{form_data.company or 'Not provided'}</td></tr>
-                    <tr><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #64748b;"><strong>Organization Type:</strong></td><td style="padding: 10px 0; border-bottom: 1px solid #e2e8f0; color: #0f172a;">{company_type_display}</td></tr>
-                </table>
-                <h2 style="color: #0f172a; font-size: 18px; margin-top: 25px;">Message</h2>
-                <div style="background: white; padding: 15px; border-radius: 8px; border: 1px solid #e2e8f0;">
-                    <p style="color: #334155; margin: 0; line-height: 1.6; white-space: pre-wrap;">{form_data.message}</p>
-                </div>
-            </div>
-        </div>
-        """
-        
-        params = {
-            "from": SENDER_EMAIL,
-            "to": [NOTIFICATION_EMAIL],
-            "subject": f"New PsyTech Inquiry from {form_data.name} ({company_type_display})",
-            "html": html_content
-        }
-        
-        await asyncio.to_thread(resend.Emails.send, params)
-        logger.info(f"Email notification sent for contact submission from {form_data.email}")
-    except Exception as email_error:
-        logger.error(f"Failed to send email notification: {email_error}")
+    """Queue the email notification for a contact form submission"""
+    if not (email_provider.configured and SENDER_EMAIL and NOTIFICATION_EMAIL):
+        logger.warning("Email delivery not configured, skipping contact notification")
+        return False
+    message = render_contact_email(form_data.model_dump(), SENDER_EMAIL, NOTIFICATION_EMAIL)
+    await email_outbox.enqueue("contact.notification", message)
+    return True
 
 # ============ BASIC ROUTES ============
 
@@ -266,23 +744,46 @@ async def health_check():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
-    _ = await db.status_checks.insert_one(doc)
+    if status_buffer is None:
+        _ = await status_checks.insert_one(status_obj.model_dump())
+        return status_obj
+    try:
+        await status_buffer.add(status_obj.model_dump())
+    except StatusBufferFull:
+        raise HTTPException(status_code=503, detail="Status ingestion is saturated, retry shortly",
+                            headers={"Retry-After": "1"})
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    return status_checks
+async def get_status_checks(
+    client_name: Optional[str] = Query(None, description="Only checks from this client"),
+    limit: int = Query(1000, ge=1, le=1000, description="Number of most recent checks")
+):
+    query = {"client_name": client_name} if client_name else {}
+    return await status_checks.find(query, {"_id": 0}).sort("timestamp", -1).to_list(limit)
+
+@api_router.get("/status/rollup", response_model=List[StatusRollup])
+async def get_status_rollup(
+    interval: str = Query("1h", description="Bucket size: 1m, 5m, 15m, 1h or 1d"),
+    since: Optional[datetime] = Query(None, description="Start of the range (default: 24 hours before until)"),
+    until: Optional[datetime] = Query(None, description="End of the range (default: now)"),
+    client_name: Optional[str] = Query(None, description="Only checks from this client")
+):
+    """Per-client check counts per interval, aggregated in MongoDB"""
+    if interval not in ROLLUP_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of: {', '.join(ROLLUP_INTERVALS)}")
+    until = as_utc(until) or datetime.now(timezone.utc)
+    since = as_utc(since) or until - timedelta(days=1)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    if (until - since).total_seconds() / ROLLUP_INTERVALS[interval] > MAX_ROLLUP_BUCKETS:
+        raise HTTPException(status_code=400, detail="Range has too many intervals; use a larger interval")
+    return await status_rollup(status_checks, since, until, interval, client_name)
 
 # ============ CONTACT ROUTES ============
 
 @api_router.post("/contact", response_model=ContactFormResponse)
-async def submit_contact_form(form_data: ContactFormCreate, background_tasks: BackgroundTasks):
+async def submit_contact_form(form_data: ContactFormCreate):
     """Submit a contact/demo request form and send email notification"""
     try:
         contact_id = str(uuid.uuid4())
@@ -302,8 +803,11 @@ async def submit_contact_form(form_data: ContactFormCreate, background_tasks: Ba
         
         await db.contact_submissions.insert_one(doc)
         
-        # Send email in background
-        background_tasks.add_task(send_contact_email, form_data)
+        # Queue the notification; delivery happens in the email outbox workers
+        try:
+            await send_contact_email(form_data)
+        except Exception as e:
+            logger.error(f"Failed to queue contact notification: {e}")
         
         return ContactFormResponse(
             id=contact_id,
@@ -321,40 +825,154 @@ async def submit_contact_form(form_data: ContactFormCreate, background_tasks: Ba
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
 @api_router.get("/contact", response_model=List[ContactFormResponse])
-async def get_contact_submissions():
-    """Get all contact form submissions (admin endpoint)"""
-    submissions = await db.contact_submissions.find({}, {"_id": 0}).to_list(1000)
+async def get_contact_submissions(username: str = Depends(verify_admin)):
+    """Get the latest contact form submissions (superseded by GET /api/admin/contacts)"""
+    submissions = await db.contact_submissions.find({}, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).to_list(1000)
     return submissions
 
+@admin_router.get("/contacts", response_model=ContactListResponse)
+async def admin_get_contacts(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    company_type: Optional[str] = Query(None, description="Filter by organization type"),
+    per_page: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor"),
+    username: str = Depends(verify_admin)
+):
+    """Contact inbox, newest first, with keyset pagination"""
+    query = {}
+    if status:
+        query["status"] = status
+    if company_type:
+        query["company_type"] = company_type
+    if cursor:
+        query.update(after_cursor("created_at", *decode_cursor(cursor)))
+    
+    submissions = await db.contact_submissions.find(query, {"_id": 0}).sort(
+        [("created_at", -1), ("id", -1)]
+    ).limit(per_page + 1).to_list(per_page + 1)
+    
+    next_cursor = None
+    if len(submissions) > per_page:
+        submissions = submissions[:per_page]
+        next_cursor = encode_cursor(submissions[-1], "created_at")
+    return ContactListResponse(submissions=submissions, per_page=per_page, next_cursor=next_cursor)
+
+@admin_router.post("/contacts/{contact_id}/status", response_model=ContactFormResponse)
+async def admin_update_contact_status(contact_id: str, update: ContactStatusUpdate, username: str = Depends(verify_admin)):
+    """Move a submission through the inbox workflow (new -> contacted -> closed)"""
+    sources = [current for current, targets in CONTACT_STATUS_TRANSITIONS.items() if update.status in targets]
+    if not sources:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {update.status}")
+    
+    now = datetime.now(timezone.utc).isoformat()
+    # The status guard in the filter makes the transition atomic: of two
+    # concurrent requests only the first one can match
+    updated = await db.contact_submissions.find_one_and_update(
+        {"id": contact_id, "status": {"$in": sources}},
+        {
+            "$set": {"status": update.status, "status_updated_at": now},
+            "$push": {"status_history": {"status": update.status, "at": now, "by": username}}
+        },
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated:
+        return updated
+    
+    current = await db.contact_submissions.find_one({"id": contact_id}, {"_id": 0, "status": 1})
+    if not current:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    raise HTTPException(
+        status_code=409,
+        detail=f"Cannot change status from {current.get('status')} to {update.status}"
+    )
+
 # ============ BLOG POSTS ROUTES (PUBLIC) ============
 
 @api_router.get("/posts", response_model=PostListResponse)
 async def get_posts(
+    request: Request,
+    response: Response,
     lang: Optional[str] = Query(None, description="Filter by language"),
     tag: Optional[str] = Query(None, description="Filter by tag"),
     q: Optional[str] = Query(None, description="Search query"),
     page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=50)
+    per_page: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor"),
+    include_total: bool = Query(False, description="Count matching posts in cursor mode")
 ):
-    """Get published posts with filters and pagination"""
+    """Get published posts with filters and pagination (page number or keyset cursor)"""
+    etag, last_modified = content_validators()
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
+    
+    return await response_cache.get_or_load(
+        ("posts", lang, tag, q, page, per_page, cursor, include_total),
+        lambda: load_posts(lang, tag, q, page, per_page, cursor, include_total)
+    )
+
+async def load_posts(lang: Optional[str], tag: Optional[str], q: Optional[str], page: int, per_page: int,
+                     cursor: Optional[str], include_total: bool) -> PostListResponse:
+    if q:
+        return await search_posts(q, lang, tag, page, per_page)
+    
     query = {"status": "published"}
     
     if lang:
         query["language"] = lang
     if tag:
         query["tags"] = {"$in": [tag]}
-    if q:
-        query["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"summary": {"$regex": q, "$options": "i"}},
-            {"content": {"$regex": q, "$options": "i"}}
-        ]
     
-    total = await db.posts.count_documents(query)
+    # Cursor mode seeks on (published_at, id) instead of skipping, so deep
+    # pages cost the same as the first one; page mode is kept for old clients
+    count_query = dict(query)
+    if cursor:
+        query.update(after_cursor("published_at", *decode_cursor(cursor)))
+    
+    find = db.posts.find(query, POST_CARD_PROJECTION).sort([("published_at", -1), ("id", -1)])
+    if not cursor:
+        find = find.skip((page - 1) * per_page)
+    posts = await find.limit(per_page + 1).to_list(per_page + 1)
+    
+    next_cursor = None
+    if len(posts) > per_page:
+        posts = posts[:per_page]
+        next_cursor = encode_cursor(posts[-1], "published_at")
+    
+    total = None
+    total_pages = None
+    if not cursor or include_total:
+        total = await db.posts.count_documents(count_query)
+        total_pages = (total + per_page - 1) // per_page
+    
+    return PostListResponse(
+        posts=posts,
+        total=total,
+        page=None if cursor else page,
+        per_page=per_page,
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    )
+
+async def search_posts(q: str, lang: Optional[str], tag: Optional[str], page: int, per_page: int) -> PostListResponse:
+    """Answer a search query from the in-process index, best matches first"""
+    hits = search_index.search(q, language=lang, tag=tag)
+    total = len(hits)
     total_pages = (total + per_page - 1) // per_page
-    skip = (page - 1) * per_page
+    page_hits = hits[(page - 1) * per_page:page * per_page]
     
-    posts = await db.posts.find(query, {"_id": 0}).sort("published_at", -1).skip(skip).limit(per_page).to_list(per_page)
+    posts = []
+    if page_hits:
+        ids = [hit["id"] for hit in page_hits]
+        docs = await db.posts.find({"id": {"$in": ids}, "status": "published"}, POST_CARD_PROJECTION).to_list(len(ids))
+        by_id = {doc["id"]: doc for doc in docs}
+        for hit in page_hits:
+            doc = by_id.get(hit["id"])
+            if doc:
+                doc["snippet"] = search_index.snippet(hit["id"], hit["terms"])
+                posts.append(doc)
     
     return PostListResponse(
         posts=posts,
@@ -364,54 +982,188 @@ async def get_posts(
         total_pages=total_pages
     )
 
+async def load_post_by_slug(slug: str) -> Optional[dict]:
+    """Published post for a slug, following the redirect left by a rename"""
+    post = await db.posts.find_one({"slug": slug, "status": "published"}, {"_id": 0})
+    if not post:
+        post_id = await resolve_redirect(db, slug)
+        if post_id:
+            post = await db.posts.find_one({"id": post_id, "status": "published"}, {"_id": 0})
+    if post:
+        # Posts published before write-time rendering are rendered on first read
+        await render_stale([post])
+    return post
+
 @api_router.get("/posts/{slug}", response_model=PostResponse)
-async def get_post_by_slug(slug: str):
+async def get_post_by_slug(
+    slug: str,
+    request: Request,
+    response: Response,
+    rendered: bool = Query(False, description="Include the pre-rendered HTML, table of contents, excerpt and reading time")
+):
     """Get a single post by slug"""
-    post = await db.posts.find_one({"slug": slug, "status": "published"}, {"_id": 0})
+    post = await response_cache.get_or_load(("post", slug), lambda: load_post_by_slug(slug))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+    if post["slug"] != slug:
+        # Old slug: send clients to the canonical URL
+        location = f"/api/posts/{post['slug']}"
+        if request.url.query:
+            location += f"?{request.url.query}"
+        return RedirectResponse(location, status_code=301)
+    
+    etag = '"' + hashlib.sha1(f"{post['id']}:{post.get('updated_at')}:{rendered}".encode()).hexdigest()[:20] + '"'
+    last_modified = parse_timestamp(post.get("updated_at"))
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return post if rendered else {**post, "rendered": None}
+
+@api_router.get("/posts/{post_id}/hero-image")
+async def get_post_hero_image(post_id: str):
+    """Serve a not-yet-migrated inline (data URL) hero image as a binary response"""
+    post = await db.posts.find_one({"id": post_id}, {"_id": 0, "hero_image": 1})
+    parsed = parse_data_url((post or {}).get("hero_image"))
+    if not parsed:
+        raise HTTPException(status_code=404, detail="Image not found")
+    data, media_type = parsed
+    return Response(
+        content=data,
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 @api_router.get("/posts/tags/all")
-async def get_all_tags():
+async def get_all_tags(
+    request: Request,
+    response: Response,
+    lang: Optional[str] = Query(None, description="Only count posts in this language")
+):
     """Get all unique tags from published posts"""
-    pipeline = [
-        {"$match": {"status": "published"}},
-        {"$unwind": "$tags"},
-        {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}}
-    ]
-    tags = await db.posts.aggregate(pipeline).to_list(100)
-    return [{"tag": t["_id"], "count": t["count"]} for t in tags]
+    etag, last_modified = content_validators()
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
+    
+    return await response_cache.get_or_load(("tags", lang), lambda: top_tags(db, lang))
+
+# ============ SITEMAP & FEED ROUTES ============
+
+def xml_document_response(request: Request, document) -> Response:
+    """Serve a cached feeds.Document, answering revalidations with 304"""
+    headers = validator_headers(document.etag, document.last_modified)
+    if is_not_modified(request, document.etag, document.last_modified):
+        return not_modified(headers)
+    return Response(document.body, media_type=document.media_type, headers=headers)
+
+def require_feed_index():
+    # Documents are cached for every request, so their URLs cannot come from the Host header
+    if not feed_index.enabled:
+        raise HTTPException(status_code=404, detail="Sitemaps and feeds need FRONTEND_URL to be set")
+
+@api_router.get("/sitemap.xml")
+async def get_sitemap_index(request: Request):
+    """Sitemap index listing every sitemap shard (at most 50,000 URLs each)"""
+    require_feed_index()
+    return xml_document_response(request, feed_index.sitemap_index())
+
+@api_router.get("/sitemaps/{shard:int}.xml")
+async def get_sitemap_shard(shard: int, request: Request):
+    """One sitemap shard, numbered from 1"""
+    require_feed_index()
+    document = feed_index.sitemap(shard - 1)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return xml_document_response(request, document)
+
+def feed_response(lang: str, fmt: str, request: Request) -> Response:
+    require_feed_index()
+    if lang != ALL_FEED_LANGUAGES and lang not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return xml_document_response(request, feed_index.feed(lang, fmt))
+
+@api_router.get("/feeds/{lang}.rss")
+async def get_rss_feed(lang: str, request: Request):
+    """RSS 2.0 feed of the latest posts in a language ("all" for every language)"""
+    return feed_response(lang, "rss", request)
+
+@api_router.get("/feeds/{lang}.atom")
+async def get_atom_feed(lang: str, request: Request):
+    """Atom feed of the latest posts in a language ("all" for every language)"""
+    return feed_response(lang, "atom", request)
+
+# ============ MEDIA ROUTES ============
+
+@api_router.get("/media/{digest}")
+async def get_media(digest: str, request: Request):
+    """Stream a stored blob with immutable caching and single-range support"""
+    blob = media_store.stat(digest)
+    if not blob:
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    size = blob["size"]
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{digest}"',
+        "Accept-Ranges": "bytes",
+    }
+    if request.headers.get("if-none-match") in (f'"{digest}"', "*"):
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    
+    return StreamingResponse(
+        media_store.iter_range(blob["path"], start, end),
+        status_code=status_code,
+        media_type=blob["content_type"],
+        headers=headers
+    )
 
 # ============ ADMIN ROUTES ============
 
-@admin_router.get("/posts", response_model=List[PostResponse])
+@admin_router.get("/posts", response_model=List[PostCardResponse])
 async def admin_get_all_posts(username: str = Depends(verify_admin)):
     """Get all posts (including drafts) for admin"""
-    posts = await db.posts.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
+    posts = await db.posts.find({}, POST_CARD_PROJECTION).sort("created_at", -1).to_list(1000)
     return posts
 
+@admin_router.get("/posts/{post_id}", response_model=PostResponse)
+async def admin_get_post(post_id: str, username: str = Depends(verify_admin)):
+    """Get a single post (any status) with its full content for editing"""
+    post = await db.posts.find_one({"id": post_id}, {"_id": 0})
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
+
 @admin_router.post("/posts", response_model=PostResponse)
 async def admin_create_post(post: PostCreate, username: str = Depends(verify_admin)):
     """Create a new post (as draft)"""
     post_id = str(uuid.uuid4())
-    slug = generate_slug(post.title, post.language)
-    
-    # Check for slug uniqueness
-    existing = await db.posts.find_one({"slug": slug})
-    if existing:
-        slug = f"{slug}-{post_id[:8]}"
-    
     now = datetime.now(timezone.utc).isoformat()
+    hero_image = await store_inline_image(post.hero_image)
     
     doc = {
         "id": post_id,
-        "slug": slug,
+        "slug": preferred_slug(post.title, post.language),
         "title": post.title,
         "summary": post.summary,
         "content": post.content,
-        "hero_image": post.hero_image,
+        "rendered": await render_content(post.content),
+        "hero_image": hero_image,
+        "hero_variants": await hero_variants_for(hero_image),
         "tags": post.tags,
         "language": post.language,
         "status": "draft",
@@ -423,86 +1175,230 @@ async def admin_create_post(post: PostCreate, username: str = Depends(verify_adm
         "ai_generated": False
     }
     
-    await db.posts.insert_one(doc)
-    doc.pop("_id", None)
+    # The unique slug index arbitrates between concurrent creates
+    await insert_post(db, doc)
+    await post_changed(None, doc)
     
     return PostResponse(**doc)
 
 @admin_router.put("/posts/{post_id}", response_model=PostResponse)
 async def admin_update_post(post_id: str, post: PostUpdate, username: str = Depends(verify_admin)):
     """Update an existing post"""
-    existing = await db.posts.find_one({"id": post_id}, {"_id": 0})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
-    update_data = {k: v for k, v in post.model_dump().items() if v is not None}
+    update_data = {k: v for k, v in post.model_dump(exclude={"updated_at"}).items() if v is not None}
     
-    if "title" in update_data and update_data["title"] != existing["title"]:
-        update_data["slug"] = generate_slug(update_data["title"], update_data.get("language", existing["language"]))
+    # The slug follows the title, but only if the title really changed
+    new_slug_base = slug_base(update_data["title"]) if "title" in update_data else None
     
-    if "seo" in update_data and update_data["seo"]:
-        update_data["seo"] = update_data["seo"].model_dump() if hasattr(update_data["seo"], 'model_dump') else update_data["seo"]
+    if "hero_image" in update_data:
+        update_data["hero_image"] = await store_inline_image(update_data["hero_image"])
+        update_data["hero_variants"] = await hero_variants_for(update_data["hero_image"])
+    if "content" in update_data:
+        update_data["rendered"] = await render_content(update_data["content"])
     
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    await db.posts.update_one({"id": post_id}, {"$set": update_data})
-    
-    updated = await db.posts.find_one({"id": post_id}, {"_id": 0})
+    existing, updated = await modify_post(post_id, update_data, post.updated_at, new_slug_base=new_slug_base)
+    await post_changed(existing, updated)
     return PostResponse(**updated)
 
 @admin_router.post("/posts/{post_id}/publish", response_model=PostResponse)
-async def admin_publish_post(post_id: str, background_tasks: BackgroundTasks, username: str = Depends(verify_admin)):
+async def admin_publish_post(
+    post_id: str,
+    updated_at: Optional[str] = Query(None, description="Only publish this version of the post"),
+    username: str = Depends(verify_admin)
+):
     """Publish a post and trigger Make.com webhook"""
-    existing = await db.posts.find_one({"id": post_id}, {"_id": 0})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
     now = datetime.now(timezone.utc).isoformat()
-    
-    await db.posts.update_one(
-        {"id": post_id},
-        {"$set": {"status": "published", "published_at": now, "updated_at": now}}
+    existing, updated = await modify_post(
+        post_id, {"status": "published", "published_at": now, "updated_at": now}, updated_at
     )
+    await post_changed(existing, updated)
     
-    updated = await db.posts.find_one({"id": post_id}, {"_id": 0})
-    
-    # Send to Make.com webhook in background
-    background_tasks.add_task(send_to_make_webhook, updated)
+    # Record the Make.com delivery; outbox workers send it
+    await send_to_make_webhook(updated)
     
     logger.info(f"Post published: {updated['title']}")
     return PostResponse(**updated)
 
 @admin_router.post("/posts/{post_id}/unpublish", response_model=PostResponse)
-async def admin_unpublish_post(post_id: str, username: str = Depends(verify_admin)):
+async def admin_unpublish_post(
+    post_id: str,
+    updated_at: Optional[str] = Query(None, description="Only unpublish this version of the post"),
+    username: str = Depends(verify_admin)
+):
     """Unpublish a post (set to draft)"""
-    existing = await db.posts.find_one({"id": post_id}, {"_id": 0})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
     now = datetime.now(timezone.utc).isoformat()
-    
-    await db.posts.update_one(
-        {"id": post_id},
-        {"$set": {"status": "draft", "updated_at": now}}
-    )
-    
-    updated = await db.posts.find_one({"id": post_id}, {"_id": 0})
+    existing, updated = await modify_post(post_id, {"status": "draft", "updated_at": now}, updated_at)
+    await post_changed(existing, updated)
     return PostResponse(**updated)
 
 @admin_router.delete("/posts/{post_id}")
 async def admin_delete_post(post_id: str, username: str = Depends(verify_admin)):
     """Delete a post"""
-    result = await db.posts.delete_one({"id": post_id})
-    if result.deleted_count == 0:
+    deleted = await db.posts.find_one_and_delete({"id": post_id}, {"_id": 0, "content": 0, "hero_image": 0})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Post not found")
+    await post_changed(deleted, None)
     return {"message": "Post deleted successfully"}
 
+BULK_POST_OPS = ("publish", "unpublish", "delete", "retag")
+
+def bulk_post_fields(op: BulkPostOperation, post: dict, now: str) -> dict:
+    """$set for a non-delete bulk operation, computed from the current post"""
+    if op.op == "publish":
+        return {"status": "published", "published_at": now, "updated_at": now}
+    if op.op == "unpublish":
+        return {"status": "draft", "updated_at": now}
+    tags = list(op.tags) if op.tags is not None else list(post.get("tags") or [])
+    tags += [tag for tag in op.add_tags or [] if tag not in tags]
+    removed = set(op.remove_tags or [])
+    return {"tags": [tag for tag in tags if tag not in removed], "updated_at": now}
+
+@admin_router.post("/posts/bulk", response_model=BulkPostResponse)
+async def admin_bulk_posts(request: BulkPostRequest, username: str = Depends(verify_admin)):
+    """Publish, unpublish, delete or retag many posts with one unordered bulk_write"""
+    operations = request.operations
+    results = [BulkPostResult(index=i, id=op.id, op=op.op, status="ok") for i, op in enumerate(operations)]
+    
+    counts = Counter(op.id for op in operations)
+    for result, op in zip(results, operations):
+        if op.op not in BULK_POST_OPS:
+            result.status, result.detail = "invalid", f"Unknown operation: {op.op}"
+        elif op.op == "retag" and op.tags is None and not op.add_tags and not op.remove_tags:
+            result.status, result.detail = "invalid", "retag needs tags, add_tags or remove_tags"
+        elif counts[op.id] > 1:
+            result.status, result.detail = "invalid", "Post appears more than once in this request"
+    
+    # One read for the current state of every post, needed for derived state
+    # (tags, search, cache) and as the optimistic-concurrency guard below
+    ids = [op.id for op, result in zip(operations, results) if result.status == "ok"]
+    current = {
+        post["id"]: post
+        async for post in db.posts.find({"id": {"$in": ids}}, {"_id": 0, "hero_image": 0})
+    }
+    
+    now = datetime.now(timezone.utc).isoformat()
+    writes, pending = [], []
+    for result, op in zip(results, operations):
+        if result.status != "ok":
+            continue
+        post = current.get(op.id)
+        if not post:
+            result.status, result.detail = "not_found", "Post not found"
+            continue
+        guard = {"id": op.id, "updated_at": post.get("updated_at")}
+        if op.op == "delete":
+            writes.append(DeleteOne(guard))
+            pending.append((result, post, None))
+        else:
+            fields = bulk_post_fields(op, post, now)
+            writes.append(UpdateOne(guard, {"$set": fields}))
+            pending.append((result, post, {**post, **fields}))
+    
+    if writes:
+        write_errors = {}
+        try:
+            outcome = await db.posts.bulk_write(writes, ordered=False)
+            matched, deleted = outcome.matched_count, outcome.deleted_count
+        except BulkWriteError as e:
+            write_errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+            matched, deleted = e.details.get("nMatched", 0), e.details.get("nRemoved", 0)
+        
+        for index, err in write_errors.items():
+            pending[index][0].status, pending[index][0].detail = "error", err.get("errmsg")
+        
+        expected_updates = sum(1 for _, _, after in pending if after is not None)
+        expected_deletes = len(pending) - expected_updates
+        if matched + deleted < expected_updates + expected_deletes - len(write_errors):
+            # Some guards did not match: a post changed or vanished after we read it.
+            # Only this path pays for a second read to find out which.
+            state = {
+                post["id"]: post.get("updated_at")
+                async for post in db.posts.find({"id": {"$in": [p["id"] for _, p, _ in pending]}}, {"_id": 0, "id": 1, "updated_at": 1})
+            }
+            vanished = 0
+            for result, post, after in pending:
+                if result.status != "ok":
+                    continue
+                if after is not None and state.get(post["id"]) != now:
+                    result.status = "not_found" if post["id"] not in state else "conflict"
+                elif after is None and post["id"] in state:
+                    result.status = "conflict"
+                elif after is None:
+                    vanished += 1
+                if result.status == "conflict":
+                    result.detail = "Post was modified by another request"
+                elif result.status == "not_found":
+                    result.detail = "Post not found"
+            if vanished != deleted:
+                logger.warning("Bulk delete raced with another delete; run a tag_stats rebuild if counts look off")
+        
+        applied = [(post, after) for result, post, after in pending if result.status == "ok"]
+        await posts_changed(applied)
+        
+        # All Make.com deliveries for the request go to the outbox in one insert
+        published = [after for _, after in applied if after and after.get("published_at") == now]
+        if published:
+            # The read above skips hero_image (it can be a data URL); the payload falls back to it
+            hero_images = {
+                post["id"]: post.get("hero_image")
+                async for post in db.posts.find({"id": {"$in": [p["id"] for p in published]}}, {"_id": 0, "id": 1, "hero_image": 1})
+            }
+            await send_to_make_webhook(*({**post, "hero_image": hero_images.get(post["id"])} for post in published))
+    
+    summary = dict(Counter(result.status for result in results))
+    logger.info(f"Bulk post operations by {username}: {summary}")
+    return BulkPostResponse(results=results, summary=summary)
+
 @admin_router.post("/posts/generate-ai")
 async def admin_generate_ai_post(background_tasks: BackgroundTasks, username: str = Depends(verify_admin)):
     """Manually trigger AI post generation"""
     background_tasks.add_task(generate_ai_post)
     return {"message": "AI post generation started in background"}
 
+@admin_router.post("/search/reindex")
+async def admin_rebuild_search_index(username: str = Depends(verify_admin)):
+    """Rebuild the full-text search index from the database"""
+    indexed = await search_index.rebuild(db)
+    response_cache.invalidate_namespace("posts")
+    return {"message": "Search index rebuilt", "indexed_posts": indexed}
+
+@admin_router.post("/tags/rebuild")
+async def admin_rebuild_tag_stats(username: str = Depends(verify_admin)):
+    """Recompute the materialised tag counts from the posts collection"""
+    rows = await rebuild_tag_stats(db)
+    response_cache.invalidate_namespace("tags")
+    await bump_content_version()
+    return {"message": "Tag counts rebuilt", "rows": rows}
+
+@admin_router.get("/outbox/stats")
+async def admin_outbox_stats(username: str = Depends(verify_admin)):
+    """Webhook outbox depth, failures and delivery latency"""
+    return await webhook_outbox.stats()
+
+@admin_router.get("/email/stats")
+async def admin_email_stats(username: str = Depends(verify_admin)):
+    """Email queue depth, failures and provider send counters"""
+    return {**await email_outbox.stats(), **email_dispatcher.stats()}
+
+@admin_router.get("/status/buffer")
+async def admin_status_buffer_stats(username: str = Depends(verify_admin)):
+    """Buffered status ingestion counters (enabled: false when checks are inserted per request)"""
+    if status_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **status_buffer.stats()}
+
+@admin_router.get("/cache/stats")
+async def admin_cache_stats(username: str = Depends(verify_admin)):
+    """Hit/miss counters for the public response cache"""
+    return response_cache.stats()
+
+@admin_router.get("/db/indexes")
+async def admin_index_status(username: str = Depends(verify_admin)):
+    """Report drift between declared and existing MongoDB indexes"""
+    reports = await reconcile_indexes(db, apply=False)
+    return {"in_sync": not has_drift(reports), "collections": reports}
+
 @admin_router.get("/scheduler/status")
 async def admin_scheduler_status(username: str = Depends(verify_admin)):
     """Check scheduler status and next scheduled run"""
@@ -521,145 +1417,313 @@ async def admin_scheduler_status(username: str = Depends(verify_admin)):
         "auto_publish_enabled": AUTO_PUBLISH_AI_POSTS
     }
 
+# ============ EXPORT ROUTES ============
+
+def export_response(collection: str, query: dict, fields: Optional[str], fmt: str) -> StreamingResponse:
+    """Stream a collection export sorted by created_at"""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {fmt}")
+    try:
+        selected = select_fields(collection, fields)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    projection = {"_id": 0, **{field: 1 for field in selected}}
+    # Walk the created_at index so the server never has to sort in memory
+    cursor = db[collection].find(query, projection).sort("created_at", 1)
+    return StreamingResponse(
+        stream_rows(cursor, selected, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(collection, fmt)}"'}
+    )
+
+@admin_router.get("/export/posts")
+async def admin_export_posts(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields (default: all)"),
+    since: Optional[datetime] = Query(None, description="Created at or after"),
+    until: Optional[datetime] = Query(None, description="Created before"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    lang: Optional[str] = Query(None, description="Filter by language"),
+    username: str = Depends(verify_admin)
+):
+    """Export posts as a stream of NDJSON or CSV"""
+    query = date_range_filter("created_at", since, until)
+    if status:
+        query["status"] = status
+    if lang:
+        query["language"] = lang
+    return export_response("posts", query, fields, format)
+
+@admin_router.get("/export/contacts")
+async def admin_export_contacts(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields (default: all)"),
+    since: Optional[datetime] = Query(None, description="Submitted at or after"),
+    until: Optional[datetime] = Query(None, description="Submitted before"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    username: str = Depends(verify_admin)
+):
+    """Export contact submissions as a stream of NDJSON or CSV"""
+    query = date_range_filter("created_at", since, until)
+    if status:
+        query["status"] = status
+    return export_response("contact_submissions", query, fields, format)
+
+# ============ IMPORT ROUTES ============
+
+async def prepare_import(record: dict) -> dict:
+    """Validate an import record and build its post document"""
+    post = PostImport.model_validate(record)
+    now = datetime.now(timezone.utc).isoformat()
+    created_at = post.created_at.isoformat() if post.created_at else now
+    published_at = None
+    if post.status == "published":
+        published_at = post.published_at.isoformat() if post.published_at else created_at
+    hero_image = await store_inline_image(post.hero_image)
+    return {
+        "id": str(uuid.uuid4()),
+        "slug": slug_base(post.slug) if post.slug else preferred_slug(post.title, post.language),
+        "title": post.title,
+        "summary": post.summary,
+        "content": post.content,
+        "rendered": await render_content(post.content),
+        "hero_image": hero_image,
+        "hero_variants": await hero_variants_for(hero_image),
+        "tags": post.tags,
+        "language": post.language,
+        "status": post.status,
+        "seo": post.seo.model_dump() if post.seo else None,
+        "created_at": created_at,
+        "updated_at": now,
+        "published_at": published_at,
+        "scheduled_at": post.scheduled_at,
+        "ai_generated": False,
+        "import_key": import_key(record)
+    }
+
+async def imported_posts_stored(docs: List[dict]):
+    # Imported content is not announced on social media, so no Make.com webhooks
+    await posts_changed([(None, doc) for doc in docs])
+
+@admin_router.post("/imports/{job_id}")
+async def admin_import_posts(
+    job_id: str,
+    request: Request,
+    format: str = Query("ndjson", description="ndjson or zip (markdown files with front matter)"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=5000),
+    username: str = Depends(verify_admin)
+):
+    """Stream posts in from NDJSON or a zip; re-send the same file to resume an interrupted job"""
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    try:
+        job = await run_import(
+            db, job_id, format,
+            upload_records(format, request.stream()),
+            prepare_import, imported_posts_stored,
+            chunk_size=chunk_size
+        )
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"Import {job_id} by {username}: {job['inserted']} inserted, {job['skipped']} skipped, {job['failed']} failed")
+    return job
+
+@admin_router.get("/imports/{job_id}")
+async def admin_get_import(job_id: str, username: str = Depends(verify_admin)):
+    """Progress of an import job"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+# ============ PRERENDER ============
+
+async def prerender_post(post_id: str) -> Optional[dict]:
+    """What GET /api/posts/{slug}?rendered=true returns for a published post"""
+    post = await db.posts.find_one({"id": post_id, "status": "published"}, {"_id": 0})
+    if not post:
+        return None
+    await render_stale([post])
+    return PostResponse(**post).model_dump(mode="json")
+
+async def prerender_pages(lang: Optional[str]) -> List[dict]:
+    """Every page of GET /api/posts for a language, from one query"""
+    query = {"status": "published"}
+    if lang:
+        query["language"] = lang
+    cards = await db.posts.find(query, POST_CARD_PROJECTION).sort([("published_at", -1), ("id", -1)]).to_list(None)
+    total = len(cards)
+    per_page = PRERENDER_PER_PAGE
+    pages = []
+    # An empty blog still gets a (empty) first page
+    for start in range(0, max(total, 1), per_page):
+        chunk = cards[start:start + per_page]
+        pages.append(PostListResponse(
+            posts=chunk,
+            total=total,
+            page=start // per_page + 1,
+            per_page=per_page,
+            total_pages=(total + per_page - 1) // per_page,
+            next_cursor=encode_cursor(chunk[-1], "published_at") if start + per_page < total else None
+        ).model_dump(mode="json"))
+    return pages
+
+async def prerender_published() -> List[dict]:
+    return await db.posts.find({"status": "published"}, {"_id": 0, "id": 1, "language": 1}).to_list(None)
+
+prerenderer = Prerenderer(
+    PRERENDER_DIR,
+    load_post=prerender_post,
+    load_pages=prerender_pages,
+    load_tags=lambda lang: top_tags(db, lang),
+    load_published=prerender_published,
+    html=PRERENDER_HTML,
+    site_url=FRONTEND_URL
+) if PRERENDER_DIR else None
+
+@admin_router.post("/prerender/rebuild")
+async def admin_rebuild_prerender(username: str = Depends(verify_admin)):
+    """Rewrite the whole static prerender output"""
+    if prerenderer is None:
+        raise HTTPException(status_code=400, detail="PRERENDER_DIR is not configured")
+    stats = await prerenderer.rebuild()
+    logger.info(f"Prerender rebuilt by {username}: {stats}")
+    return stats
+
 # ============ AI POST GENERATION ============
 
-async def generate_ai_post():
+async def ai_generate_text(prompt: str, system_message: str) -> str:
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=f"psytech-blog-{uuid.uuid4()}",
+        system_message=system_message
+    ).with_model("openai", "gpt-4o")
+    return await chat.send_message(UserMessage(text=prompt))
+
+async def ai_generate_image(prompt: str) -> Optional[bytes]:
+    from emergentintegrations.llm.openai.image_generation import OpenAIImageGeneration
+    
+    image_gen = OpenAIImageGeneration(api_key=EMERGENT_LLM_KEY)
+    images = await image_gen.generate_images(prompt=prompt, model="gpt-image-1", number_of_images=1)
+    return images[0] if images else None
+
+async def save_ai_post(content_data: dict, language: str, topic: str) -> dict:
+    """Store a generated post before its hero image exists"""
+    now = datetime.now(timezone.utc).isoformat()
+    status = "published" if AUTO_PUBLISH_AI_POSTS else "draft"
+    doc = {
+        "id": str(uuid.uuid4()),
+        "slug": preferred_slug(content_data["title"], language),
+        "title": content_data["title"],
+        "summary": content_data["summary"],
+        "content": content_data["content"],
+        "rendered": await render_content(content_data["content"]),
+        "hero_image": None,
+        "tags": content_data.get("tags", ["AI", "Mental Health"]),
+        "language": language,
+        "status": status,
+        "seo": {
+            "meta_title": content_data.get("seo_title"),
+            "meta_description": content_data.get("seo_description")
+        },
+        "created_at": now,
+        "updated_at": now,
+        "published_at": now if status == "published" else None,
+        "scheduled_at": None,
+        "ai_generated": True
+    }
+    await insert_post(db, doc)
+    await post_changed(None, doc)
+    logger.info(f"AI post generated: {doc['title']} (status: {status})")
+    return doc
+
+async def attach_ai_image(post: dict, image: bytes) -> dict:
+    """Store the hero image and its variants in the media store and patch them into the saved post"""
+    hero_image = media_url(await media_store.put(image, "image/png"))
+    hero_variants = await hero_variants_for(hero_image)
+    now = datetime.now(timezone.utc).isoformat()
+    existing, updated = await modify_post(post["id"], {"hero_image": hero_image, "hero_variants": hero_variants, "updated_at": now})
+    await post_changed(existing, updated)
+    return updated
+
+async def announce_ai_post(post: dict):
+    # Auto-published posts go to Make.com once the image is in
+    await send_to_make_webhook(post)
+
+# Topic LRU, prompt history and response cache for generation
+ai_ledger = GenerationLedger(db, search_index)
+
+ai_pipeline = AIPostPipeline(
+    generate_text=ai_generate_text,
+    generate_image=ai_generate_image,
+    save_post=save_ai_post,
+    attach_image=attach_ai_image,
+    publish=announce_ai_post,
+    concurrency=AI_CONCURRENCY,
+    ledger=ai_ledger
+)
+
+async def generate_ai_post() -> Optional[dict]:
     """Generate a blog post using AI"""
+    if not EMERGENT_LLM_KEY:
+        logger.error("EMERGENT_LLM_KEY not configured")
+        return None
+    topics = await ai_ledger.next_topics(1, AI_TOPICS) or [random.choice(AI_TOPICS)]
+    return await ai_pipeline.run(topics[0], "en")
+
+async def ai_batch_jobs(request: AIBatchRequest) -> List[tuple]:
+    """(topic, language) per post: given topics in order, or the least recently used ones, cycling languages"""
+    topics = request.topics
+    if not topics:
+        topics = await ai_ledger.next_topics(request.count, AI_TOPICS) or random.sample(AI_TOPICS, len(AI_TOPICS))
+    return [(topics[i % len(topics)], request.languages[i % len(request.languages)]) for i in range(request.count)]
+
+async def run_ai_batch(batch_id: str, jobs: List[tuple]):
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        from emergentintegrations.llm.openai.image_generation import OpenAIImageGeneration
-        
-        if not EMERGENT_LLM_KEY:
-            logger.error("EMERGENT_LLM_KEY not configured")
-            return
-        
-        # Topics relevant to PsyTech
-        topics = [
-            "AI-driven mental health assessment accuracy",
-            "GDPR compliance in digital mental health",
-            "Reducing bias in psychological testing with AI",
-            "The future of adaptive psychological assessments",
-            "Mental health screening in corporate wellness programs",
-            "AI technology in clinical psychology practice",
-            "Digital transformation of psychological evaluations",
-            "Privacy-first approach to mental health data",
-            "Early intervention through AI-powered screening",
-            "The role of AI in addressing mental health waiting lists",
-            "B2B mental health solutions for European healthcare",
-            "Personalised psychological profiling with AI",
-            "Cultural sensitivity in AI mental health tools",
-            "Evidence-based AI in psychological assessment"
-        ]
-        
-        import random
-        topic = random.choice(topics)
-        
-        # Generate content
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"psytech-blog-{uuid.uuid4()}",
-            system_message="""You are a senior content writer for PsyTech, an AI-driven mental health assessment platform based in the Netherlands. 
-Write professional, scientific, trustworthy content for healthcare professionals, HR leaders, and institutions.
-Tone: Professional, evidence-based, not marketing hype. European/British English spelling.
-Always include practical insights and end with a subtle call-to-action to learn more about PsyTech's solutions."""
-        ).with_model("openai", "gpt-4o")
-        
-        prompt = f"""Write a blog post about: {topic}
-
-Return in this exact JSON format:
-{{
-    "title": "Engaging title (max 80 chars)",
-    "summary": "2-3 sentence summary for preview cards (max 200 chars)",
-    "content": "Full markdown content with ## headings, bullet points, and a Key Takeaway section. 600-800 words. End with a CTA like 'Discover how PsyTech can help your organisation...'",
-    "tags": ["tag1", "tag2", "tag3"],
-    "seo_title": "SEO optimized title (max 60 chars)",
-    "seo_description": "Meta description (max 155 chars)"
-}}
-
-Only return valid JSON, no markdown code blocks."""
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        # Parse response
-        import json
-        try:
-            # Clean response if needed
-            response_clean = response.strip()
-            if response_clean.startswith("```"):
-                response_clean = response_clean.split("```")[1]
-                if response_clean.startswith("json"):
-                    response_clean = response_clean[4:]
-            content_data = json.loads(response_clean)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response: {e}")
-            logger.error(f"Response was: {response[:500]}")
-            return
-        
-        # Generate hero image
-        hero_image_url = None
-        try:
-            image_gen = OpenAIImageGeneration(api_key=EMERGENT_LLM_KEY)
-            
-            image_prompt = f"""Modern, minimalist healthcare illustration for a blog about: {content_data['title']}
-Style: Clean, professional, teal and cyan color palette (#0E7490, #38BDF8), 
-abstract shapes suggesting AI/technology and mental wellness,
-no text, no real human faces, geometric patterns, soft gradients,
-suitable for a European healthtech company website."""
-            
-            images = await image_gen.generate_images(
-                prompt=image_prompt,
-                model="gpt-image-1",
-                number_of_images=1
-            )
-            
-            if images and len(images) > 0:
-                # Store as base64 data URL
-                image_base64 = base64.b64encode(images[0]).decode('utf-8')
-                hero_image_url = f"data:image/png;base64,{image_base64}"
-                logger.info("Hero image generated successfully")
-        except Exception as img_error:
-            logger.error(f"Failed to generate hero image: {img_error}")
-        
-        # Create the post
-        post_id = str(uuid.uuid4())
-        slug = generate_slug(content_data["title"], "en")
-        now = datetime.now(timezone.utc).isoformat()
-        
-        status = "published" if AUTO_PUBLISH_AI_POSTS else "draft"
-        published_at = now if AUTO_PUBLISH_AI_POSTS else None
-        
-        doc = {
-            "id": post_id,
-            "slug": slug,
-            "title": content_data["title"],
-            "summary": content_data["summary"],
-            "content": content_data["content"],
-            "hero_image": hero_image_url,
-            "tags": content_data.get("tags", ["AI", "Mental Health"]),
-            "language": "en",
-            "status": status,
-            "seo": {
-                "meta_title": content_data.get("seo_title"),
-                "meta_description": content_data.get("seo_description")
-            },
-            "created_at": now,
-            "updated_at": now,
-            "published_at": published_at,
-            "scheduled_at": None,
-            "ai_generated": True
-        }
-        
-        await db.posts.insert_one(doc)
-        logger.info(f"AI post generated: {content_data['title']} (status: {status})")
-        
-        # If auto-publish, send to Make webhook
-        if AUTO_PUBLISH_AI_POSTS:
-            await send_to_make_webhook(doc)
-        
+        outcome = await ai_pipeline.run_batch(jobs)
+        summary = dict(Counter(result["status"] for result in outcome["results"]))
+        await db.ai_batches.update_one(
+            {"id": batch_id},
+            {"$set": {**outcome, "summary": summary, "status": "completed",
+                      "finished_at": datetime.now(timezone.utc).isoformat()}}
+        )
+        logger.info(f"AI batch {batch_id} finished in {outcome['elapsed']}s: {summary}")
     except Exception as e:
-        logger.error(f"Error generating AI post: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error(f"AI batch {batch_id} failed: {e}")
+        await db.ai_batches.update_one({"id": batch_id}, {"$set": {"status": "failed", "error": str(e)}})
+
+@admin_router.post("/posts/generate-ai/batch")
+async def admin_generate_ai_batch(request: AIBatchRequest, background_tasks: BackgroundTasks, username: str = Depends(verify_admin)):
+    """Generate several AI posts in the background, AI_CONCURRENCY at a time"""
+    if not EMERGENT_LLM_KEY:
+        raise HTTPException(status_code=400, detail="EMERGENT_LLM_KEY not configured")
+    unsupported = [lang for lang in request.languages if lang not in SUPPORTED_LANGUAGES]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported languages: {', '.join(unsupported)}")
+    
+    jobs = await ai_batch_jobs(request)
+    batch = {
+        "id": str(uuid.uuid4()),
+        "status": "running",
+        "jobs": [{"topic": topic, "language": language} for topic, language in jobs],
+        "concurrency": ai_pipeline.concurrency,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_by": username
+    }
+    await db.ai_batches.insert_one(dict(batch))
+    background_tasks.add_task(run_ai_batch, batch["id"], jobs)
+    return batch
+
+@admin_router.get("/posts/generate-ai/batch/{batch_id}")
+async def admin_get_ai_batch(batch_id: str, username: str = Depends(verify_admin)):
+    """Batch status with per-post results and per-stage timings"""
+    batch = await db.ai_batches.find_one({"id": batch_id}, {"_id": 0})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
 
 # ============ INCLUDE ROUTERS ============
 
@@ -705,12 +1769,107 @@ async def startup_scheduler():
     scheduler.start()
     logger.info("APScheduler started - AI posts scheduled for Monday & Thursday at 10:00 CET")
 
+@app.on_event("startup")
+async def startup_http_client():
+    """Open the shared outbound HTTP connection pool"""
+    get_http_client()
+
+@app.on_event("startup")
+async def startup_webhook_outbox():
+    """Start the webhook delivery workers"""
+    webhook_outbox.start()
+
+@app.on_event("startup")
+async def startup_email_outbox():
+    """Start the email delivery workers"""
+    email_outbox.start()
+
+@app.on_event("startup")
+async def startup_status_buffer():
+    """Start flushing buffered status checks"""
+    if status_buffer is not None:
+        status_buffer.start()
+
+@app.on_event("startup")
+async def startup_db_indexes():
+    """Create missing MongoDB indexes and log any drift"""
+    try:
+        log_reports(await reconcile_indexes(db))
+    except Exception as e:
+        logger.error(f"Index migration failed: {e}")
+
+@app.on_event("startup")
+async def startup_content_state():
+    """Restore the public content version used for ETags"""
+    try:
+        await load_content_state()
+    except Exception as e:
+        logger.error(f"Failed to load content state: {e}")
+
+@app.on_event("startup")
+async def startup_tag_stats():
+    """Seed tag_stats on first run, before the tag route starts reading it"""
+    try:
+        if not await db.tag_stats.find_one({}, {"_id": 1}):
+            rows = await rebuild_tag_stats(db)
+            logger.info(f"tag_stats seeded with {rows} rows")
+    except Exception as e:
+        logger.error(f"Failed to seed tag_stats: {e}")
+
+@app.on_event("startup")
+async def startup_search_index():
+    """Build the full-text search index from published posts"""
+    indexed = await search_index.rebuild(db)
+    logger.info(f"Search index built with {indexed} published posts")
+
+@app.on_event("startup")
+async def startup_ai_ledger():
+    """Register the built-in topics with the generation ledger"""
+    try:
+        await ai_ledger.ensure_topics(AI_TOPICS)
+    except Exception as e:
+        logger.error(f"Failed to seed ai_topics: {e}")
+
+@app.on_event("startup")
+async def startup_feed_index():
+    """Load published posts for sitemaps and feeds"""
+    loaded = await feed_index.rebuild(db)
+    logger.info(f"Feed index built with {loaded} published posts")
+
 @app.on_event("shutdown")
 async def shutdown_scheduler():
     """Shutdown the scheduler gracefully"""
     scheduler.shutdown(wait=False)
     logger.info("APScheduler shut down")
 
+@app.on_event("shutdown")
+async def shutdown_webhook_outbox():
+    """Stop delivery workers before the HTTP client they use is closed"""
+    await webhook_outbox.stop()
+
+@app.on_event("shutdown")
+async def shutdown_email_outbox():
+    """Stop email workers, then release the provider's thread pool"""
+    await email_outbox.stop()
+    email_provider.close()
+
+@app.on_event("shutdown")
+async def shutdown_status_buffer():
+    """Write buffered status checks before the database client closes"""
+    if status_buffer is not None:
+        await status_buffer.stop()
+
+@app.on_event("shutdown")
+async def shutdown_image_processor():
+    """Stop the image worker processes"""
+    image_processor.close()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """Close pooled outbound connections"""
+    if http_client is not None:
+        await http_client.aclose()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
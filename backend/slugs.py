@@ -0,0 +1,122 @@
+"""
+Slug allocation backed by the unique index on posts.slug (see db_indexes.py).
+
+Rather than looking for a free slug and then writing, which races with
+concurrent writers, a post is written with its preferred slug and retried
+with a suffix only when the index rejects it, so the common case is a
+single round trip. Slugs a post has given up are kept in `slug_redirects`
+so old links keep resolving.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from slugify import slugify
+
+# Numbered suffixes (-2, -3, ...) first, then random ones for pathological cases
+NUMBERED_ATTEMPTS = 10
+MAX_ATTEMPTS = 20
+
+
+def slug_base(title: str) -> str:
+    return slugify(title, max_length=80)
+
+
+def preferred_slug(title: str, language: str) -> str:
+    """The slug a post gets when nothing else holds it"""
+    return f"{slug_base(title)}-{language}"
+
+
+def slug_suffix(attempt: int) -> str:
+    if attempt == 0:
+        return ""
+    if attempt < NUMBERED_ATTEMPTS:
+        return f"-{attempt + 1}"
+    return f"-{uuid.uuid4().hex[:8]}"
+
+
+def _key_info(error) -> dict:
+    details = error if isinstance(error, dict) else (getattr(error, "details", None) or {})
+    return details.get("keyPattern") or details.get("keyValue") or {}
+
+
+def is_slug_conflict(error) -> bool:
+    """Whether a duplicate key error (or bulk write error entry) came from the slug index"""
+    key = _key_info(error)
+    if key:
+        return "slug" in key
+    message = error.get("errmsg", "") if isinstance(error, dict) else str(error)
+    return "slug" in message
+
+
+class SlugAllocationError(RuntimeError):
+    pass
+
+
+async def insert_post(db, doc: dict, first_attempt: int = 0) -> dict:
+    """Insert a post, suffixing doc["slug"] until the unique index accepts it"""
+    base = doc.get("slug") or preferred_slug(doc["title"], doc.get("language") or "en")
+    for attempt in range(first_attempt, MAX_ATTEMPTS):
+        doc["slug"] = f"{base}{slug_suffix(attempt)}"
+        try:
+            await db.posts.insert_one(doc)
+        except DuplicateKeyError as e:
+            if not is_slug_conflict(e):
+                raise
+            doc.pop("_id", None)
+            continue
+        doc.pop("_id", None)
+        return doc
+    raise SlugAllocationError(f"No free slug for '{base}' after {MAX_ATTEMPTS} attempts")
+
+
+async def insert_posts(db, docs: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """Bulk variant: one insert_many, then per-document retries for slug conflicts only.
+
+    Returns (stored documents, write errors other than slug conflicts).
+    """
+    for doc in docs:
+        doc["slug"] = doc.get("slug") or preferred_slug(doc["title"], doc.get("language") or "en")
+    if not docs:
+        return [], []
+    try:
+        await db.posts.insert_many(docs, ordered=False)
+        failed = {}
+    except BulkWriteError as e:
+        failed = {err["index"]: err for err in e.details.get("writeErrors", [])}
+
+    stored, errors = [], []
+    for index, doc in enumerate(docs):
+        doc.pop("_id", None)
+        err = failed.get(index)
+        if err is None:
+            stored.append(doc)
+        elif err.get("code") == 11000 and is_slug_conflict(err):
+            try:
+                stored.append(await insert_post(db, doc, first_attempt=1))
+            except DuplicateKeyError as e:
+                # A free slug was found but another unique key (e.g. import_key) clashed
+                errors.append({**(e.details or {}), "index": index, "code": 11000, "errmsg": str(e)})
+        else:
+            errors.append(err)
+    return stored, errors
+
+
+async def record_redirect(db, old_slug: str, post_id: str):
+    """Remember that old_slug used to point at post_id"""
+    await db.slug_redirects.update_one(
+        {"slug": old_slug},
+        {"$set": {"post_id": post_id, "created_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+
+
+async def resolve_redirect(db, slug: str) -> Optional[str]:
+    """Id of the post that used to have this slug, if any"""
+    row = await db.slug_redirects.find_one({"slug": slug}, {"_id": 0, "post_id": 1})
+    return row["post_id"] if row else None
+
+
+async def drop_redirects(db, post_ids: List[str]):
+    await db.slug_redirects.delete_many({"post_id": {"$in": post_ids}})
@@ -0,0 +1,292 @@
+"""
+Status check history: a MongoDB time-series collection with native datetimes
+and TTL retention (declared in db_indexes.TIME_SERIES), plus the aggregation
+that rolls raw checks up into per-client, per-interval counts.
+
+Deployments that still hold the old regular collection with ISO-string
+timestamps convert it once (safe to re-run if interrupted):
+
+    python status_series.py migrate
+
+Rows whose timestamp cannot be parsed are logged and left in
+status_checks_legacy for inspection instead of stopping the migration.
+
+StatusBuffer is the opt-in ingestion path (STATUS_BUFFER=true): checks are
+queued in memory and written with insert_many once a batch fills up or the
+flush interval passes, trading a second or so of durability for far fewer
+round trips.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from bson.codec_options import CodecOptions
+from pymongo.errors import BulkWriteError
+
+from db_indexes import ensure_collections, collection_info
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "status_checks"
+LEGACY_COLLECTION = "status_checks_legacy"
+
+# Rollup bucket sizes in seconds
+INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+# Upper bound on buckets per client in one rollup response
+MAX_BUCKETS = 5000
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def status_collection(db):
+    """The status collection, decoding timestamps as UTC-aware datetimes"""
+    return db.get_collection(COLLECTION, codec_options=CodecOptions(tz_aware=True))
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def rollup_pipeline(since: datetime, until: datetime, interval: str,
+                    client_name: Optional[str] = None) -> List[dict]:
+    match = {"timestamp": {"$gte": since, "$lt": until}}
+    if client_name:
+        match["client_name"] = client_name
+    # Date minus (ms since epoch mod interval) floors to the bucket start; works on any server version
+    millis = INTERVALS[interval] * 1000
+    bucket = {"$subtract": ["$timestamp", {"$mod": [{"$subtract": ["$timestamp", EPOCH]}, millis]}]}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"client_name": "$client_name", "bucket_start": bucket},
+            "count": {"$sum": 1},
+            "first_seen": {"$min": "$timestamp"},
+            "last_seen": {"$max": "$timestamp"},
+        }},
+        {"$sort": {"_id.client_name": 1, "_id.bucket_start": 1}},
+        {"$project": {
+            "_id": 0,
+            "client_name": "$_id.client_name",
+            "bucket_start": "$_id.bucket_start",
+            "count": 1,
+            "first_seen": 1,
+            "last_seen": 1,
+        }},
+    ]
+
+
+async def rollup(collection, since: datetime, until: datetime, interval: str,
+                 client_name: Optional[str] = None) -> List[dict]:
+    """Per-client check counts for each interval in [since, until)"""
+    return await collection.aggregate(rollup_pipeline(since, until, interval, client_name)).to_list(None)
+
+
+class StatusBufferFull(Exception):
+    """The buffer stayed full for longer than the caller was willing to wait"""
+
+
+class StatusBuffer:
+    """Bounded in-memory queue of status checks, flushed with insert_many by size or time"""
+
+    def __init__(self, collection, batch_size: int = 500, flush_seconds: float = 1.0,
+                 max_pending: int = 10000, put_timeout: float = 1.0):
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.put_timeout = put_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(self.batch_size, max_pending))
+        self._batch: List[dict] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failed = 0
+        self.rejected = 0
+        self.flushes = 0
+
+    async def add(self, doc: dict):
+        """Queue one check; waits while the buffer is full and raises StatusBufferFull after put_timeout"""
+        try:
+            self._queue.put_nowait(doc)
+            return
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self._queue.put(doc), self.put_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise StatusBufferFull()
+
+    async def _write(self, batch: List[dict]):
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except Exception as e:
+            # Heartbeats are not worth retrying; the next ones supersede them
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} status checks: {e}")
+        self.flushes += 1
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_seconds
+            while len(self._batch) < self.batch_size:
+                try:
+                    self._batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shielded so stop() can cancel the loop without abandoning a write mid-flight
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._inflight is not None:
+            await self._inflight
+        pending, self._batch = self._batch, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.batch_size):
+            await self._write(pending[start:start + self.batch_size])
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() + len(self._batch),
+            "capacity": self._queue.maxsize,
+            "written": self.written,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+        }
+
+
+def _parse_legacy(doc: dict) -> Optional[dict]:
+    """The time-series row for a legacy document, or None if its timestamp is unusable"""
+    timestamp = doc.get("timestamp")
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return None
+    if not isinstance(timestamp, datetime):
+        return None
+    # Rows without an id get a stable one, so a re-copy can be recognised
+    return {"id": doc.get("id") or str(doc["_id"]), "client_name": doc.get("client_name"), "timestamp": as_utc(timestamp)}
+
+
+async def _copied_ids(collection, rows: List[dict]) -> set:
+    """ids of rows already in the target, from a run interrupted between insert and delete"""
+    times = [row["timestamp"] for row in rows]
+    cursor = collection.find(
+        # The time range lets the server prune buckets; there is no index on id
+        {"id": {"$in": [row["id"] for row in rows]}, "timestamp": {"$gte": min(times), "$lte": max(times)}},
+        {"_id": 0, "id": 1}
+    )
+    return {doc["id"] async for doc in cursor}
+
+
+async def migrate(db, chunk_size: int = 1000) -> int:
+    """Move ISO-string rows from a regular status_checks collection into the time-series one"""
+    info = await collection_info(db, COLLECTION)
+    if info is not None and info.get("type") != "timeseries":
+        await db[COLLECTION].rename(LEGACY_COLLECTION)
+        logger.info(f"Renamed {COLLECTION} to {LEGACY_COLLECTION}")
+    kinds = await ensure_collections(db)
+    if kinds[COLLECTION] != "timeseries":
+        logger.warning("Server does not support time-series collections; copying into a regular collection")
+
+    legacy = db[LEGACY_COLLECTION]
+    target = db[COLLECTION]
+    moved = skipped = 0
+    last_id = None
+    while True:
+        # Copied rows are deleted from the legacy collection, so an interrupted run resumes where it
+        # stopped; walking by _id keeps rows that stay behind (bad or failed) from being re-read
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        docs = await legacy.find(query).sort("_id", 1).limit(chunk_size).to_list(chunk_size)
+        if not docs:
+            break
+        last_id = docs[-1]["_id"]
+
+        parsed = []
+        for doc in docs:
+            row = _parse_legacy(doc)
+            if row is None:
+                skipped += 1
+                logger.warning(f"Skipping status check {doc['_id']}: unusable timestamp {doc.get('timestamp')!r}")
+            else:
+                parsed.append((doc["_id"], row))
+        if not parsed:
+            continue
+
+        copied = await _copied_ids(target, [row for _, row in parsed])
+        pending = [(legacy_id, row) for legacy_id, row in parsed if row["id"] not in copied]
+        done = [legacy_id for legacy_id, row in parsed if row["id"] in copied]
+        if pending:
+            failed = set()
+            try:
+                await target.insert_many([row for _, row in pending], ordered=False)
+            except BulkWriteError as e:
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                for error in e.details.get("writeErrors", []):
+                    logger.warning(f"Could not copy status check {pending[error['index']][0]}: {error.get('errmsg')}")
+            done += [legacy_id for index, (legacy_id, _) in enumerate(pending) if index not in failed]
+        # Only rows known to be in the target leave the legacy collection
+        await legacy.delete_many({"_id": {"$in": done}})
+        moved += len(done)
+        logger.info(f"Migrated {moved} status checks")
+
+    remaining = await legacy.count_documents({}) if await collection_info(db, LEGACY_COLLECTION) is not None else 0
+    if remaining:
+        logger.warning(f"{remaining} status checks could not be migrated and were left in {LEGACY_COLLECTION} "
+                       f"({skipped} with unusable timestamps)")
+    elif await collection_info(db, LEGACY_COLLECTION) is not None:
+        await legacy.drop()
+    return moved
+
+
+async def _main(args) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        moved = await migrate(client[os.environ['DB_NAME']], args.chunk_size)
+        logger.info(f"Done: {moved} status checks migrated")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Status check history maintenance")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,118 @@
+"""
+Materialised tag counts for published posts.
+
+The `tag_stats` collection holds one row per (language, tag) plus a row per
+tag under the language ALL_LANGUAGES for the site-wide list. Rows are kept
+current with $inc deltas from the post write path, so reading the tag list
+is a single indexed query. If the counts ever drift, rebuild them:
+
+    python tag_stats.py rebuild
+"""
+import asyncio
+import logging
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from pymongo import DeleteMany, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+ALL_LANGUAGES = "*"
+
+
+def _published_tags(post: Optional[dict]) -> Counter:
+    if not post or post.get("status") != "published":
+        return Counter()
+    language = post.get("language") or "en"
+    counts = Counter()
+    for tag in post.get("tags") or []:
+        counts[(language, tag)] += 1
+        counts[(ALL_LANGUAGES, tag)] += 1
+    return counts
+
+
+def tag_deltas(before: Optional[dict], after: Optional[dict]) -> dict:
+    """Net count change per (language, tag) for a post write"""
+    deltas = Counter(_published_tags(after))
+    deltas.subtract(_published_tags(before))
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+async def apply_tag_deltas(db, deltas: dict):
+    """Apply deltas from tag_deltas() with upserting $inc updates"""
+    if not deltas:
+        return
+    ops = [
+        UpdateOne({"language": language, "tag": tag}, {"$inc": {"count": delta}}, upsert=True)
+        for (language, tag), delta in deltas.items()
+    ]
+    # Drop rows this write took to zero (tags no longer on any published post)
+    touched = [{"language": language, "tag": tag} for (language, tag), delta in deltas.items() if delta < 0]
+    if touched:
+        ops.append(DeleteMany({"$or": touched, "count": {"$lte": 0}}))
+    await db.tag_stats.bulk_write(ops, ordered=True)
+
+
+async def top_tags(db, language: Optional[str] = None, limit: int = 100) -> List[dict]:
+    """Most used tags, site-wide or for one language"""
+    cursor = db.tag_stats.find(
+        {"language": language or ALL_LANGUAGES, "count": {"$gt": 0}},
+        {"_id": 0, "tag": 1, "count": 1}
+    ).sort([("count", -1), ("tag", 1)]).limit(limit)
+    return await cursor.to_list(limit)
+
+
+async def rebuild_tag_stats(db) -> int:
+    """Recompute every row from the posts collection and drop stale ones"""
+    pipeline = [
+        {"$match": {"status": "published"}},
+        {"$unwind": "$tags"},
+        {"$group": {"_id": {"language": "$language", "tag": "$tags"}, "count": {"$sum": 1}}}
+    ]
+    counts = Counter()
+    async for row in db.posts.aggregate(pipeline):
+        language = row["_id"].get("language") or "en"
+        tag = row["_id"]["tag"]
+        counts[(language, tag)] += row["count"]
+        counts[(ALL_LANGUAGES, tag)] += row["count"]
+
+    ops = [
+        UpdateOne({"language": language, "tag": tag}, {"$set": {"count": count}}, upsert=True)
+        for (language, tag), count in counts.items()
+    ]
+    if ops:
+        await db.tag_stats.bulk_write(ops, ordered=False)
+
+    # Remove rows for tags that are no longer in use
+    stale = []
+    async for row in db.tag_stats.find({}, {"_id": 1, "language": 1, "tag": 1}):
+        if (row.get("language"), row.get("tag")) not in counts:
+            stale.append(row["_id"])
+    if stale:
+        await db.tag_stats.delete_many({"_id": {"$in": stale}})
+    return len(counts)
+
+
+async def _main(command: str) -> int:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    if command != "rebuild":
+        print("usage: python tag_stats.py rebuild", file=sys.stderr)
+        return 2
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        rows = await rebuild_tag_stats(client[os.environ['DB_NAME']])
+        logger.info(f"Rebuilt tag_stats with {rows} rows")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "")))
@@ -0,0 +1,47 @@
+"""
+Test suite for PsyTech AI generation batches
+Tests: POST /api/admin/posts/generate-ai/batch, GET /api/admin/posts/generate-ai/batch/{id}
+(validation only; running a batch calls paid model APIs)
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+class TestAIBatch:
+    """Tests for the AI batch endpoints"""
+
+    def test_batch_requires_auth(self):
+        """Test that batches require authentication"""
+        response = requests.post(f"{BASE_URL}/api/admin/posts/generate-ai/batch", json={"count": 1})
+        assert response.status_code == 401
+
+    def test_invalid_requests_rejected(self, admin_headers):
+        """Test out-of-range counts and unsupported languages are rejected"""
+        url = f"{BASE_URL}/api/admin/posts/generate-ai/batch"
+        assert requests.post(url, json={"count": 0}, headers=admin_headers).status_code == 422
+        assert requests.post(url, json={"count": 21}, headers=admin_headers).status_code == 422
+        assert requests.post(url, json={"languages": ["xx"]}, headers=admin_headers).status_code == 400
+
+    def test_unknown_batch(self, admin_headers):
+        """Test an unknown batch id returns 404"""
+        response = requests.get(
+            f"{BASE_URL}/api/admin/posts/generate-ai/batch/00000000-0000-0000-0000-000000000000",
+            headers=admin_headers
+        )
+        assert response.status_code == 404
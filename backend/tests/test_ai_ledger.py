@@ -0,0 +1,209 @@
+"""
+Test suite for PsyTech AI generation ledger
+Tests: topic LRU, prompt-hash response cache and near-duplicate rejection,
+with an in-memory database and fake model calls (no server or API keys)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ai_ledger import GenerationLedger  # noqa: E402
+from ai_pipeline import AIPostPipeline, prompt_hash, text_prompt  # noqa: E402
+from search import PostSearchIndex  # noqa: E402
+
+POST_JSON = (
+    '{"title": "Burnout screening for hospital staff", '
+    '"summary": "How hospitals can screen their staff for burnout early.", '
+    '"content": "## Why screen\\n\\nEarly screening helps.", "tags": ["burnout"]}'
+)
+
+
+def matches(doc, query):
+    for key, value in query.items():
+        if isinstance(value, dict) and "$in" in value:
+            if doc.get(key) not in value["$in"]:
+                return False
+        elif doc.get(key) != value:
+            return False
+    return True
+
+
+def project(doc, projection):
+    if not projection:
+        return dict(doc)
+    return {key: doc[key] for key, keep in projection.items() if keep and key in doc}
+
+
+class FakeCollection:
+    """The subset of a Motor collection that GenerationLedger uses"""
+
+    def __init__(self, docs=None):
+        self.docs = [dict(doc) for doc in docs or []]
+
+    def _apply(self, doc, update, inserting):
+        doc.update(update.get("$set", {}))
+        if inserting:
+            doc.update(update.get("$setOnInsert", {}))
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        for key, push in update.get("$push", {}).items():
+            doc[key] = (doc.get(key) or []) + push["$each"]
+            if "$slice" in push:
+                doc[key] = doc[key][push["$slice"]:]
+
+    async def find_one(self, query, projection=None):
+        doc = next((doc for doc in self.docs if matches(doc, query)), None)
+        return project(doc, projection) if doc else None
+
+    async def find_one_and_update(self, query, update, sort=None, projection=None, return_document=None):
+        found = [doc for doc in self.docs if matches(doc, query)]
+        for key, direction in reversed(sort or []):
+            # MongoDB sorts null before any value
+            found.sort(key=lambda doc: (doc.get(key) is not None, doc.get(key) or 0), reverse=direction < 0)
+        if not found:
+            return None
+        before = project(found[0], projection)
+        self._apply(found[0], update, inserting=False)
+        return before
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((doc for doc in self.docs if matches(doc, query)), None)
+        if doc is None and upsert:
+            doc = {key: value for key, value in query.items() if not isinstance(value, dict)}
+            self.docs.append(doc)
+            self._apply(doc, update, inserting=True)
+        elif doc is not None:
+            self._apply(doc, update, inserting=False)
+
+
+class FakeDB:
+    def __init__(self, topics=None):
+        self.ai_topics = FakeCollection(topics)
+        self.ai_responses = FakeCollection()
+
+
+def topic(name, last_used_at=None, uses=0):
+    return {"topic": name, "last_used_at": last_used_at, "uses": uses, "titles": [], "prompt_hashes": []}
+
+
+class FakeModels:
+    """Counts model calls and records what the pipeline saved"""
+
+    def __init__(self, response=POST_JSON):
+        self.response = response
+        self.text_calls = 0
+        self.image_calls = 0
+        self.saved = []
+
+    async def generate_text(self, prompt, system_message):
+        self.text_calls += 1
+        return self.response
+
+    async def generate_image(self, prompt):
+        self.image_calls += 1
+        return b"image"
+
+    async def save_post(self, content_data, language, topic):
+        post = {"id": f"post-{len(self.saved)}", "title": content_data["title"], "status": "draft"}
+        self.saved.append(post)
+        return post
+
+    async def attach_image(self, post, image):
+        return {**post, "hero_image": "/api/media/x"}
+
+    async def publish(self, post):
+        pass
+
+    def pipeline(self, ledger):
+        return AIPostPipeline(self.generate_text, self.generate_image, self.save_post,
+                              self.attach_image, self.publish, ledger=ledger)
+
+
+class TestTopicSelection:
+    """Tests for next_topics"""
+
+    def test_least_recently_used_first(self):
+        """Test unused topics come first, then the oldest, and picks update the order"""
+        db = FakeDB([
+            topic("recent", "2026-02-01T00:00:00+00:00", 3),
+            topic("never"),
+            topic("older", "2026-01-01T00:00:00+00:00", 5),
+        ])
+        ledger = GenerationLedger(db)
+        names = ["recent", "never", "older"]
+        assert asyncio.run(ledger.next_topics(2, names)) == ["never", "older"]
+        assert asyncio.run(ledger.next_topics(1, names)) == ["recent"]
+
+    def test_only_candidates_are_picked(self):
+        """Test topics outside the candidate list are left alone"""
+        db = FakeDB([topic("never"), topic("older", "2026-01-01T00:00:00+00:00")])
+        assert asyncio.run(GenerationLedger(db).next_topics(1, ["older"])) == ["older"]
+
+
+class TestResponseCache:
+    """Tests for the prompt-hash response cache"""
+
+    def test_pending_response_reused(self):
+        """Test a stored pending response is used instead of calling the model, then retired"""
+        db = FakeDB([topic("Burnout")])
+        ledger = GenerationLedger(db)
+        digest = prompt_hash(text_prompt("Burnout", "en", []))
+        asyncio.run(ledger.store_response(digest, "Burnout", "en", POST_JSON))
+
+        models = FakeModels()
+        result = asyncio.run(models.pipeline(ledger).run("Burnout", "en"))
+        assert result["status"] == "complete"
+        assert result["cached"] is True
+        assert result["prompt_hash"] == digest
+        assert models.text_calls == 0
+
+        stored = asyncio.run(db.ai_responses.find_one({"prompt_hash": digest}))
+        assert stored["status"] == "used"
+        assert stored["post_id"] == result["post_id"]
+        assert asyncio.run(ledger.cached_response(digest)) is None
+
+    def test_new_prompt_calls_model(self):
+        """Test a prompt without a stored response is generated and stored"""
+        db = FakeDB([topic("Burnout")])
+        models = FakeModels()
+        result = asyncio.run(models.pipeline(GenerationLedger(db)).run("Burnout", "en"))
+        assert result["cached"] is False
+        assert models.text_calls == 1
+        assert len(db.ai_responses.docs) == 1
+
+
+class TestNearDuplicates:
+    """Tests for near-duplicate rejection"""
+
+    def test_duplicate_rejected_before_image(self):
+        """Test a post too similar to a published one is neither illustrated nor saved"""
+        index = PostSearchIndex()
+        index.add({"id": "existing", "title": "Burnout screening for hospital staff",
+                   "summary": "Screening hospital staff for burnout.", "content": "Body",
+                   "tags": [], "language": "en", "status": "published"})
+        db = FakeDB([topic("Burnout")])
+        ledger = GenerationLedger(db, index)
+
+        models = FakeModels()
+        result = asyncio.run(models.pipeline(ledger).run("Burnout", "en"))
+        assert result["status"] == "duplicate"
+        assert result["duplicate_of"]["id"] == "existing"
+        assert models.image_calls == 0
+        assert models.saved == []
+
+        # The rejected title is steered away from next time
+        assert asyncio.run(ledger.avoid_titles("Burnout")) == ["Burnout screening for hospital staff"]
+        stored = asyncio.run(db.ai_responses.find_one({"prompt_hash": result["prompt_hash"]}))
+        assert stored["status"] == "rejected"
+
+    def test_other_language_not_a_duplicate(self):
+        """Test posts in another language are not compared"""
+        index = PostSearchIndex()
+        index.add({"id": "existing", "title": "Burnout screening for hospital staff",
+                   "summary": "Screening hospital staff for burnout.", "content": "Body",
+                   "tags": [], "language": "nl", "status": "published"})
+        models = FakeModels()
+        result = asyncio.run(models.pipeline(GenerationLedger(FakeDB([topic("Burnout")]), index)).run("Burnout", "en"))
+        assert result["status"] == "complete"
+        assert models.image_calls == 1
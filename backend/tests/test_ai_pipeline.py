@@ -0,0 +1,65 @@
+"""
+Test suite for PsyTech AI post pipeline
+Tests: stage failures after the post is saved, with fake model calls and storage
+(no server or API keys)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ai_pipeline import AIPostPipeline  # noqa: E402
+
+POST_JSON = (
+    '{"title": "Adaptive assessments in practice", '
+    '"summary": "What adaptive testing changes for clinicians.", '
+    '"content": "## Adaptive testing\\n\\nShorter tests, same precision."}'
+)
+
+
+class FakeSteps:
+    """Injected pipeline steps that record what happened"""
+
+    def __init__(self, status="published"):
+        self.status = status
+        self.published = []
+
+    async def generate_text(self, prompt, system_message):
+        return POST_JSON
+
+    async def generate_image(self, prompt):
+        return b"image"
+
+    async def save_post(self, content_data, language, topic):
+        return {"id": "post-1", "title": content_data["title"], "status": self.status}
+
+    async def attach_image(self, post, image):
+        raise RuntimeError("media store unavailable")
+
+    async def publish(self, post):
+        self.published.append(post)
+
+    def pipeline(self):
+        return AIPostPipeline(self.generate_text, self.generate_image, self.save_post,
+                              self.attach_image, self.publish)
+
+
+class TestAttachFailure:
+    """Tests for a failing image attach"""
+
+    def test_published_post_still_announced(self):
+        """Test a live post is announced without its image when attaching fails"""
+        steps = FakeSteps()
+        result = asyncio.run(steps.pipeline().run("Adaptive assessments", "en"))
+        assert result["post_id"] == "post-1"
+        assert result["status"] == "saved"
+        assert "media store unavailable" in result["error"]
+        assert [post["id"] for post in steps.published] == ["post-1"]
+        assert "hero_image" not in steps.published[0]
+
+    def test_draft_not_announced(self):
+        """Test a draft is kept but not announced when attaching fails"""
+        steps = FakeSteps(status="draft")
+        result = asyncio.run(steps.pipeline().run("Adaptive assessments", "en"))
+        assert result["status"] == "saved"
+        assert steps.published == []
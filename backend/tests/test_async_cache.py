@@ -0,0 +1,66 @@
+"""
+Test suite for PsyTech in-process response cache
+Tests: AsyncLRUCache shared loads when the loading request is cancelled
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from cache import AsyncLRUCache  # noqa: E402
+
+
+class TestSharedLoads:
+    """Tests for concurrent misses on one key"""
+
+    def test_cancelled_leader_hands_over_load(self):
+        """Test waiters survive the loading request being cancelled and one of them loads"""
+        async def scenario():
+            cache = AsyncLRUCache()
+            calls = []
+            release = asyncio.Event()
+
+            async def loader():
+                calls.append(len(calls))
+                if len(calls) == 1:
+                    await asyncio.sleep(3600)
+                await release.wait()
+                return "value"
+
+            leader = asyncio.create_task(cache.get_or_load(("posts", 1), loader))
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(cache.get_or_load(("posts", 1), loader)) for _ in range(3)]
+            await asyncio.sleep(0)
+
+            leader.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*waiters)
+            assert leader.cancelled()
+            return results, calls, cache
+
+        results, calls, cache = asyncio.run(scenario())
+        assert results == ["value"] * 3
+        assert len(calls) == 2
+        assert cache.stats()["inflight"] == 0
+        assert asyncio.run(cache.get_or_load(("posts", 1), lambda: None)) == "value"
+
+    def test_loader_error_reaches_waiters(self):
+        """Test a failing load fails every waiter once, without retrying"""
+        async def scenario():
+            cache = AsyncLRUCache()
+            calls = []
+
+            async def loader():
+                calls.append(1)
+                await asyncio.sleep(0)
+                raise RuntimeError("database down")
+
+            results = await asyncio.gather(
+                *(cache.get_or_load(("posts", 1), loader) for _ in range(3)), return_exceptions=True
+            )
+            return results, calls
+
+        results, calls = asyncio.run(scenario())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1
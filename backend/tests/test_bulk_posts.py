@@ -0,0 +1,134 @@
+"""
+Test suite for PsyTech bulk admin operations
+Tests: POST /api/admin/posts/bulk (publish, unpublish, delete, retag, per-item results)
+"""
+import pytest
+import requests
+import base64
+import os
+from pymongo import MongoClient
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+# Queued webhook payloads are only visible in the database
+MONGO_URL = os.environ.get('MONGO_URL')
+DB_NAME = os.environ.get('DB_NAME')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def draft_posts(api_client, admin_headers):
+    """Three draft posts, deleted after the test"""
+    posts = []
+    for n in range(3):
+        post_data = {
+            "title": f"TEST_Bulk Operation Post {n}",
+            "summary": "Automated post used to verify bulk operations.",
+            "content": "This body exists only so the post passes validation in the bulk test suite.",
+            "tags": ["TEST_Bulk", "TEST_Old"],
+            "language": "en"
+        }
+        response = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers)
+        assert response.status_code == 200
+        posts.append(response.json())
+    yield posts
+    for post in posts:
+        api_client.delete(f"{BASE_URL}/api/admin/posts/{post['id']}", headers=admin_headers)
+
+
+def bulk(api_client, admin_headers, operations):
+    response = api_client.post(
+        f"{BASE_URL}/api/admin/posts/bulk",
+        json={"operations": operations},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestBulkPosts:
+    """Tests for the bulk post operations endpoint"""
+
+    def test_bulk_requires_auth(self, api_client):
+        """Test that bulk operations require authentication"""
+        response = api_client.post(f"{BASE_URL}/api/admin/posts/bulk", json={"operations": []})
+        assert response.status_code == 401
+
+    def test_mixed_operations(self, api_client, admin_headers, draft_posts):
+        """Test publish, retag and delete in one request with per-item results"""
+        first, second, third = draft_posts
+        data = bulk(api_client, admin_headers, [
+            {"op": "publish", "id": first["id"]},
+            {"op": "retag", "id": second["id"], "add_tags": ["TEST_New"], "remove_tags": ["TEST_Old"]},
+            {"op": "delete", "id": third["id"]},
+        ])
+        assert [r["status"] for r in data["results"]] == ["ok", "ok", "ok"]
+        assert data["summary"] == {"ok": 3}
+
+        published = api_client.get(f"{BASE_URL}/api/posts/{first['slug']}")
+        assert published.status_code == 200
+
+        retagged = api_client.get(f"{BASE_URL}/api/admin/posts/{second['id']}", headers=admin_headers).json()
+        assert retagged["tags"] == ["TEST_Bulk", "TEST_New"]
+
+        deleted = api_client.get(f"{BASE_URL}/api/admin/posts/{third['id']}", headers=admin_headers)
+        assert deleted.status_code == 404
+
+    def test_invalid_items_do_not_block_others(self, api_client, admin_headers, draft_posts):
+        """Test unknown ops, missing posts and duplicates are reported per item"""
+        first, second, _ = draft_posts
+        data = bulk(api_client, admin_headers, [
+            {"op": "archive", "id": first["id"]},
+            {"op": "publish", "id": "00000000-0000-0000-0000-000000000000"},
+            {"op": "publish", "id": second["id"]},
+            {"op": "unpublish", "id": second["id"]},
+        ])
+        assert [r["status"] for r in data["results"]] == ["invalid", "not_found", "invalid", "invalid"]
+
+    def test_bulk_publish_batches_webhooks(self, api_client, admin_headers, draft_posts):
+        """Test publishing several posts queues one outbox row per post"""
+        before = api_client.get(f"{BASE_URL}/api/admin/outbox/stats", headers=admin_headers).json()
+        bulk(api_client, admin_headers, [{"op": "publish", "id": post["id"]} for post in draft_posts])
+        after = api_client.get(f"{BASE_URL}/api/admin/outbox/stats", headers=admin_headers).json()
+        assert sum(after["by_status"].values()) - sum(before["by_status"].values()) in (0, len(draft_posts))
+
+    def test_bulk_publish_webhook_has_hero_image(self, api_client, admin_headers, draft_posts):
+        """Test a post with only a hero_image (no variants) is queued with that image"""
+        if not (MONGO_URL and DB_NAME):
+            pytest.skip("MONGO_URL and DB_NAME are needed to read the outbox")
+        post = draft_posts[0]
+        image = "https://example.com/TEST_bulk_hero.png"
+        updated = api_client.put(
+            f"{BASE_URL}/api/admin/posts/{post['id']}", json={"hero_image": image}, headers=admin_headers
+        ).json()
+        assert updated["hero_variants"] is None
+
+        client = MongoClient(MONGO_URL)
+        try:
+            outbox = client[DB_NAME].webhook_outbox
+            query = {"kind": "make.post_published", "payload.title": post["title"]}
+            before = outbox.count_documents(query)
+            bulk(api_client, admin_headers, [{"op": "publish", "id": post["id"]}])
+            if outbox.count_documents(query) == before:
+                pytest.skip("MAKE_WEBHOOK_URL is not configured, so nothing was queued")
+            row = outbox.find_one(query, sort=[("created_at", -1)])
+        finally:
+            client.close()
+        assert row["payload"]["image_url"] == image
@@ -0,0 +1,58 @@
+"""
+Test suite for PsyTech conditional GET support
+Tests: ETag / Last-Modified validators and 304 responses on public post routes
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+class TestConditionalGet:
+    """Tests for If-None-Match / If-Modified-Since on public routes"""
+
+    @pytest.mark.parametrize("path", ["/api/posts", "/api/posts/tags/all"])
+    def test_validators_present(self, api_client, path):
+        """Test list routes return ETag and Last-Modified"""
+        response = api_client.get(f"{BASE_URL}{path}")
+        assert response.status_code == 200
+        assert response.headers.get("ETag")
+        assert response.headers.get("Last-Modified")
+
+    @pytest.mark.parametrize("path", ["/api/posts", "/api/posts/tags/all"])
+    def test_if_none_match(self, api_client, path):
+        """Test a matching ETag returns 304 with no body"""
+        etag = api_client.get(f"{BASE_URL}{path}").headers["ETag"]
+        response = api_client.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_if_modified_since(self, api_client):
+        """Test If-Modified-Since with the returned Last-Modified returns 304"""
+        last_modified = api_client.get(f"{BASE_URL}/api/posts").headers["Last-Modified"]
+        response = api_client.get(f"{BASE_URL}/api/posts", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    def test_stale_etag_gets_full_response(self, api_client):
+        """Test a non-matching ETag returns the full body"""
+        response = api_client.get(f"{BASE_URL}/api/posts", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert "posts" in response.json()
+
+    def test_single_post_etag(self, api_client):
+        """Test single posts revalidate on their own ETag"""
+        posts = api_client.get(f"{BASE_URL}/api/posts").json()["posts"]
+        if not posts:
+            pytest.skip("No published posts available to test")
+
+        url = f"{BASE_URL}/api/posts/{posts[0]['slug']}"
+        etag = api_client.get(url).headers["ETag"]
+        assert api_client.get(url, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,101 @@
+"""
+Test suite for PsyTech admin contact inbox
+Tests: GET /api/admin/contacts (filters, cursor pagination), POST /api/admin/contacts/{id}/status
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def submission(api_client):
+    """A fresh contact submission"""
+    form = {
+        "name": "TEST_Inbox Lead",
+        "email": "test.inbox@example.com",
+        "company_type": "research",
+        "message": "Automated submission used to verify the admin inbox."
+    }
+    response = api_client.post(f"{BASE_URL}/api/contact", json=form)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestContactInbox:
+    """Tests for the admin contact inbox"""
+
+    def test_inbox_requires_auth(self, api_client):
+        """Test that listing submissions requires authentication"""
+        assert api_client.get(f"{BASE_URL}/api/admin/contacts").status_code == 401
+        assert api_client.get(f"{BASE_URL}/api/contact").status_code == 401
+
+    def test_cursor_pagination_has_no_overlap(self, api_client, admin_headers, submission):
+        """Test walking the inbox with next_cursor visits each submission once"""
+        seen = []
+        cursor = None
+        for _ in range(5):
+            params = {"per_page": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = api_client.get(f"{BASE_URL}/api/admin/contacts", params=params, headers=admin_headers).json()
+            assert len(data["submissions"]) <= 2
+            seen.extend(s["id"] for s in data["submissions"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen))
+        assert submission["id"] == seen[0]
+
+    def test_filters(self, api_client, admin_headers, submission):
+        """Test status and company_type filters"""
+        data = api_client.get(
+            f"{BASE_URL}/api/admin/contacts?status=new&company_type=research",
+            headers=admin_headers
+        ).json()
+        for item in data["submissions"]:
+            assert item["status"] == "new"
+            assert item["company_type"] == "research"
+        assert submission["id"] in [item["id"] for item in data["submissions"]]
+
+    def test_status_transitions(self, api_client, admin_headers, submission):
+        """Test new -> contacted -> closed, and that repeating a transition conflicts"""
+        url = f"{BASE_URL}/api/admin/contacts/{submission['id']}/status"
+
+        contacted = api_client.post(url, json={"status": "contacted"}, headers=admin_headers)
+        assert contacted.status_code == 200
+        assert contacted.json()["status"] == "contacted"
+        assert contacted.json()["status_updated_at"] is not None
+
+        assert api_client.post(url, json={"status": "contacted"}, headers=admin_headers).status_code == 409
+
+        closed = api_client.post(url, json={"status": "closed"}, headers=admin_headers)
+        assert closed.status_code == 200
+        assert closed.json()["status"] == "closed"
+
+    def test_invalid_status_and_missing_submission(self, api_client, admin_headers, submission):
+        """Test unknown statuses return 400 and unknown ids 404"""
+        url = f"{BASE_URL}/api/admin/contacts/{submission['id']}/status"
+        assert api_client.post(url, json={"status": "archived"}, headers=admin_headers).status_code == 400
+        missing = f"{BASE_URL}/api/admin/contacts/00000000-0000-0000-0000-000000000000/status"
+        assert api_client.post(missing, json={"status": "closed"}, headers=admin_headers).status_code == 404
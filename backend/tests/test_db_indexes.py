@@ -0,0 +1,49 @@
+"""
+Test suite for PsyTech MongoDB index migration
+Tests: index drift report - GET /api/admin/db/indexes
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+class TestIndexStatus:
+    """Tests for GET /api/admin/db/indexes"""
+
+    def test_index_status_requires_auth(self, api_client):
+        """Test that the index report requires authentication"""
+        response = api_client.get(f"{BASE_URL}/api/admin/db/indexes")
+        assert response.status_code == 401
+
+    def test_declared_indexes_exist(self, api_client, admin_headers):
+        """Test startup migration created every declared index"""
+        response = api_client.get(f"{BASE_URL}/api/admin/db/indexes", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        by_collection = {r["collection"]: r for r in data["collections"]}
+        assert "posts" in by_collection
+        assert by_collection["posts"]["missing"] == []
+        assert by_collection["posts"]["mismatched"] == []
@@ -0,0 +1,91 @@
+"""
+Test suite for PsyTech email dispatch
+Tests: contact notifications are queued, email stats - GET /api/admin/email/stats
+Delivery assertions assume the server runs with EMAIL_PROVIDER=fake.
+"""
+import pytest
+import requests
+import base64
+import os
+import time
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+def contact_form(n=0):
+    return {
+        "name": f"TEST_Email Dispatch {n}",
+        "email": "test.dispatch@example.com",
+        "company": "<b>Test Co</b>",
+        "company_type": "research",
+        "message": "Automated submission used to verify the email dispatcher."
+    }
+
+
+class TestEmailDispatch:
+    """Tests for the queued contact email dispatcher"""
+
+    def test_email_stats_requires_auth(self, api_client):
+        """Test that email stats require authentication"""
+        response = api_client.get(f"{BASE_URL}/api/admin/email/stats")
+        assert response.status_code == 401
+
+    def test_email_stats_structure(self, api_client, admin_headers):
+        """Test email stats expose queue depth and provider counters"""
+        response = api_client.get(f"{BASE_URL}/api/admin/email/stats", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "depth" in data
+        assert set(data["by_status"]) >= {"pending", "in_flight", "delivered", "dead"}
+        assert data["provider"] in ["resend", "fake"]
+        assert data["rate_per_second"] > 0
+
+    def test_contact_submission_is_queued(self, api_client, admin_headers):
+        """Test a contact submission responds immediately and queues one email"""
+        before = api_client.get(f"{BASE_URL}/api/admin/email/stats", headers=admin_headers).json()
+
+        response = api_client.post(f"{BASE_URL}/api/contact", json=contact_form())
+        assert response.status_code == 200
+
+        after = api_client.get(f"{BASE_URL}/api/admin/email/stats", headers=admin_headers).json()
+        if after["provider"] != "fake":
+            pytest.skip("Delivery checks need EMAIL_PROVIDER=fake")
+        assert sum(after["by_status"].values()) == sum(before["by_status"].values()) + 1
+
+    def test_burst_is_batched(self, api_client, admin_headers):
+        """Test a burst of submissions is delivered in fewer provider calls"""
+        before = api_client.get(f"{BASE_URL}/api/admin/email/stats", headers=admin_headers).json()
+        if before["provider"] != "fake":
+            pytest.skip("Delivery checks need EMAIL_PROVIDER=fake")
+
+        for n in range(5):
+            assert api_client.post(f"{BASE_URL}/api/contact", json=contact_form(n)).status_code == 200
+
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            after = api_client.get(f"{BASE_URL}/api/admin/email/stats", headers=admin_headers).json()
+            if after["sent_since_start"] >= before["sent_since_start"] + 5:
+                break
+            time.sleep(0.5)
+        assert after["sent_since_start"] >= before["sent_since_start"] + 5
+        assert after["provider_calls"] - before["provider_calls"] <= 5
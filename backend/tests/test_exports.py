@@ -0,0 +1,79 @@
+"""
+Test suite for PsyTech streaming exports
+Tests: GET /api/admin/export/posts, GET /api/admin/export/contacts (NDJSON and CSV)
+"""
+import pytest
+import requests
+import base64
+import csv
+import io
+import json
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+class TestExports:
+    """Tests for the streaming export endpoints"""
+
+    def test_exports_require_auth(self, api_client):
+        """Test that exports require authentication"""
+        assert api_client.get(f"{BASE_URL}/api/admin/export/posts").status_code == 401
+        assert api_client.get(f"{BASE_URL}/api/admin/export/contacts").status_code == 401
+
+    def test_posts_ndjson_matches_admin_count(self, api_client, admin_headers):
+        """Test the NDJSON export has one parseable line per post"""
+        response = api_client.get(f"{BASE_URL}/api/admin/export/posts", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["Content-Disposition"]
+
+        rows = [json.loads(line) for line in response.text.splitlines() if line]
+        admin_posts = api_client.get(f"{BASE_URL}/api/admin/posts", headers=admin_headers).json()
+        assert len(rows) >= len(admin_posts)
+        for row in rows:
+            assert "id" in row and "content" in row
+
+    def test_posts_csv_field_selection(self, api_client, admin_headers):
+        """Test CSV export only contains the requested columns"""
+        response = api_client.get(
+            f"{BASE_URL}/api/admin/export/posts?format=csv&fields=id,title,tags",
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/csv")
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["id", "title", "tags"]
+        for row in rows[1:]:
+            assert len(row) == 3
+
+    def test_unknown_field_and_format_rejected(self, api_client, admin_headers):
+        """Test invalid field names and formats return 400"""
+        assert api_client.get(f"{BASE_URL}/api/admin/export/posts?fields=password", headers=admin_headers).status_code == 400
+        assert api_client.get(f"{BASE_URL}/api/admin/export/posts?format=xml", headers=admin_headers).status_code == 400
+
+    def test_date_range_filter(self, api_client, admin_headers):
+        """Test a future since= bound exports nothing"""
+        response = api_client.get(f"{BASE_URL}/api/admin/export/contacts?since=2099-01-01", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.text == ""
@@ -0,0 +1,108 @@
+"""
+Test suite for PsyTech sitemaps and feeds
+Tests: GET /api/sitemap.xml, GET /api/sitemaps/{n}.xml, GET /api/feeds/{lang}.rss|.atom
+"""
+import pytest
+import requests
+import base64
+import os
+import xml.etree.ElementTree as ET
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def published_post(api_client, admin_headers):
+    """A published post, deleted after the test"""
+    post_data = {
+        "title": "TEST_Feed Published Post",
+        "summary": "Automated post used to verify sitemaps & feeds.",
+        "content": "This body exists only so the post passes validation in the feed test suite.",
+        "tags": ["TEST_Feed"],
+        "language": "en"
+    }
+    post = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+    published = api_client.post(f"{BASE_URL}/api/admin/posts/{post['id']}/publish", headers=admin_headers).json()
+    yield published
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{post['id']}", headers=admin_headers)
+
+
+class TestSitemaps:
+    """Tests for the sitemap index and shards"""
+
+    def test_index_lists_shards(self, api_client, published_post):
+        """Test the index points at shards that contain the published post"""
+        response = api_client.get(f"{BASE_URL}/api/sitemap.xml")
+        assert response.status_code == 200
+        assert "xml" in response.headers["Content-Type"]
+        shards = [loc.text for loc in ET.fromstring(response.content).iter(f"{SITEMAP_NS}loc")]
+        assert shards
+
+        urls = []
+        for n in range(1, len(shards) + 1):
+            shard = api_client.get(f"{BASE_URL}/api/sitemaps/{n}.xml")
+            assert shard.status_code == 200
+            urls += [loc.text for loc in ET.fromstring(shard.content).iter(f"{SITEMAP_NS}loc")]
+        assert any(url.endswith(f"/blog/{published_post['slug']}") for url in urls)
+
+    def test_missing_shard(self, api_client):
+        """Test a shard past the last one returns 404"""
+        assert api_client.get(f"{BASE_URL}/api/sitemaps/100000.xml").status_code == 404
+
+    def test_conditional_get(self, api_client):
+        """Test revalidating with the ETag returns 304"""
+        first = api_client.get(f"{BASE_URL}/api/sitemaps/1.xml")
+        again = api_client.get(f"{BASE_URL}/api/sitemaps/1.xml", headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+
+
+class TestFeeds:
+    """Tests for the RSS and Atom feeds"""
+
+    def test_rss_and_atom(self, api_client, published_post):
+        """Test both feeds parse and include the newest post"""
+        rss = api_client.get(f"{BASE_URL}/api/feeds/en.rss")
+        assert rss.status_code == 200
+        titles = [t.text for t in ET.fromstring(rss.content).iter("title")]
+        assert published_post["title"] in titles
+
+        atom = api_client.get(f"{BASE_URL}/api/feeds/all.atom")
+        assert atom.status_code == 200
+        assert ET.fromstring(atom.content).tag == "{http://www.w3.org/2005/Atom}feed"
+
+    def test_unpublish_removes_from_feed(self, api_client, admin_headers, published_post):
+        """Test the feed is regenerated when a post is unpublished"""
+        api_client.post(f"{BASE_URL}/api/admin/posts/{published_post['id']}/unpublish", headers=admin_headers)
+        rss = api_client.get(f"{BASE_URL}/api/feeds/en.rss")
+        assert published_post["title"] not in rss.text
+
+    def test_urls_do_not_follow_host_header(self, api_client, published_post):
+        """Test cached documents are the same whatever Host a request uses"""
+        normal = api_client.get(f"{BASE_URL}/api/feeds/en.atom")
+        spoofed = api_client.get(f"{BASE_URL}/api/feeds/en.atom", headers={"Host": "attacker.example"})
+        assert "attacker.example" not in spoofed.text
+        assert spoofed.content == normal.content
+
+    def test_unknown_language(self, api_client):
+        """Test feeds for unsupported languages return 404"""
+        assert api_client.get(f"{BASE_URL}/api/feeds/xx.rss").status_code == 404
@@ -0,0 +1,97 @@
+"""
+Test suite for PsyTech hero image variants
+Tests: AVIF/WebP/OG variants of stored hero images, hero_variants on posts
+"""
+import pytest
+import requests
+import base64
+import os
+import struct
+import zlib
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+WIDTH, HEIGHT = 1000, 600
+
+
+def make_png(width: int, height: int) -> bytes:
+    """A noisy RGB PNG, so it compresses about as badly as a generated image"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + os.urandom(width * 3) for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+IMAGE_BYTES = make_png(WIDTH, HEIGHT)
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def post_with_image(api_client, admin_headers):
+    """Create a draft with a real PNG hero image"""
+    post_data = {
+        "title": "TEST_Image Variants Post",
+        "summary": "Automated post used to verify hero image variants.",
+        "content": "This body exists only so the post passes validation in the image variants test.",
+        "hero_image": "data:image/png;base64," + base64.b64encode(IMAGE_BYTES).decode(),
+        "language": "en"
+    }
+    created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+    yield created
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
+
+
+class TestImageVariants:
+    """Tests for hero_variants"""
+
+    def test_variants_created(self, post_with_image):
+        """Test a stored hero image gets responsive variants that are never upscaled"""
+        variants = post_with_image["hero_variants"]
+        assert variants["source"] == post_with_image["hero_image"]
+        assert (variants["width"], variants["height"]) == (WIDTH, HEIGHT)
+        widths = sorted({v["width"] for v in variants["variants"]})
+        assert widths == [480, 960, WIDTH]
+        assert "image/webp" in {v["type"] for v in variants["variants"]}
+
+    def test_card_variant_is_small(self, api_client, post_with_image):
+        """Test the card image is WebP and much smaller than the original"""
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_variants']['card']}")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/webp"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert len(response.content) < len(IMAGE_BYTES) / 4
+
+    def test_og_variant(self, api_client, post_with_image):
+        """Test the social card image is a JPEG"""
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_variants']['og']}")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/jpeg"
+        assert response.content[:3] == b"\xff\xd8\xff"
+
+    def test_external_image_has_no_variants(self, api_client, admin_headers, post_with_image):
+        """Test replacing the hero image with an external URL clears the variants"""
+        response = api_client.put(
+            f"{BASE_URL}/api/admin/posts/{post_with_image['id']}",
+            json={"hero_image": "https://example.com/hero.png"},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["hero_variants"] is None
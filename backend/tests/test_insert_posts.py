@@ -0,0 +1,76 @@
+"""
+Test suite for PsyTech bulk post inserts
+Tests: slugs.insert_posts error reporting, against an in-memory posts collection
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from slugs import insert_posts  # noqa: E402
+
+UNIQUE_KEYS = ("slug", "id", "import_key")
+
+
+class FakePosts:
+    """Enforces the posts collection's unique indexes and reports errors like MongoDB"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def _clash(self, doc):
+        for key in UNIQUE_KEYS:
+            if doc.get(key) is not None and any(d.get(key) == doc[key] for d in self.docs):
+                return {"code": 11000, "keyPattern": {key: 1}, "keyValue": {key: doc[key]},
+                        "errmsg": f"E11000 duplicate key error index: {key}_unique"}
+        return None
+
+    async def insert_one(self, doc):
+        clash = self._clash(doc)
+        if clash:
+            # A single insert always reports index 0
+            raise DuplicateKeyError(clash["errmsg"], 11000, {"index": 0, **clash})
+        self.docs.append(dict(doc))
+
+    async def insert_many(self, docs, ordered=True):
+        errors = []
+        for index, doc in enumerate(docs):
+            clash = self._clash(doc)
+            if clash:
+                errors.append({"index": index, **clash})
+            else:
+                self.docs.append(dict(doc))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+
+
+class FakeDB:
+    def __init__(self, posts):
+        self.posts = FakePosts(posts)
+
+
+def post(n, **fields):
+    return {"id": f"post-{n}", "title": f"Post {n}", "language": "en", "slug": f"post-{n}", **fields}
+
+
+class TestInsertPosts:
+    """Tests for insert_posts"""
+
+    def test_retry_error_keeps_chunk_index(self):
+        """Test a clash found while retrying a slug conflict is reported for its own record"""
+        # post-2's slug is taken, and after a new slug its id clashes too
+        db = FakeDB([post(9, id="post-2", slug="post-2")])
+        stored, errors = asyncio.run(insert_posts(db, [post(0), post(1), post(2)]))
+        assert [doc["id"] for doc in stored] == ["post-0", "post-1"]
+        assert len(errors) == 1
+        assert errors[0]["index"] == 2
+        assert errors[0]["keyPattern"] == {"id": 1}
+
+    def test_slug_conflicts_are_retried(self):
+        """Test a taken slug gets a suffix instead of failing the record"""
+        db = FakeDB([post(9, slug="post-1")])
+        stored, errors = asyncio.run(insert_posts(db, [post(0), post(1)]))
+        assert errors == []
+        assert [doc["slug"] for doc in stored] == ["post-0", "post-1-2"]
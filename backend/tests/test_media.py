@@ -0,0 +1,88 @@
+"""
+Test suite for PsyTech media store
+Tests: data-URL images moved to the content-addressed store, GET /api/media/{hash}
+"""
+import pytest
+import requests
+import base64
+import hashlib
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+# Small fake PNG payload; the store does not inspect image contents
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + os.urandom(256)
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def post_with_image(api_client, admin_headers):
+    """Create a draft whose hero image is sent as a data URL"""
+    post_data = {
+        "title": "TEST_Media Store Post",
+        "summary": "Automated post used to verify the media store.",
+        "content": "This body exists only so the post passes validation in the media store test.",
+        "hero_image": "data:image/png;base64," + base64.b64encode(IMAGE_BYTES).decode(),
+        "language": "en"
+    }
+    created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+    yield created
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
+
+
+class TestMediaStore:
+    """Tests for GET /api/media/{hash}"""
+
+    def test_inline_image_is_stored_by_hash(self, post_with_image):
+        """Test data-URL hero images are replaced with a content-addressed URL"""
+        digest = hashlib.sha256(IMAGE_BYTES).hexdigest()
+        assert post_with_image["hero_image"] == f"/api/media/{digest}"
+
+    def test_get_media(self, api_client, post_with_image):
+        """Test the blob is served with immutable cache headers"""
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_image']}")
+        assert response.status_code == 200
+        assert response.content == IMAGE_BYTES
+        assert response.headers["Content-Type"] == "image/png"
+        assert "immutable" in response.headers["Cache-Control"]
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+    def test_range_request(self, api_client, post_with_image):
+        """Test a byte range returns 206 with the requested slice"""
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_image']}", headers={"Range": "bytes=0-7"})
+        assert response.status_code == 206
+        assert response.content == IMAGE_BYTES[:8]
+        assert response.headers["Content-Range"] == f"bytes 0-7/{len(IMAGE_BYTES)}"
+
+    def test_unsatisfiable_range(self, api_client, post_with_image):
+        """Test a range past the end returns 416"""
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_image']}", headers={"Range": "bytes=99999-"})
+        assert response.status_code == 416
+
+    def test_conditional_get(self, api_client, post_with_image):
+        """Test If-None-Match with the hash returns 304"""
+        etag = api_client.get(f"{BASE_URL}{post_with_image['hero_image']}").headers["ETag"]
+        response = api_client.get(f"{BASE_URL}{post_with_image['hero_image']}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_unknown_media(self, api_client):
+        """Test unknown or malformed hashes return 404"""
+        assert api_client.get(f"{BASE_URL}/api/media/{'0' * 64}").status_code == 404
+        assert api_client.get(f"{BASE_URL}/api/media/not-a-hash").status_code == 404
@@ -0,0 +1,131 @@
+"""
+Test suite for PsyTech streaming post import
+Tests: POST /api/admin/imports/{job_id} (NDJSON, zip, resume), GET /api/admin/imports/{job_id}
+"""
+import pytest
+import requests
+import base64
+import io
+import json
+import os
+import uuid
+import zipfile
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+BODY = "This body exists only so the post passes validation in the import test suite."
+
+@pytest.fixture
+def admin_auth():
+    """Admin authentication header (the upload sets its own content type)"""
+    return {"Authorization": f"Basic {ADMIN_AUTH}"}
+
+@pytest.fixture
+def cleanup(admin_auth):
+    """Deletes imported posts by title prefix after the test"""
+    yield
+    posts = requests.get(f"{BASE_URL}/api/admin/posts", headers=admin_auth).json()
+    for post in posts:
+        if post["title"].startswith("TEST_Import"):
+            requests.delete(f"{BASE_URL}/api/admin/posts/{post['id']}", headers=admin_auth)
+
+
+def ndjson(records):
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+class TestPostImport:
+    """Tests for the streaming import endpoint"""
+
+    def test_import_requires_auth(self):
+        """Test that imports require authentication"""
+        response = requests.post(f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}", data=b"")
+        assert response.status_code == 401
+
+    def test_ndjson_import_reports_per_record_errors(self, admin_auth, cleanup):
+        """Test valid records are inserted and invalid ones reported"""
+        run = uuid.uuid4().hex[:8]
+        records = [
+            {"title": f"TEST_Import NDJSON {run} {n}", "summary": "Imported by the test suite.",
+             "content": BODY, "external_id": f"test-{run}-{n}"}
+            for n in range(3)
+        ]
+        records.append({"title": "bad"})
+        job_id = str(uuid.uuid4())
+        response = requests.post(
+            f"{BASE_URL}/api/admin/imports/{job_id}?chunk_size=2",
+            data=ndjson(records), headers=admin_auth
+        )
+        assert response.status_code == 200
+
+        job = response.json()
+        assert job["status"] == "completed"
+        assert job["processed"] == 4
+        assert job["inserted"] == 3
+        assert job["failed"] == 1
+        assert job["errors"][0]["record"] == 4
+
+        progress = requests.get(f"{BASE_URL}/api/admin/imports/{job_id}", headers=admin_auth).json()
+        assert progress["inserted"] == 3
+
+    def test_replay_is_idempotent(self, admin_auth, cleanup):
+        """Test re-importing the same records into a new job skips them"""
+        run = uuid.uuid4().hex[:8]
+        records = [{"title": f"TEST_Import Replay {run}", "summary": "Imported by the test suite.",
+                    "content": BODY, "external_id": f"replay-{run}"}]
+        first = requests.post(f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}", data=ndjson(records), headers=admin_auth).json()
+        second = requests.post(f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}", data=ndjson(records), headers=admin_auth).json()
+        assert first["inserted"] == 1
+        assert second["inserted"] == 0
+        assert second["skipped"] == 1
+
+    def test_dates_normalised_to_utc(self, admin_auth, cleanup):
+        """Test imported dates are stored as UTC ISO strings and unparseable ones are reported"""
+        run = uuid.uuid4().hex[:8]
+        base = {"summary": "Imported by the test suite.", "content": BODY, "status": "published"}
+        records = [
+            {**base, "title": f"TEST_Import Dates {run} space", "created_at": "2023-05-01 10:00"},
+            {**base, "title": f"TEST_Import Dates {run} offset", "created_at": "2023-05-01T12:00:00+02:00",
+             "published_at": "2023-05-02T08:30:00Z"},
+            {**base, "title": f"TEST_Import Dates {run} rfc822", "created_at": "Mon, 01 May 2023 10:00:00 GMT"},
+        ]
+        job = requests.post(f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}", data=ndjson(records), headers=admin_auth).json()
+        assert job["inserted"] == 2
+        assert job["failed"] == 1
+        assert job["errors"][0]["record"] == 3
+        assert "created_at" in job["errors"][0]["error"]
+
+        posts = requests.get(f"{BASE_URL}/api/admin/posts", headers=admin_auth).json()
+        by_title = {p["title"]: p for p in posts if p["title"].startswith(f"TEST_Import Dates {run}")}
+        space = by_title[f"TEST_Import Dates {run} space"]
+        assert space["created_at"] == "2023-05-01T10:00:00+00:00"
+        assert space["published_at"] == space["created_at"]
+        offset = by_title[f"TEST_Import Dates {run} offset"]
+        assert offset["created_at"] == "2023-05-01T10:00:00+00:00"
+        assert offset["published_at"] == "2023-05-02T08:30:00+00:00"
+
+    def test_zip_of_markdown(self, admin_auth, cleanup):
+        """Test markdown files with front matter are imported from a zip"""
+        run = uuid.uuid4().hex[:8]
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr(f"{run}/one.md", f"---\ntitle: TEST_Import Zip {run}\ntags: [TEST_Zip]\n---\n\nFirst paragraph.\n\n{BODY}")
+            z.writestr(f"{run}/readme.txt", "not a post")
+        response = requests.post(
+            f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}?format=zip",
+            data=archive.getvalue(), headers=admin_auth
+        )
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 1
+
+    def test_invalid_zip_rejected(self, admin_auth):
+        """Test a body that is not a zip returns 400"""
+        response = requests.post(
+            f"{BASE_URL}/api/admin/imports/{uuid.uuid4()}?format=zip",
+            data=b"not a zip", headers=admin_auth
+        )
+        assert response.status_code == 400
@@ -0,0 +1,120 @@
+"""
+Test suite for PsyTech write-time markdown rendering
+Tests: rendered HTML/TOC/excerpt/reading time on create, update and publish,
+GET /api/posts/{slug}?rendered=true, HTML sanitisation, pathological input
+"""
+import pytest
+import requests
+import base64
+import os
+import time
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+CONTENT = """## Why screening matters
+
+Early screening helps **teams** act before problems grow. <script>alert(1)</script>
+
+### What to measure
+
+- Stress
+- Sleep
+
+Read [the guide](javascript:alert(1)) or [our site](https://example.com).
+"""
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def post(api_client, admin_headers):
+    """A draft post with headings, deleted after the test"""
+    post_data = {
+        "title": "TEST_Render Markdown Post",
+        "summary": "Automated post used to verify write-time rendering.",
+        "content": CONTENT,
+        "tags": ["TEST_Render"],
+        "language": "en"
+    }
+    response = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers)
+    assert response.status_code == 200
+    created = response.json()
+    yield created
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
+
+
+class TestPostRender:
+    """Tests for the render stage on the admin write path"""
+
+    def test_create_stores_rendering(self, post):
+        """Test create returns HTML, table of contents, excerpt and reading time"""
+        rendered = post["rendered"]
+        assert '<h2 id="why-screening-matters">' in rendered["html"]
+        assert [entry["anchor"] for entry in rendered["toc"]] == ["why-screening-matters", "what-to-measure"]
+        assert rendered["excerpt"].startswith("Early screening helps teams")
+        assert rendered["reading_minutes"] >= 1
+        assert rendered["word_count"] > 0
+
+    def test_html_is_sanitised(self, post):
+        """Test raw HTML is escaped and unsafe links are dropped"""
+        html = post["rendered"]["html"]
+        assert "<script>" not in html
+        assert "javascript:" not in html
+        assert 'href="https://example.com"' in html
+
+    def test_update_rerenders(self, api_client, admin_headers, post):
+        """Test changing the content produces a new rendering hash"""
+        response = api_client.put(
+            f"{BASE_URL}/api/admin/posts/{post['id']}",
+            json={"content": "## A new heading\n\n" + "Fresh body text for the render test. " * 5},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        rendered = response.json()["rendered"]
+        assert rendered["hash"] != post["rendered"]["hash"]
+        assert rendered["toc"][0]["anchor"] == "a-new-heading"
+
+    def test_public_rendered_option(self, api_client, admin_headers, post):
+        """Test the rendered form is only returned when asked for"""
+        api_client.post(f"{BASE_URL}/api/admin/posts/{post['id']}/publish", headers=admin_headers)
+
+        plain = api_client.get(f"{BASE_URL}/api/posts/{post['slug']}")
+        assert plain.status_code == 200
+        assert plain.json()["rendered"] is None
+
+        rendered = api_client.get(f"{BASE_URL}/api/posts/{post['slug']}?rendered=true")
+        assert rendered.status_code == 200
+        assert rendered.json()["rendered"]["html"].startswith("<h2")
+        assert rendered.headers["ETag"] != plain.headers["ETag"]
+
+    def test_pathological_markdown_renders_quickly(self, api_client, admin_headers):
+        """Test unclosed emphasis and bracket runs render in linear time"""
+        content = "*a " * 20000 + "**b " * 5000 + "_c " * 5000 + "[" * 5000
+        start = time.monotonic()
+        response = api_client.post(f"{BASE_URL}/api/admin/posts", json={
+            "title": "TEST_Render Pathological Post",
+            "summary": "Automated post used to verify rendering time.",
+            "content": content,
+            "language": "en"
+        }, headers=admin_headers, timeout=30)
+        elapsed = time.monotonic() - start
+        assert response.status_code == 200
+        api_client.delete(f"{BASE_URL}/api/admin/posts/{response.json()['id']}", headers=admin_headers)
+        assert elapsed < 5
+        assert response.json()["rendered"]["word_count"] == len(content.split())
@@ -0,0 +1,118 @@
+"""
+Test suite for PsyTech slug allocation
+Tests: unique slugs for duplicate titles, renames keep the old slug as a redirect
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def created_posts(api_client, admin_headers):
+    """Collects post ids and deletes them after the test"""
+    ids = []
+    yield ids
+    for post_id in ids:
+        api_client.delete(f"{BASE_URL}/api/admin/posts/{post_id}", headers=admin_headers)
+
+
+def create_post(api_client, admin_headers, title):
+    post_data = {
+        "title": title,
+        "summary": "Automated post used to verify slug allocation.",
+        "content": "This body exists only so the post passes validation in the slug test suite.",
+        "language": "en"
+    }
+    response = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestSlugAllocation:
+    """Tests for index-backed slug allocation"""
+
+    def test_duplicate_titles_get_distinct_slugs(self, api_client, admin_headers, created_posts):
+        """Test two posts with the same title get different slugs"""
+        first = create_post(api_client, admin_headers, "TEST_Slug Collision Title")
+        second = create_post(api_client, admin_headers, "TEST_Slug Collision Title")
+        created_posts.extend([first["id"], second["id"]])
+
+        assert first["slug"] != second["slug"]
+        assert second["slug"].startswith("test-slug-collision-title-en")
+
+    def test_rename_onto_taken_slug_is_suffixed(self, api_client, admin_headers, created_posts):
+        """Test renaming a post to another post's title does not steal its slug"""
+        first = create_post(api_client, admin_headers, "TEST_Slug Rename Target")
+        second = create_post(api_client, admin_headers, "TEST_Slug Rename Source")
+        created_posts.extend([first["id"], second["id"]])
+
+        response = api_client.put(
+            f"{BASE_URL}/api/admin/posts/{second['id']}",
+            json={"title": "TEST_Slug Rename Target"},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["slug"] != first["slug"]
+
+    def test_old_slug_redirects_after_rename(self, api_client, admin_headers, created_posts):
+        """Test a published post's old slug redirects to the new one"""
+        post = create_post(api_client, admin_headers, "TEST_Slug Before Rename")
+        created_posts.append(post["id"])
+        api_client.post(f"{BASE_URL}/api/admin/posts/{post['id']}/publish", headers=admin_headers)
+
+        renamed = api_client.put(
+            f"{BASE_URL}/api/admin/posts/{post['id']}",
+            json={"title": "TEST_Slug After Rename"},
+            headers=admin_headers
+        ).json()
+        assert renamed["slug"] != post["slug"]
+
+        response = api_client.get(f"{BASE_URL}/api/posts/{post['slug']}", allow_redirects=False)
+        assert response.status_code == 301
+        assert response.headers["Location"].endswith(f"/api/posts/{renamed['slug']}")
+
+        followed = api_client.get(f"{BASE_URL}/api/posts/{post['slug']}")
+        assert followed.status_code == 200
+        assert followed.json()["id"] == post["id"]
+
+    def test_rename_to_dollar_title(self, api_client, admin_headers, created_posts):
+        """Test titles starting with $ or $$ are compared as text, not as field paths or variables"""
+        post = create_post(api_client, admin_headers, "TEST_Slug Before Dollar Rename")
+        created_posts.append(post["id"])
+        api_client.post(f"{BASE_URL}/api/admin/posts/{post['id']}/publish", headers=admin_headers)
+
+        for title in ("$TEST_Slug Dollar Title", "$$TEST_Slug Double Dollar Title"):
+            response = api_client.put(
+                f"{BASE_URL}/api/admin/posts/{post['id']}",
+                json={"title": title},
+                headers=admin_headers
+            )
+            assert response.status_code == 200
+            renamed = response.json()
+            assert renamed["title"] == title
+            assert renamed["slug"] != post["slug"]
+
+            stored = api_client.get(f"{BASE_URL}/api/admin/posts/{post['id']}", headers=admin_headers).json()
+            assert stored["slug"] == renamed["slug"]
+            assert api_client.get(f"{BASE_URL}/api/posts/{renamed['slug']}").status_code == 200
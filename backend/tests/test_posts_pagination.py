@@ -0,0 +1,61 @@
+"""
+Test suite for PsyTech blog list pagination
+Tests: page mode and keyset cursor mode on GET /api/posts
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+class TestCursorPagination:
+    """Tests for cursor pagination - GET /api/posts?cursor="""
+
+    def test_page_mode_still_counts(self, api_client):
+        """Test page mode keeps returning exact totals"""
+        response = api_client.get(f"{BASE_URL}/api/posts?page=1&per_page=2")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["page"] == 1
+        assert isinstance(data["total"], int)
+        assert isinstance(data["total_pages"], int)
+        assert "next_cursor" in data
+
+    def test_cursor_walk_matches_page_mode(self, api_client):
+        """Test following next_cursor visits the same posts as page numbers"""
+        first = api_client.get(f"{BASE_URL}/api/posts?per_page=2").json()
+        if not first["next_cursor"]:
+            pytest.skip("Not enough published posts to paginate")
+
+        by_cursor = api_client.get(f"{BASE_URL}/api/posts?per_page=2&cursor={first['next_cursor']}")
+        assert by_cursor.status_code == 200
+        by_page = api_client.get(f"{BASE_URL}/api/posts?per_page=2&page=2")
+
+        cursor_data = by_cursor.json()
+        assert cursor_data["page"] is None
+        assert cursor_data["total"] is None
+        assert [p["id"] for p in cursor_data["posts"]] == [p["id"] for p in by_page.json()["posts"]]
+
+    def test_cursor_mode_total_is_optional(self, api_client):
+        """Test include_total returns a count in cursor mode"""
+        first = api_client.get(f"{BASE_URL}/api/posts?per_page=1").json()
+        if not first["next_cursor"]:
+            pytest.skip("Not enough published posts to paginate")
+
+        response = api_client.get(f"{BASE_URL}/api/posts?per_page=1&include_total=true&cursor={first['next_cursor']}")
+        assert response.status_code == 200
+        assert response.json()["total"] == first["total"]
+
+    def test_invalid_cursor(self, api_client):
+        """Test a malformed cursor returns 400"""
+        response = api_client.get(f"{BASE_URL}/api/posts?cursor=not-a-cursor")
+        assert response.status_code == 400
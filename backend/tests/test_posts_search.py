@@ -0,0 +1,91 @@
+"""
+Test suite for PsyTech blog full-text search
+Tests: BM25 search via GET /api/posts?q=, snippets, index updates on publish/unpublish/delete
+"""
+import pytest
+import requests
+import base64
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def published_post(api_client, admin_headers):
+    """Create and publish a post containing a unique search term, delete it afterwards"""
+    marker = f"zorbulator{uuid.uuid4().hex[:8]}"
+    post_data = {
+        "title": f"TEST_Search {marker} assessments",
+        "summary": "Automated post used to verify the search index.",
+        "content": f"## Search\n\nThis body mentions {marker} so the search test can find it reliably.",
+        "tags": ["Testing"],
+        "language": "en"
+    }
+    created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+    api_client.post(f"{BASE_URL}/api/admin/posts/{created['id']}/publish", headers=admin_headers)
+    yield {"id": created["id"], "marker": marker}
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
+
+
+class TestPostSearch:
+    """Tests for GET /api/posts?q="""
+
+    def test_search_finds_published_post(self, api_client, published_post):
+        """Test a published post is found by a term in its body"""
+        response = api_client.get(f"{BASE_URL}/api/posts?q={published_post['marker']}")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] >= 1
+        assert data["posts"][0]["id"] == published_post["id"]
+        assert "<mark>" in data["posts"][0]["snippet"]
+
+    def test_search_matches_inflected_forms(self, api_client, published_post):
+        """Test stemming matches 'assessment' against 'assessments'"""
+        response = api_client.get(f"{BASE_URL}/api/posts?q={published_post['marker']}+assessment&lang=en")
+        assert response.status_code == 200
+        assert published_post["id"] in [p["id"] for p in response.json()["posts"]]
+
+    def test_unpublished_post_leaves_index(self, api_client, admin_headers, published_post):
+        """Test unpublishing removes the post from search results"""
+        api_client.post(f"{BASE_URL}/api/admin/posts/{published_post['id']}/unpublish", headers=admin_headers)
+
+        response = api_client.get(f"{BASE_URL}/api/posts?q={published_post['marker']}")
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+
+    def test_search_query_is_not_a_regex(self, api_client):
+        """Test regex metacharacters in the query do not cause errors"""
+        response = api_client.get(f"{BASE_URL}/api/posts", params={"q": "(.*[unbalanced"})
+        assert response.status_code == 200
+        assert isinstance(response.json()["posts"], list)
+
+    def test_reindex_requires_auth(self, api_client):
+        """Test rebuilding the search index requires authentication"""
+        response = api_client.post(f"{BASE_URL}/api/admin/search/reindex")
+        assert response.status_code == 401
+
+    def test_reindex(self, api_client, admin_headers):
+        """Test rebuilding the search index reports the indexed post count"""
+        response = api_client.post(f"{BASE_URL}/api/admin/search/reindex", headers=admin_headers)
+        assert response.status_code == 200
+        assert "indexed_posts" in response.json()
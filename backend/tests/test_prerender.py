@@ -0,0 +1,41 @@
+"""
+Test suite for PsyTech static prerender
+Tests: POST /api/admin/prerender/rebuild
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+class TestPrerender:
+    """Tests for the prerender rebuild endpoint"""
+
+    def test_rebuild_requires_auth(self):
+        """Test that rebuilding requires authentication"""
+        assert requests.post(f"{BASE_URL}/api/admin/prerender/rebuild").status_code == 401
+
+    def test_rebuild_is_idempotent(self, admin_headers):
+        """Test a second rebuild rewrites nothing (400 when prerender is not configured)"""
+        first = requests.post(f"{BASE_URL}/api/admin/prerender/rebuild", headers=admin_headers)
+        if first.status_code == 400:
+            pytest.skip("PRERENDER_DIR is not configured on this server")
+        assert first.status_code == 200
+
+        second = requests.post(f"{BASE_URL}/api/admin/prerender/rebuild", headers=admin_headers).json()
+        assert second["written"] == 0
+        assert second["removed"] == 0
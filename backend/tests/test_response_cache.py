@@ -0,0 +1,78 @@
+"""
+Test suite for PsyTech public response cache
+Tests: cache stats endpoint, write-path invalidation of cached post routes
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+@pytest.fixture
+def draft_post(api_client, admin_headers):
+    """Create a draft post and delete it afterwards"""
+    post_data = {
+        "title": "TEST_Cache Invalidation Post",
+        "summary": "Automated post used to verify cache invalidation.",
+        "content": "This body exists only so the post passes validation in the cache test suite.",
+        "tags": ["TEST_CacheTag"],
+        "language": "en"
+    }
+    created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+    yield created
+    api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
+
+
+class TestResponseCache:
+    """Tests for the read-through cache on public post routes"""
+
+    def test_cache_stats_requires_auth(self, api_client):
+        """Test that cache stats require authentication"""
+        response = api_client.get(f"{BASE_URL}/api/admin/cache/stats")
+        assert response.status_code == 401
+
+    def test_cache_stats_count_hits(self, api_client, admin_headers):
+        """Test repeated reads are counted as cache hits"""
+        before = api_client.get(f"{BASE_URL}/api/admin/cache/stats", headers=admin_headers).json()
+        api_client.get(f"{BASE_URL}/api/posts/tags/all")
+        api_client.get(f"{BASE_URL}/api/posts/tags/all")
+        after = api_client.get(f"{BASE_URL}/api/admin/cache/stats", headers=admin_headers).json()
+        assert after["hits"] > before["hits"]
+
+    def test_publish_and_unpublish_invalidate(self, api_client, admin_headers, draft_post):
+        """Test cached 404s, lists and tags are refreshed by publish/unpublish"""
+        slug = draft_post["slug"]
+        assert api_client.get(f"{BASE_URL}/api/posts/{slug}").status_code == 404
+        api_client.get(f"{BASE_URL}/api/posts/tags/all")
+
+        api_client.post(f"{BASE_URL}/api/admin/posts/{draft_post['id']}/publish", headers=admin_headers)
+        assert api_client.get(f"{BASE_URL}/api/posts/{slug}").status_code == 200
+        tags = [t["tag"] for t in api_client.get(f"{BASE_URL}/api/posts/tags/all").json()]
+        assert "TEST_CacheTag" in tags
+        ids = [p["id"] for p in api_client.get(f"{BASE_URL}/api/posts?tag=TEST_CacheTag").json()["posts"]]
+        assert draft_post["id"] in ids
+
+        api_client.post(f"{BASE_URL}/api/admin/posts/{draft_post['id']}/unpublish", headers=admin_headers)
+        assert api_client.get(f"{BASE_URL}/api/posts/{slug}").status_code == 404
+        tags = [t["tag"] for t in api_client.get(f"{BASE_URL}/api/posts/tags/all").json()]
+        assert "TEST_CacheTag" not in tags
@@ -181,10 +181,13 @@ class TestPublishedPosts:
             assert "slug" in post
             assert "title" in post
             assert "summary" in post
-            assert "content" in post
+            assert "word_count" in post
             assert "status" in post
             assert "ai_generated" in post
             assert post["status"] == "published"
+            # List items are cards: no body and no inline image data
+            assert "content" not in post
+            assert not (post.get("hero_image") or "").startswith("data:")
 
 
 class TestSinglePost:
@@ -242,6 +245,17 @@ class TestAdminPosts:
             assert "title" in post
             assert "status" in post
             assert "ai_generated" in post
+            assert "content" not in post
+
+    def test_admin_get_single_post_has_content(self, api_client, admin_headers):
+        """Test admin single-post endpoint returns the full post for editing"""
+        posts = api_client.get(f"{BASE_URL}/api/admin/posts", headers=admin_headers).json()
+        if not posts:
+            pytest.skip("No posts available to test")
+
+        response = api_client.get(f"{BASE_URL}/api/admin/posts/{posts[0]['id']}", headers=admin_headers)
+        assert response.status_code == 200
+        assert "content" in response.json()
 
 
 class TestAllTags:
@@ -261,6 +275,14 @@ class TestAllTags:
             assert "tag" in tag
             assert "count" in tag
 
+    def test_get_tags_for_language(self, api_client):
+        """Test per-language tag counts never exceed the site-wide counts"""
+        all_tags = {t["tag"]: t["count"] for t in api_client.get(f"{BASE_URL}/api/posts/tags/all").json()}
+        response = api_client.get(f"{BASE_URL}/api/posts/tags/all?lang=en")
+        assert response.status_code == 200
+        for tag in response.json():
+            assert tag["count"] <= all_tags.get(tag["tag"], 0)
+
 
 class TestAdminPostCRUD:
     """Tests for admin post CRUD operations"""
@@ -325,6 +347,51 @@ class TestAdminPostCRUD:
         post_ids = [p["id"] for p in posts]
         assert post_id not in post_ids
 
+    def test_stale_update_conflicts(self, api_client, admin_headers):
+        """Test an update against an outdated updated_at returns 409"""
+        post_data = {
+            "title": "TEST_Concurrent Edit Post",
+            "summary": "This is an automated test post for concurrent edits.",
+            "content": "This is test content for the concurrent edit test. It needs to be at least 50 characters long.",
+            "language": "en"
+        }
+        created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+        post_id = created["id"]
+        try:
+            first = api_client.put(
+                f"{BASE_URL}/api/admin/posts/{post_id}",
+                json={"summary": "First editor saved this summary.", "updated_at": created["updated_at"]},
+                headers=admin_headers
+            )
+            assert first.status_code == 200
+            assert first.json()["updated_at"] != created["updated_at"]
+
+            second = api_client.put(
+                f"{BASE_URL}/api/admin/posts/{post_id}",
+                json={"summary": "Second editor saved over it.", "updated_at": created["updated_at"]},
+                headers=admin_headers
+            )
+            assert second.status_code == 409
+
+            current = api_client.get(f"{BASE_URL}/api/admin/posts/{post_id}", headers=admin_headers).json()
+            assert current["summary"] == "First editor saved this summary."
+
+            stale_publish = api_client.post(
+                f"{BASE_URL}/api/admin/posts/{post_id}/publish",
+                params={"updated_at": created["updated_at"]},
+                headers=admin_headers
+            )
+            assert stale_publish.status_code == 409
+        finally:
+            api_client.delete(f"{BASE_URL}/api/admin/posts/{post_id}", headers=admin_headers)
+
+    def test_mutations_on_missing_post(self, api_client, admin_headers):
+        """Test update/publish/unpublish of an unknown post return 404"""
+        missing = "00000000-0000-0000-0000-000000000000"
+        assert api_client.put(f"{BASE_URL}/api/admin/posts/{missing}", json={"summary": "Nothing to update here."}, headers=admin_headers).status_code == 404
+        assert api_client.post(f"{BASE_URL}/api/admin/posts/{missing}/publish", headers=admin_headers).status_code == 404
+        assert api_client.post(f"{BASE_URL}/api/admin/posts/{missing}/unpublish", headers=admin_headers).status_code == 404
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,74 @@
+"""
+Test suite for PsyTech status check history
+Tests: POST /api/status, GET /api/status (latest, client filter), GET /api/status/rollup,
+GET /api/admin/status/buffer
+"""
+import pytest
+import requests
+import base64
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def client_name(api_client):
+    """A fresh client with three recorded checks"""
+    name = f"TEST_Status {uuid.uuid4().hex[:8]}"
+    for _ in range(3):
+        response = api_client.post(f"{BASE_URL}/api/status", json={"client_name": name})
+        assert response.status_code == 200
+    return name
+
+
+class TestStatusChecks:
+    """Tests for status check storage and rollups"""
+
+    def test_latest_checks_for_client(self, api_client, client_name):
+        """Test checks come back newest first with native timestamps"""
+        response = api_client.get(f"{BASE_URL}/api/status", params={"client_name": client_name, "limit": 2})
+        assert response.status_code == 200
+        checks = response.json()
+        assert len(checks) == 2
+        assert all(check["client_name"] == client_name for check in checks)
+        assert checks[0]["timestamp"] >= checks[1]["timestamp"]
+
+    def test_rollup_counts_checks(self, api_client, client_name):
+        """Test the daily rollup counts every check for the client"""
+        response = api_client.get(
+            f"{BASE_URL}/api/status/rollup",
+            params={"client_name": client_name, "interval": "1d"}
+        )
+        assert response.status_code == 200
+        buckets = response.json()
+        assert sum(bucket["count"] for bucket in buckets) == 3
+        for bucket in buckets:
+            assert bucket["client_name"] == client_name
+            assert bucket["first_seen"] <= bucket["last_seen"]
+
+    def test_rollup_validation(self, api_client):
+        """Test unknown intervals, inverted ranges and oversized ranges return 400"""
+        url = f"{BASE_URL}/api/status/rollup"
+        assert api_client.get(url, params={"interval": "2m"}).status_code == 400
+        assert api_client.get(url, params={"since": "2030-01-02T00:00:00Z", "until": "2030-01-01T00:00:00Z"}).status_code == 400
+        assert api_client.get(url, params={"interval": "1m", "since": "2000-01-01T00:00:00Z"}).status_code == 400
+
+    def test_buffer_stats(self, api_client):
+        """Test buffer stats require auth and report whether buffering is on"""
+        assert api_client.get(f"{BASE_URL}/api/admin/status/buffer").status_code == 401
+        response = api_client.get(f"{BASE_URL}/api/admin/status/buffer", headers={"Authorization": f"Basic {ADMIN_AUTH}"})
+        assert response.status_code == 200
+        stats = response.json()
+        if stats["enabled"]:
+            assert stats["pending"] <= stats["capacity"]
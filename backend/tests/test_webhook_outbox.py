@@ -0,0 +1,73 @@
+"""
+Test suite for PsyTech webhook outbox
+Tests: publish records a delivery row, outbox stats - GET /api/admin/outbox/stats
+"""
+import pytest
+import requests
+import base64
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+# Admin credentials
+ADMIN_PASSWORD = "psytech2026"
+ADMIN_AUTH = base64.b64encode(f"admin:{ADMIN_PASSWORD}".encode()).decode('utf-8')
+
+@pytest.fixture
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture
+def admin_headers():
+    """Admin authentication headers"""
+    return {
+        "Authorization": f"Basic {ADMIN_AUTH}",
+        "Content-Type": "application/json"
+    }
+
+
+def total_rows(stats):
+    return sum(stats["by_status"].values())
+
+
+class TestWebhookOutbox:
+    """Tests for the Make.com webhook outbox"""
+
+    def test_outbox_stats_requires_auth(self, api_client):
+        """Test that outbox stats require authentication"""
+        response = api_client.get(f"{BASE_URL}/api/admin/outbox/stats")
+        assert response.status_code == 401
+
+    def test_outbox_stats_structure(self, api_client, admin_headers):
+        """Test outbox stats expose queue depth and latency"""
+        response = api_client.get(f"{BASE_URL}/api/admin/outbox/stats", headers=admin_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "depth" in data
+        assert set(data["by_status"]) >= {"pending", "in_flight", "delivered", "dead"}
+        assert "delivery_latency" in data
+        assert data["workers"] > 0
+
+    def test_publish_records_delivery(self, api_client, admin_headers):
+        """Test publishing a post adds an outbox row in the same request"""
+        before = api_client.get(f"{BASE_URL}/api/admin/outbox/stats", headers=admin_headers).json()
+
+        post_data = {
+            "title": "TEST_Outbox Delivery Post",
+            "summary": "Automated post used to verify the webhook outbox.",
+            "content": "This body exists only so the post passes validation in the outbox test suite.",
+            "language": "en"
+        }
+        created = api_client.post(f"{BASE_URL}/api/admin/posts", json=post_data, headers=admin_headers).json()
+        try:
+            publish = api_client.post(f"{BASE_URL}/api/admin/posts/{created['id']}/publish", headers=admin_headers)
+            assert publish.status_code == 200
+
+            after = api_client.get(f"{BASE_URL}/api/admin/outbox/stats", headers=admin_headers).json()
+            assert total_rows(after) == total_rows(before) + 1
+        finally:
+            api_client.delete(f"{BASE_URL}/api/admin/posts/{created['id']}", headers=admin_headers)
@@ -0,0 +1,36 @@
+import React from "react";
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+
+const resolve = (src) => (src?.startsWith("/api/") ? `${BACKEND_URL}${src}` : src);
+
+// Hero image with the AVIF/WebP variants the backend stores as hero_variants;
+// falls back to the original image for posts without them
+export default function ResponsiveImage({ src, variants, sizes, fallback = "card", ...props }) {
+  if (!variants?.variants?.length) {
+    return <img src={resolve(src)} {...props} />;
+  }
+
+  const types = [...new Set(variants.variants.map((v) => v.type))];
+  return (
+    <picture>
+      {types.map((type) => (
+        <source
+          key={type}
+          type={type}
+          sizes={sizes}
+          srcSet={variants.variants
+            .filter((v) => v.type === type)
+            .map((v) => `${resolve(v.url)} ${v.width}w`)
+            .join(", ")}
+        />
+      ))}
+      <img
+        src={resolve(variants[fallback] || src)}
+        width={variants.width}
+        height={variants.height}
+        {...props}
+      />
+    </picture>
+  );
+}
@@ -108,7 +108,8 @@ export default function AdminPage() {
 
     try {
       if (editingPost) {
-        await axios.put(`${API}/admin/posts/${editingPost.id}`, postData, {
+        // Send the version we loaded so a concurrent edit is rejected, not overwritten
+        await axios.put(`${API}/admin/posts/${editingPost.id}`, { ...postData, updated_at: editingPost.updated_at }, {
           headers: { Authorization: authHeader }
         });
         toast.success("Post updated successfully!");
@@ -123,7 +124,11 @@ export default function AdminPage() {
       fetchPosts();
     } catch (error) {
       console.error("Error saving post:", error);
-      toast.error("Failed to save post");
+      if (error.response?.status === 409) {
+        toast.error("This post was changed elsewhere. Reopen it to get the latest version.");
+      } else {
+        toast.error("Failed to save post");
+      }
     }
     setLoading(false);
   };
@@ -184,7 +189,19 @@ export default function AdminPage() {
     setGeneratingAI(false);
   };
 
-  const editPost = (post) => {
+  const editPost = async (card) => {
+    // The admin list only carries card fields; load the full post for editing
+    let post;
+    try {
+      const response = await axios.get(`${API}/admin/posts/${card.id}`, {
+        headers: { Authorization: authHeader }
+      });
+      post = response.data;
+    } catch (error) {
+      console.error("Error loading post:", error);
+      toast.error("Failed to load post");
+      return;
+    }
     setEditingPost(post);
     setFormData({
       title: post.title,
@@ -8,6 +8,7 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Search, Calendar, Clock, ArrowRight, Tag } from "lucide-react";
 import Navbar from "@/components/Navbar";
+import ResponsiveImage from "@/components/ResponsiveImage";
 import Footer from "@/components/sections/Footer";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -63,7 +64,9 @@ export default function BlogPage() {
 
   const fetchTags = async () => {
     try {
-      const response = await axios.get(`${API}/posts/tags/all`);
+      const params = new URLSearchParams();
+      if (i18n.language !== 'en') params.append('lang', i18n.language);
+      const response = await axios.get(`${API}/posts/tags/all?${params.toString()}`);
       setTags(response.data);
     } catch (error) {
       console.error("Error fetching tags:", error);
@@ -79,10 +82,9 @@ export default function BlogPage() {
     });
   };
 
-  const estimateReadTime = (content) => {
+  const estimateReadTime = (wordCount) => {
     const wordsPerMinute = 200;
-    const words = content?.split(/\s+/).length || 0;
-    return Math.ceil(words / wordsPerMinute);
+    return Math.max(1, Math.ceil((wordCount || 0) / wordsPerMinute));
   };
 
   return (
@@ -178,8 +180,11 @@ export default function BlogPage() {
                       {/* Hero Image */}
                       <div className="aspect-video bg-gradient-to-br from-cyan-100 to-slate-100 overflow-hidden">
                         {post.hero_image ? (
-                          <img
+                          <ResponsiveImage
                             src={post.hero_image}
+                            variants={post.hero_variants}
+                            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+                            loading="lazy"
                             alt={post.title}
                             className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                           />
@@ -206,9 +211,16 @@ export default function BlogPage() {
                         </h2>
 
                         {/* Summary */}
-                        <p className="text-slate-600 text-sm mb-4 line-clamp-2">
-                          {post.summary}
-                        </p>
+                        {post.snippet ? (
+                          <p
+                            className="text-slate-600 text-sm mb-4 line-clamp-3 [&_mark]:bg-cyan-100 [&_mark]:text-slate-900"
+                            dangerouslySetInnerHTML={{ __html: post.snippet }}
+                          />
+                        ) : (
+                          <p className="text-slate-600 text-sm mb-4 line-clamp-2">
+                            {post.summary}
+                          </p>
+                        )}
 
                         {/* Meta */}
                         <div className="flex items-center justify-between text-xs text-slate-500">
@@ -219,7 +231,7 @@ export default function BlogPage() {
                             </span>
                             <span className="flex items-center gap-1">
                               <Clock className="w-3.5 h-3.5" />
-                              {estimateReadTime(post.content)} {t('insights.readTime')}
+                              {estimateReadTime(post.word_count)} {t('insights.readTime')}
                             </span>
                           </div>
                         </div>
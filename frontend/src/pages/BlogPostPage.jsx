@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from "react";
-import { useParams, Link } from "react-router-dom";
+import { useParams, Link, useNavigate } from "react-router-dom";
 import { useTranslation } from "react-i18next";
 import axios from "axios";
 import ReactMarkdown from "react-markdown";
@@ -18,6 +18,7 @@ import {
   AlertCircle
 } from "lucide-react";
 import Navbar from "@/components/Navbar";
+import ResponsiveImage from "@/components/ResponsiveImage";
 import Footer from "@/components/sections/Footer";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -25,6 +26,7 @@ const API = `${BACKEND_URL}/api`;
 
 export default function BlogPostPage() {
   const { slug } = useParams();
+  const navigate = useNavigate();
   const { t, i18n } = useTranslation();
   const [post, setPost] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -42,7 +44,11 @@ export default function BlogPostPage() {
     setShowFallback(false);
     
     try {
-      const response = await axios.get(`${API}/posts/${slug}`);
+      const response = await axios.get(`${API}/posts/${slug}`, { params: { rendered: true } });
+      // Renamed posts answer old slugs with a redirect; show the canonical URL
+      if (response.data.slug !== slug) {
+        navigate(`/blog/${response.data.slug}`, { replace: true });
+      }
       setPost(response.data);
       
       // Check if post language matches user language
@@ -167,7 +173,7 @@ export default function BlogPostPage() {
             </span>
             <span className="flex items-center gap-2">
               <Clock className="w-4 h-4" />
-              {estimateReadTime(post?.content)} {t('insights.readTime')}
+              {post?.rendered?.reading_minutes ?? estimateReadTime(post?.content)} {t('insights.readTime')}
             </span>
           </div>
         </div>
@@ -178,8 +184,11 @@ export default function BlogPostPage() {
         <section className="relative -mt-8 mb-12">
           <div className="max-w-4xl mx-auto px-6 md:px-12">
             <div className="rounded-2xl overflow-hidden shadow-2xl">
-              <img
+              <ResponsiveImage
                 src={post.hero_image}
+                variants={post.hero_variants}
+                fallback="hero"
+                sizes="(min-width: 896px) 896px, 100vw"
                 alt={post.title}
                 className="w-full aspect-video object-cover"
               />
@@ -208,7 +217,12 @@ export default function BlogPostPage() {
 
           {/* Markdown Content */}
           <div className="prose prose-slate prose-lg max-w-none prose-headings:font-['Plus_Jakarta_Sans'] prose-headings:text-slate-900 prose-a:text-cyan-700 prose-strong:text-slate-900">
-            <ReactMarkdown>{post?.content}</ReactMarkdown>
+            {/* Server-rendered HTML is sanitised at write time (backend/render.py) */}
+            {post?.rendered ? (
+              <div dangerouslySetInnerHTML={{ __html: post.rendered.html }} />
+            ) : (
+              <ReactMarkdown>{post?.content}</ReactMarkdown>
+            )}
           </div>
 
           {/* Share Section */}